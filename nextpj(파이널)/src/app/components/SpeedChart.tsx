@@ -11,6 +11,10 @@ interface WebSocketMessage {
     id: string;
     speed: number;
   }>;
+  // 서버가 SUMO 집계로 계산한 교통 지표 (있으면 차량 배열을 다시 순회하지 않음)
+  kpis?: {
+    meanSpeed: number;
+  };
 }
 
 interface WebSocketCustomEvent extends CustomEvent {
@@ -39,12 +43,14 @@ const SpeedChart: React.FC<SpeedChartProps> = ({ simulationActive }) => {
     const handleSpeedUpdate = (event: WebSocketCustomEvent) => {
       try {
         const message = event.detail;
-        // vehicle_positions 메시지를 받으면 해당 시점의 모든 차량 속도 평균을 계산
+        // vehicle_positions 메시지를 받으면 해당 시점의 네트워크 평균 속도를 사용
         if (message.type === "vehicle_positions" && Array.isArray(message.data)) {
-          // data 배열에 있는 차량들이 곧 현재 지도에 표시되는 차량들입니다
-          // 이 배열에 있는 차량의 속도만 사용하여 평균을 계산합니다
-          const totalSpeed = message.data.reduce((sum, vehicle) => sum + vehicle.speed, 0);
-          const averageSpeed = message.data.length > 0 ? totalSpeed / message.data.length : 0;
+          // 서버 kpis 가 없는 경우에만 data 배열의 차량 속도로 평균을 계산합니다
+          const averageSpeed = message.kpis
+            ? message.kpis.meanSpeed
+            : message.data.length > 0
+              ? message.data.reduce((sum, vehicle) => sum + vehicle.speed, 0) / message.data.length
+              : 0;
           
           // 현재 속도 업데이트
           setCurrentSpeed(averageSpeed);
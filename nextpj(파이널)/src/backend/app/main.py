@@ -1,10 +1,41 @@
 # src/backend/app/main.py
-import os
+import os, glob, asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from routers import scenario
+from services.loop_monitor import loop_lag_monitor
+from services.session_manager import session_manager
+from services.sumo_pool import sumo_pool
+from services.logging_setup import configure_logging, shutdown_logging
+from services.metrics import metrics
 
-app = FastAPI()
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+# 서버 로그와 세션/작업별 로그 디렉토리
+LOG_DIR = os.environ.get("LOG_DIR", os.path.join(DATA_DIR, "logs"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 프로세스 전체 로깅 설정 (파일/콘솔 출력은 백그라운드 스레드에서 수행)
+    configure_logging(LOG_DIR)
+    # 이벤트 루프 지연 측정 시작/종료
+    loop_lag_monitor.start()
+    # 첫 세션이 SUMO 실행/접속을 기다리지 않도록 백그라운드에서 프로세스 풀을 미리 채움
+    config_files = glob.glob(os.path.join(DATA_DIR, "*.sumocfg"))
+    prewarm = (
+        asyncio.create_task(asyncio.to_thread(sumo_pool.prewarm, ["sumo", "-c", config_files[0]]))
+        if config_files else None
+    )
+    yield
+    await session_manager.shutdown()
+    if prewarm is not None:
+        await prewarm
+    await asyncio.to_thread(sumo_pool.shutdown)
+    await loop_lag_monitor.stop()
+    shutdown_logging()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,7 +48,18 @@ app.add_middleware(
 
 app.include_router(scenario.router, prefix="/api/scenario") 
 
+@app.get("/metrics")
+async def get_metrics() -> PlainTextResponse:
+    """단계별 소요 시간과 세션 지표 (Prometheus 텍스트 형식)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # permessage-deflate 압축 사용 여부 (클라이언트가 지원하는 경우에만 적용)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        ws_per_message_deflate=os.environ.get("WS_PER_MESSAGE_DEFLATE", "true").lower() == "true"
+    )
\ No newline at end of file
@@ -4,16 +4,27 @@ from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, WebSocke
 from fastapi.responses import StreamingResponse, JSONResponse
 import json
 from pydantic import BaseModel
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Optional
 from services.osm_generator import OSMGenerator
 from services.simulation_runner import SimulationRunner
 from schemas.scenario import ScenarioRequest
-import logging, asyncio
+from services.loop_monitor import loop_lag_monitor
+from services.session_manager import session_manager, SessionLimitExceeded
+from services.sumo_pool import sumo_pool
+from services.trajectory_store import list_trajectories, open_trajectory, convert_fcd, trajectory_root
+from services.coordinate_converter import CoordinateConverter
+from services.replay_session import ReplaySession
+from services.spatial_index import load_spatial_index
+import os, time, uuid, logging, asyncio
+import xml.etree.ElementTree as ET
 from starlette.websockets import WebSocketDisconnect
 
 # 라우터 초기화
 router = APIRouter()
 
+# 시나리오와 저장된 궤적이 있는 데이터 디렉토리 (SimulationRunner 의 data_dir 와 같은 위치)
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'data'))
+
 # 시뮬레이션 요청을 위한 모델 정의
 class SimulationRequest(BaseModel):
     duration: int
@@ -21,13 +32,18 @@ class SimulationRequest(BaseModel):
     class Config:
         json_schema_extra = {"example": {"duration": 3600}}
 
+# 다각형 영역 엣지 조회 요청 모델
+class EdgePolygonQuery(BaseModel):
+    polygon: List[List[float]]
+    limit: int = 1000
+
+    class Config:
+        json_schema_extra = {"example": {"polygon": [[127.09, 37.28], [127.11, 37.28], [127.10, 37.30]]}}
+
 # 서비스 인스턴스 생성을 위한 의존성 함수들
 def get_osm_generator() -> OSMGenerator:
     return OSMGenerator()
 
-def get_simulation_runner() -> SimulationRunner:
-    return SimulationRunner(data_dir="data")
-
 @router.post("/generate")
 async def generate_scenario(
     request: ScenarioRequest, 
@@ -51,14 +67,160 @@ async def generate_scenario(
         headers={"Cache-Control": "no-cache", "Connection": "keep-alive"}
     )
 
+@router.get("/event-loop-lag")
+async def get_event_loop_lag() -> JSONResponse:
+    """이벤트 루프 지연 통계 조회 엔드포인트"""
+    return JSONResponse(loop_lag_monitor.snapshot())
+
+@router.get("/sessions")
+async def get_sessions() -> JSONResponse:
+    """실행 중인 시뮬레이션 세션 목록 조회 엔드포인트"""
+    return JSONResponse({
+        "maxSessions": session_manager.max_sessions,
+        "sessions": session_manager.snapshot(),
+        "sumoPool": sumo_pool.snapshot()
+    })
+
+@router.get("/sessions/{session_id}/kpis")
+async def get_session_kpis(
+    session_id: str,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    resolution: Optional[float] = None,
+    maxPoints: int = 500
+) -> JSONResponse:
+    """세션의 KPI 시계열 조회 엔드포인트 (구간에 맞는 해상도로 다운샘플링)
+
+    끝난 세션도 KPI_HISTORY_GRACE_SECONDS 동안은 조회할 수 있어, 다시 연결한 클라이언트가 이전 기록을 받아 갈 수 있습니다.
+    """
+    history = session_manager.get_kpi_history(session_id)
+    if history is None:
+        raise HTTPException(status_code=404, detail="존재하지 않거나 보관 기간이 지난 시뮬레이션 세션입니다.")
+    try:
+        return JSONResponse(history.query(start, end, resolution, max(1, maxPoints)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/sessions/{session_id}/edge-groups")
+async def get_session_edge_groups(session_id: str) -> JSONResponse:
+    """세션의 도로 제어 엣지 그룹(그룹별 엣지 수)과 현재 제어 상태 조회 엔드포인트"""
+    runner = session_manager.get_session(session_id)
+    if runner is None:
+        raise HTTPException(status_code=404, detail="존재하지 않는 시뮬레이션 세션입니다.")
+    return JSONResponse({
+        "groups": runner.edge_groups.snapshot(),
+        "control": runner.edge_control.status()
+    })
+
+def _network_spatial_index():
+    """현재 시나리오 네트워크의 공간 인덱스 (시나리오가 없으면 404)"""
+    net_file = os.path.join(DATA_DIR, "osm.net.xml.gz")
+    if not os.path.exists(net_file):
+        raise HTTPException(status_code=404, detail="생성된 시나리오 네트워크가 없습니다.")
+    return load_spatial_index(net_file)
+
+@router.get("/network/edges/nearest")
+async def get_nearest_edge(lng: float, lat: float, maxDistance: Optional[float] = None) -> JSONResponse:
+    """지도에서 클릭한 위치에 가장 가까운 엣지/차로 조회 엔드포인트 (maxDistance: 미터)"""
+    spatial = await asyncio.to_thread(_network_spatial_index)
+    nearest = spatial.nearest(lng, lat, maxDistance)
+    if nearest is None:
+        raise HTTPException(status_code=404, detail="해당 위치 근처에 엣지가 없습니다.")
+    return JSONResponse(nearest)
+
+@router.get("/network/edges")
+async def get_edges_in_bbox(bbox: str, limit: int = 1000) -> JSONResponse:
+    """경위도 영역(bbox=서,남,동,북)과 겹치는 엣지 조회 엔드포인트"""
+    try:
+        west, south, east, north = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox는 서,남,동,북 4개 숫자여야 합니다.")
+    spatial = await asyncio.to_thread(_network_spatial_index)
+    return JSONResponse(spatial.describe(spatial.edges_in_bbox(west, south, east, north), max(0, limit)))
+
+@router.post("/network/edges/polygon")
+async def get_edges_in_polygon(query: EdgePolygonQuery) -> JSONResponse:
+    """그린 다각형과 겹치는 엣지 조회 엔드포인트"""
+    spatial = await asyncio.to_thread(_network_spatial_index)
+    try:
+        return JSONResponse(spatial.describe(spatial.edges_in_polygon(query.polygon), max(0, query.limit)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/replays")
+async def get_replays() -> JSONResponse:
+    """재생 가능한 저장된 실행 목록 조회 엔드포인트"""
+    return JSONResponse({"replays": await asyncio.to_thread(list_trajectories, DATA_DIR)})
+
+def _import_fcd(fcd_path: str) -> dict:
+    """[작업 스레드] fcd-output XML 을 새 궤적으로 변환하고 요약 반환"""
+    # 같은 초에 여러 번 변환해도 겹치지 않도록 임의 접미사를 붙임
+    run_id = f"fcd-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    converter = CoordinateConverter.from_net_file(os.path.join(DATA_DIR, "osm.net.xml.gz"))
+    if convert_fcd(fcd_path, os.path.join(trajectory_root(DATA_DIR), run_id), converter) is None:
+        raise ValueError("fcd-output 파일에 기록된 스텝이 없습니다.")
+    return open_trajectory(DATA_DIR, run_id).summary()
+
+@router.post("/replays/import")
+async def import_fcd_replay() -> JSONResponse:
+    """이전 버전이 남긴 fcd-output XML(data/fcd_output.xml)을 재생 가능한 궤적으로 변환하는 엔드포인트"""
+    fcd_path = os.path.join(DATA_DIR, "fcd_output.xml")
+    if not os.path.exists(fcd_path):
+        raise HTTPException(status_code=404, detail="변환할 fcd_output.xml 파일이 없습니다.")
+    try:
+        return JSONResponse(await asyncio.to_thread(_import_fcd, fcd_path))
+    except (ValueError, OSError, ET.ParseError) as e:
+        logging.error(f"fcd-output 변환 중 오류 발생: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.websocket("/ws/replay")
+async def websocket_replay(websocket: WebSocket):
+    """저장된 실행을 다시 보는 WebSocket 엔드포인트 (SUMO 실행 없이 디스크에서 재생)
+
+    첫 메시지: {"runId": ..., "startTime": 0, "speed": 1, "protocol": ..., "codec": ..., "viewport": {...}}
+    이후 {"seek": 시각}, {"speed": 배속}, {"paused": bool}, {"type": "viewport", ...} 로 제어합니다.
+    """
+    await websocket.accept()
+    logging.info("재생 WebSocket 연결이 열렸습니다")
+
+    try:
+        config = json.loads(await websocket.receive_text())
+        try:
+            store = await asyncio.to_thread(open_trajectory, DATA_DIR, str(config.get("runId", "")))
+            session = ReplaySession(store, websocket, config)
+        except FileNotFoundError as e:
+            await websocket.send_json({"type": "error", "message": str(e)})
+            await websocket.close(code=1008)
+            return
+        except (TypeError, ValueError) as e:
+            await websocket.send_json({"type": "error", "message": str(e)})
+            await websocket.close(code=1003)
+            return
+
+        await session.run()
+
+    except WebSocketDisconnect:
+        logging.info("재생 WebSocket 연결이 클라이언트에 의해 종료되었습니다")
+    except json.JSONDecodeError as e:
+        logging.error(f"잘못된 JSON 형식: {str(e)}")
+        await websocket.send_json({"type": "error", "message": "잘못된 설정 형식입니다."})
+    except Exception as e:
+        logging.error(f"재생 중 오류 발생: {str(e)}")
+        try:
+            await websocket.send_json({"type": "error", "message": "재생 중 오류가 발생했습니다."})
+        except Exception as send_error:
+            logging.error(f"오류 메시지 전송 실패: {str(send_error)}")
+
 @router.websocket("/ws/simulation")
-async def websocket_simulation(
-    websocket: WebSocket,
-    simulation_runner: SimulationRunner = Depends(get_simulation_runner)
-):
-    """메인 시뮬레이션 실행을 위한 WebSocket 엔드포인트"""
+async def websocket_simulation(websocket: WebSocket):
+    """메인 시뮬레이션 실행을 위한 WebSocket 엔드포인트
+
+    설정 메시지로 새 세션을 만들거나, {"type": "join", "sessionId": ...} 로
+    실행 중인 세션에 시청자로 참가합니다.
+    """
     await websocket.accept()
     logging.info("메인 시뮬레이션 WebSocket 연결이 열렸습니다")
+    simulation_runner: Optional[SimulationRunner] = None
 
     try:
         # 시뮬레이션 설정 수신
@@ -71,10 +233,30 @@ async def websocket_simulation(
             await websocket.close(code=1000)
             return
 
+        # 기존 세션에 시청자로 참가 (같은 프레임을 공유하며 제어 권한은 없음)
+        if config.get("type") == "join":
+            shared_runner = session_manager.get_session(str(config.get("sessionId", "")))
+            if shared_runner is None:
+                await websocket.send_json({"type": "error", "message": "존재하지 않는 시뮬레이션 세션입니다."})
+                await websocket.close(code=1008)
+                return
+            await shared_runner.attach_viewer(websocket)
+            return
+
+        # 세션 생성 (최대 세션 수 초과 시 거절)
+        try:
+            simulation_runner = await session_manager.create_session(data_dir="data")
+        except SessionLimitExceeded as e:
+            logging.warning(str(e))
+            await websocket.send_json({"type": "error", "message": str(e)})
+            await websocket.close(code=1013)
+            return
+
         # 시뮬레이션 실행
         success = await simulation_runner.run_simulation(
             config.get("duration", 3600),  # 기본값 1시간
-            websocket
+            websocket,
+            config
         )
 
         if not success:
@@ -102,5 +284,7 @@ async def websocket_simulation(
         except Exception as send_error:
             logging.error(f"오류 메시지 전송 실패: {str(send_error)}")
     finally:
+        if simulation_runner is not None:
+            await session_manager.close_session(simulation_runner.session_id)
         if not websocket.client_state.DISCONNECTED:
             await websocket.close(code=1000)
\ No newline at end of file
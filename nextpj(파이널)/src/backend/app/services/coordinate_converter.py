@@ -0,0 +1,76 @@
+# src/backend/app/services/coordinate_converter.py
+
+from pyproj import Transformer
+from typing import Dict, Mapping, Tuple
+import gzip, threading
+import numpy as np
+import xml.etree.ElementTree as ET
+
+# (프로젝션 문자열, 역변환 여부)별 Transformer 캐시 (프로세스 전체에서 공유)
+_transformers: Dict[Tuple[str, bool], Transformer] = {}
+_transformers_lock = threading.Lock()
+
+
+def get_transformer(proj_parameter: str, inverse: bool = False) -> Transformer:
+    """프로젝션 문자열에 해당하는 Transformer를 캐시에서 가져오거나 새로 생성 (inverse 이면 경위도 -> 투영 좌표)"""
+    key = (proj_parameter, inverse)
+    transformer = _transformers.get(key)
+    if transformer is None:
+        with _transformers_lock:
+            transformer = _transformers.get(key)
+            if transformer is None:
+                if inverse:
+                    transformer = Transformer.from_crs("EPSG:4326", proj_parameter, always_xy=True)
+                else:
+                    transformer = Transformer.from_crs(proj_parameter, "EPSG:4326", always_xy=True)
+                _transformers[key] = transformer
+    return transformer
+
+
+def read_location(net_file_path: str) -> Dict[str, str]:
+    """네트워크 파일의 <location> 요소 속성만 스트리밍 파싱으로 읽어옴"""
+    opener = gzip.open if net_file_path.endswith('.gz') else open
+    with opener(net_file_path, 'rb') as net_file:
+        for _, elem in ET.iterparse(net_file, events=('end',)):
+            if elem.tag == 'location':
+                return dict(elem.attrib)
+            elem.clear()
+    raise ValueError("XML 파일에서 location 요소를 찾을 수 없습니다")
+
+
+class CoordinateConverter:
+    """SUMO 네트워크 좌표(x, y)를 경위도(lng, lat)로 일괄 변환하는 클래스"""
+
+    def __init__(self, net_offset: Tuple[float, float], proj_parameter: str):
+        if not proj_parameter or proj_parameter == '!':
+            raise ValueError("네트워크에 지리 좌표 프로젝션 정보(projParameter)가 없습니다")
+        self.offset_x, self.offset_y = net_offset
+        self.proj_parameter = proj_parameter
+        self.transformer = get_transformer(proj_parameter)
+
+    @classmethod
+    def from_location(cls, attributes: Mapping[str, str]) -> "CoordinateConverter":
+        """<location> 요소의 netOffset/projParameter 속성으로 변환기를 생성"""
+        net_offset = attributes.get('netOffset')
+        if not net_offset:
+            raise ValueError("location 요소에서 netOffset 속성을 찾을 수 없습니다")
+        offset_x, offset_y = map(float, net_offset.split(','))
+        return cls((offset_x, offset_y), attributes.get('projParameter', '!'))
+
+    @classmethod
+    def from_net_file(cls, net_file_path: str) -> "CoordinateConverter":
+        return cls.from_location(read_location(net_file_path))
+
+    def to_lnglat(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """한 스텝 분량의 좌표 배열을 한 번의 호출로 경도/위도 배열로 변환"""
+        return self.transformer.transform(
+            np.asarray(x, dtype=np.float64) - self.offset_x,
+            np.asarray(y, dtype=np.float64) - self.offset_y
+        )
+
+    def to_xy(self, lng: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """경도/위도 배열을 SUMO 네트워크 좌표(x, y) 배열로 변환 (지도 클릭, 그린 영역 등)"""
+        x, y = get_transformer(self.proj_parameter, inverse=True).transform(
+            np.asarray(lng, dtype=np.float64), np.asarray(lat, dtype=np.float64)
+        )
+        return x + self.offset_x, y + self.offset_y
@@ -0,0 +1,275 @@
+# src/backend/app/services/edge_control.py
+"""
+엣지 그룹 단위 도로 제어
+
+네트워크 인덱스(network_index)로 엣지 그룹을 미리 계산해 두고, 제어 명령을 그룹 단위로 받아
+TraCI 호출 목록으로 펼친 뒤 스텝 사이에 backend.call_many 한 번으로 적용합니다.
+(호출을 실제로 한 번에 묶어 보내는 것은 libsumo 작업 프로세스 백엔드뿐이며, traci 백엔드는 호출마다 왕복합니다.)
+한 스텝에 적용하는 호출 수는 EDGE_CONTROL_MAX_CALLS 로 제한하여, 넓은 지역을 한꺼번에
+차단해도 그 스텝이 멈추지 않고 남은 호출은 다음 스텝들에 나눠 적용합니다.
+
+제어 메시지:
+    {"edgeControl": {
+        "groups": {"도심": {"polygon": [[경도, 위도], ...]},
+                   "역 주변": {"bbox": [서, 남, 동, 북]},
+                   "교량": {"edges": ["123#0", "123#1"]},
+                   "간선": {"types": ["highway.primary", "highway.secondary"]}},
+        "commands": [{"group": "도심", "op": "close"},
+                     {"group": "간선", "op": "speed", "value": 30, "at": 600},
+                     {"group": "교량", "op": "restrictLanes", "lanes": [0], "vClasses": ["truck"]}]}}
+
+    polygon/bbox 그룹은 공간 인덱스(spatial_index)로 차로 형상이 영역과 겹치는 엣지를 고릅니다.
+    기본 그룹: "motorwayLinks" (고속도로 진입로), "type:<엣지 타입>" (예: type:highway.primary)
+    op:
+        close / open                 : 엣지 전체 통행 차단 / 해제 (해제 시 차로별 원래 통행 설정 복원)
+        speed (value, km/h) / resetSpeed : 제한 속도 변경 / 원래 값으로 복원
+        restrictLanes / allowLanes   : 차로(lanes, 생략 시 전체)에서 vClasses 통행 금지 / 원래 설정으로 복원
+    at(시뮬레이션 시각, 초)을 주면 그 시각 이후 첫 스텝 사이에 적용하고, 없으면 바로 다음 스텝 사이에 적용합니다.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import os, heapq, itertools
+import numpy as np
+from services.coordinate_converter import CoordinateConverter
+from services.network_index import NetworkIndex
+from services.spatial_index import get_spatial_index
+
+# 한 스텝 사이에 적용할 최대 TraCI 호출 수 (남은 호출은 다음 스텝에 이어서 적용)
+EDGE_CONTROL_MAX_CALLS = int(os.environ.get("EDGE_CONTROL_MAX_CALLS", "500"))
+
+EDGE_OPS = ("close", "open", "speed", "resetSpeed", "restrictLanes", "allowLanes")
+MOTORWAY_LINKS = "motorwayLinks"
+TYPE_GROUP_PREFIX = "type:"
+
+Call = Tuple[str, str, tuple]
+
+
+class EdgeGroups:
+    """네트워크 하나의 엣지 그룹 정의 (그룹 이름 -> 인덱스 배열 위치)"""
+
+    def __init__(self, index: NetworkIndex, converter: CoordinateConverter):
+        self.index = index
+        self.converter = converter
+        self.groups: Dict[str, np.ndarray] = {}
+        for code, edge_type in enumerate(index.type_names):
+            if edge_type:
+                self.groups[f"{TYPE_GROUP_PREFIX}{edge_type}"] = np.flatnonzero(index.edge_types == code)
+        self.groups[MOTORWAY_LINKS] = self.groups.get(
+            f"{TYPE_GROUP_PREFIX}highway.motorway_link", np.zeros(0, dtype=np.int64)
+        )
+
+    def select(self, selector: Dict[str, Any]) -> np.ndarray:
+        """그룹 정의(types / edges / polygon / bbox)에 해당하는 엣지 위치 배열 (잘못된 정의면 ValueError)"""
+        if not isinstance(selector, dict):
+            raise ValueError("그룹 정의는 types, edges, polygon, bbox 중 하나를 가진 객체여야 합니다")
+        if "types" in selector:
+            types = selector["types"]
+            # 문자열 하나는 타입 하나로 취급 (set() 에 그대로 넣으면 글자 단위로 나뉨)
+            if isinstance(types, str):
+                types = [types]
+            if not isinstance(types, list):
+                raise ValueError("types는 엣지 타입 목록이어야 합니다")
+            types = set(str(edge_type) for edge_type in types)
+            codes = [i for i, name in enumerate(self.index.type_names) if name in types]
+            return np.flatnonzero(np.isin(self.index.edge_types, codes))
+        if "edges" in selector:
+            return self.index.positions([str(edge_id) for edge_id in selector["edges"]])
+        if "polygon" in selector:
+            return get_spatial_index(self.index, self.converter).edges_in_polygon(selector["polygon"])
+        if "bbox" in selector:
+            bbox = [float(value) for value in selector["bbox"]]
+            if len(bbox) != 4:
+                raise ValueError("bbox는 [서, 남, 동, 북] 경위도 4개 값이어야 합니다")
+            return get_spatial_index(self.index, self.converter).edges_in_bbox(*bbox)
+        raise ValueError("그룹 정의는 types, edges, polygon, bbox 중 하나를 가져야 합니다")
+
+    def define(self, name: str, selector: Dict[str, Any]) -> np.ndarray:
+        """그룹 정의를 검증하고 엣지 위치 배열 반환 (등록은 호출한 쪽에서, 기본 그룹 이름은 덮어쓸 수 없음)"""
+        if name == MOTORWAY_LINKS or name.startswith(TYPE_GROUP_PREFIX):
+            raise ValueError(f"기본 그룹 이름은 다시 정의할 수 없습니다: {name}")
+        return self.select(selector)
+
+    def copy(self) -> "EdgeGroups":
+        """그룹 목록만 복사한 정의 (인덱스는 공유, 분기 변형이 정의한 그룹이 원본에 남지 않도록)"""
+        groups = EdgeGroups.__new__(EdgeGroups)
+        groups.index = self.index
+        groups.converter = self.converter
+        groups.groups = dict(self.groups)
+        return groups
+
+    def get(self, name: str) -> np.ndarray:
+        if name not in self.groups:
+            raise ValueError(f"정의되지 않은 엣지 그룹입니다: {name}")
+        return self.groups[name]
+
+    def snapshot(self) -> Dict[str, int]:
+        return {name: len(positions) for name, positions in self.groups.items()}
+
+
+class EdgeController:
+    """한 시뮬레이션 실행의 도로 제어 상태, 예약 명령, 적용 대기 호출
+
+    상태(차단 엣지, 제한 속도, 차로 통행 금지)는 명령을 받은 시점에 바뀌고 실제 TraCI 호출은
+    스텝 사이에 나눠 적용됩니다. 상태는 분기(what-if) 변형에서 state_calls()로 다시 재현합니다.
+    """
+
+    def __init__(self, groups: EdgeGroups, vehicle_classes: Sequence[str]):
+        self.groups = groups
+        self.vehicle_classes = list(vehicle_classes)
+        self.closed: Set[str] = set()
+        self.speeds: Dict[str, float] = {}
+        self.lane_rules: Dict[str, Tuple[int, int, Tuple[str, ...]]] = {}  # 차로 ID -> (엣지 위치, 차로 번호, 금지 클래스)
+        self.pending: List[Call] = []
+        self.scheduled: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._sequence = itertools.count()
+
+    def copy(self, groups: Optional[EdgeGroups] = None) -> "EdgeController":
+        """현재 상태만 복사한 제어기 (적용 대기 호출과 예약 명령은 제외, groups 를 주면 그 그룹 정의 사용)"""
+        controller = EdgeController(groups or self.groups, self.vehicle_classes)
+        controller.closed = set(self.closed)
+        controller.speeds = dict(self.speeds)
+        controller.lane_rules = dict(self.lane_rules)
+        return controller
+
+    def submit(self, msg: Dict[str, Any], immediate: bool = False) -> None:
+        """edgeControl 메시지 처리: 그룹 정의 후 명령을 예약하거나 바로 펼침 (형식이 잘못되면 ValueError)
+
+        immediate 이면 at 을 무시하고 모두 바로 펼칩니다 (분기 변형).
+        """
+        if not isinstance(msg, dict):
+            raise ValueError("edgeControl은 객체여야 합니다")
+        groups = msg.get("groups") or {}
+        commands = msg.get("commands") or []
+        if not isinstance(groups, dict) or not isinstance(commands, list):
+            raise ValueError("groups는 객체, commands는 목록이어야 합니다")
+        # 그룹 정의와 명령을 모두 검증한 뒤에 등록/적용 (하나라도 잘못되면 아무것도 바뀌지 않음)
+        defined = {str(name): self.groups.define(str(name), selector) for name, selector in groups.items()}
+        parsed = [self._parse_command(command, defined) for command in commands]
+        self.groups.groups.update(defined)
+        for command in parsed:
+            if command["at"] is None or immediate:
+                self.pending.extend(self._expand(command))
+            else:
+                heapq.heappush(self.scheduled, (command["at"], next(self._sequence), command))
+
+    def _parse_command(self, command: Any, defined: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        if not isinstance(command, dict):
+            raise ValueError("각 명령은 {\"group\": ..., \"op\": ...} 형식이어야 합니다")
+        op = command.get("op")
+        if op not in EDGE_OPS:
+            raise ValueError(f"지원하지 않는 제어 명령입니다: {op} (지원: {', '.join(EDGE_OPS)})")
+        parsed = {"group": str(command.get("group")), "op": op, "at": None}
+        if parsed["group"] not in defined:
+            self.groups.get(parsed["group"])
+        if command.get("at") is not None:
+            parsed["at"] = float(command["at"])
+        if op == "speed":
+            value = float(command.get("value", -1))
+            if value <= 0:
+                raise ValueError("speed 명령의 value(km/h)는 0보다 커야 합니다")
+            parsed["value"] = value / 3.6
+        if op in ("restrictLanes", "allowLanes"):
+            lanes = command.get("lanes")
+            parsed["lanes"] = None if lanes is None else [int(lane) for lane in lanes]
+            parsed["vClasses"] = tuple(str(c) for c in command.get("vClasses", self.vehicle_classes))
+        return parsed
+
+    def _lane_targets(self, positions: np.ndarray, lanes: Optional[List[int]]):
+        counts = self.groups.index.lane_counts[positions]
+        edge_ids = self.groups.index.edge_ids[positions].tolist()
+        for position, edge_id, count in zip(positions.tolist(), edge_ids, counts.tolist()):
+            for lane in (range(count) if lanes is None else (lane for lane in lanes if 0 <= lane < count)):
+                yield position, lane, f"{edge_id}_{lane}"
+
+    def _restrict_call(self, position: int, lane: int, lane_id: str, classes: Tuple[str, ...]) -> Call:
+        """원래 허용 설정에서 classes 를 뺀 통행 설정 호출"""
+        permission = self.groups.index.lane_permission(position, lane)
+        if permission.startswith("allow:"):
+            allowed = set(permission[len("allow:"):].split()) - set(classes)
+            return ("lane", "setAllowed", (lane_id, sorted(allowed)))
+        disallowed = set(permission[len("disallow:"):].split()) | set(classes)
+        return ("lane", "setDisallowed", (lane_id, sorted(disallowed)))
+
+    def _restore_call(self, position: int, lane: int, lane_id: str) -> Call:
+        permission = self.groups.index.lane_permission(position, lane)
+        if permission.startswith("allow:"):
+            return ("lane", "setAllowed", (lane_id, permission[len("allow:"):].split()))
+        return ("lane", "setDisallowed", (lane_id, permission[len("disallow:"):].split()))
+
+    def _expand(self, command: Dict[str, Any]) -> List[Call]:
+        """명령 하나를 상태에 반영하고 필요한 TraCI 호출 목록으로 펼침 (이미 같은 상태인 엣지는 건너뜀)"""
+        positions = self.groups.get(command["group"])
+        op = command["op"]
+        calls: List[Call] = []
+        if op in ("restrictLanes", "allowLanes"):
+            for position, lane, lane_id in self._lane_targets(positions, command["lanes"]):
+                if op == "restrictLanes":
+                    self.lane_rules[lane_id] = (position, lane, command["vClasses"])
+                    call = self._restrict_call(position, lane, lane_id, command["vClasses"])
+                elif self.lane_rules.pop(lane_id, None) is not None:
+                    call = self._restore_call(position, lane, lane_id)
+                else:
+                    continue
+                # 차단된 엣지는 차단을 유지하고, 해제할 때 바뀐 차로 설정을 적용
+                if lane_id.rsplit("_", 1)[0] not in self.closed:
+                    calls.append(call)
+            return calls
+
+        edge_ids = self.groups.index.edge_ids[positions].tolist()
+        if op == "close":
+            for edge_id in edge_ids:
+                if edge_id not in self.closed:
+                    self.closed.add(edge_id)
+                    calls.append(("edge", "setDisallowed", (edge_id, self.vehicle_classes)))
+        elif op == "open":
+            # 차로마다 원래 통행 설정(차로 통행 금지 명령이 있으면 그 설정)으로 되돌림
+            reopened = [position for position, edge_id in zip(positions.tolist(), edge_ids) if edge_id in self.closed]
+            self.closed.difference_update(self.groups.index.edge_ids[reopened].tolist())
+            for position, lane, lane_id in self._lane_targets(np.array(reopened, dtype=np.int64), None):
+                rule = self.lane_rules.get(lane_id)
+                if rule is not None:
+                    calls.append(self._restrict_call(position, lane, lane_id, rule[2]))
+                else:
+                    calls.append(self._restore_call(position, lane, lane_id))
+        elif op == "speed":
+            for edge_id in edge_ids:
+                self.speeds[edge_id] = command["value"]
+                calls.append(("edge", "setMaxSpeed", (edge_id, command["value"])))
+        else:
+            original = self.groups.index.speeds[positions].tolist()
+            for edge_id, speed in zip(edge_ids, original):
+                if self.speeds.pop(edge_id, None) is not None:
+                    calls.append(("edge", "setMaxSpeed", (edge_id, float(speed))))
+        return calls
+
+    def next_time(self) -> Optional[float]:
+        """가장 이른 예약 명령 시각 (없으면 None)"""
+        return self.scheduled[0][0] if self.scheduled else None
+
+    def take(self, now: float, limit: int = EDGE_CONTROL_MAX_CALLS) -> List[Call]:
+        """[작업 스레드] now 까지 도래한 예약 명령을 펼치고, 이번 스텝 사이에 적용할 호출을 최대 limit 개 꺼냄"""
+        while self.scheduled and self.scheduled[0][0] <= now:
+            _, _, command = heapq.heappop(self.scheduled)
+            self.pending.extend(self._expand(command))
+        calls, self.pending = self.pending[:limit], self.pending[limit:]
+        return calls
+
+    def state_calls(self) -> List[Call]:
+        """원래 네트워크에서 현재 제어 상태를 재현하는 호출 목록 (분기 변형 시작 시 적용)"""
+        # 차로 설정을 먼저 적용해야 엣지 차단이 그 위에 덮어씀
+        calls: List[Call] = [
+            self._restrict_call(position, lane, lane_id, classes)
+            for lane_id, (position, lane, classes) in self.lane_rules.items()
+        ]
+        calls.extend(("edge", "setDisallowed", (edge_id, self.vehicle_classes)) for edge_id in sorted(self.closed))
+        calls.extend(("edge", "setMaxSpeed", (edge_id, speed)) for edge_id, speed in self.speeds.items())
+        return calls
+
+    def status(self) -> Dict[str, int]:
+        return {
+            "closedEdges": len(self.closed),
+            "speedLimitedEdges": len(self.speeds),
+            "restrictedLanes": len(self.lane_rules),
+            "pendingCalls": len(self.pending),
+            "scheduled": len(self.scheduled),
+        }
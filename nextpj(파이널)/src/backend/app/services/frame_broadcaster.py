@@ -0,0 +1,307 @@
+# src/backend/app/services/frame_broadcaster.py
+
+from fastapi import WebSocket
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import asyncio, json, logging, time
+from starlette.websockets import WebSocketDisconnect
+from services.view_filter import FrameIndex, ViewFilter
+from services.frame_encoder import encode_density
+from services.send_queue import SendQueue, SendQueueOverflow
+from services.metrics import STAGE_SECONDS
+
+ROLE_CONTROLLER = "controller"
+ROLE_VIEWER = "viewer"
+# 종료 메시지를 보낼 때 구독자별 남은 메시지 전송을 기다리는 최대 시간 (초)
+CLOSE_DRAIN_TIMEOUT = 5.0
+
+# 작업 스레드에서 만든 뷰별 메시지: (뷰, 직렬화된 메시지, 키프레임 여부). 뷰가 None 이면 모든 구독자에게 전송
+ViewMessage = Tuple[Optional["FrameView"], Union[str, bytes], bool]
+
+
+class FrameView:
+    """같은 필터와 인코더 상태를 공유하는 구독자 묶음
+
+    필터가 없는 기본 뷰는 모든 구독자가 공유하고, 화면 영역이나 차량 타입 필터를
+    보낸 구독자는 자신만의 뷰(전용 인코더)를 가집니다. 필터가 바뀌어도 같은 인코더를
+    계속 쓰므로 영역 밖으로 나간 차량은 제거, 들어온 차량은 추가로 전달됩니다.
+    """
+
+    def __init__(self, encoder: Any, view_filter: Optional[ViewFilter] = None):
+        self.encoder = encoder
+        self.filter = view_filter
+        self.subscribers: List["Subscriber"] = []
+        # 작업 스레드가 비교하는 키프레임 요청 횟수 (중간에 참가한 구독자가 있을 때 증가)
+        self.keyframe_requests = 0
+        self.keyframes_served = 0
+        self.aggregated = False  # 직전 프레임을 격자 집계로 보냈는지 여부
+
+    def encode(self, frame: Dict[str, Any], index: FrameIndex) -> Tuple[Union[str, bytes], bool]:
+        """[작업 스레드] 필터를 적용해 인코딩/직렬화한 메시지와 키프레임 여부"""
+        view_filter = self.filter
+        if view_filter is not None and view_filter.aggregates:
+            # 축소된 화면에는 개별 차량 대신 격자 집계 전송 (그 자체로 전체 상태)
+            type_names, type_codes = index.type_table()
+            message = encode_density(frame, type_names, type_codes, view_filter.zoom, view_filter.select(index))
+            self.aggregated = True
+            return json.dumps(message, separators=(",", ":"), ensure_ascii=False), True
+
+        if view_filter is not None:
+            frame = view_filter.apply(frame, index)
+        requested = self.keyframe_requests
+        # 집계에서 개별 차량으로 돌아온 첫 프레임은 키프레임
+        message = self.encoder.encode(frame, keyframe=requested != self.keyframes_served or self.aggregated)
+        self.keyframes_served = requested
+        self.aggregated = False
+        if not isinstance(message, bytes):
+            message = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        return message, self.encoder.last_keyframe
+
+
+class Subscriber:
+    """공유 세션에 연결된 WebSocket 하나"""
+
+    def __init__(self, websocket: WebSocket, role: str, view: FrameView):
+        self.websocket = websocket
+        self.role = role
+        self.view = view
+        # 현재 뷰의 키프레임을 받은 이후부터 변경분 프레임을 받을 수 있음
+        self.synced = False
+        # 느려서 변경분 프레임을 버린 뒤, 밀린 전송을 마치면 키프레임을 요청해야 하는지
+        self.needs_keyframe = False
+        self.sending = False  # 전송 태스크가 메시지를 보내는 중인지 (끝나면 needs_keyframe 을 처리)
+        self.queue = SendQueue()
+        self.done = asyncio.Event()
+        self.receiver: Optional[asyncio.Task] = None
+        self.sender: Optional[asyncio.Task] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"role": self.role, "synced": self.synced, **self.queue.snapshot()}
+
+
+class FrameBroadcaster:
+    """한 시뮬레이션의 프레임을 여러 WebSocket 구독자에게 전송하는 클래스
+
+    프레임은 작업 스레드에서 뷰마다 한 번만 인코딩/직렬화되고, 같은 뷰의 구독자에게는
+    같은 메시지를 그대로 전송합니다. 전송은 구독자마다 송신 큐(SendQueue)와 전송 태스크로
+    따로 하므로 느린 연결은 오래된 위치 프레임을 버릴 뿐 시뮬레이션이나 다른 구독자를
+    늦추지 않습니다 (변경분이 끊긴 구독자는 밀린 전송을 마친 뒤 키프레임부터 다시 받음).
+    알림/오류/완료 메시지는 버리지 않습니다. 제어 권한은 컨트롤러 한 명만 가지며, 컨트롤러가
+    나가면 가장 먼저 참가한 시청자에게 넘어갑니다. 중간에 참가한 시청자는 다음
+    키프레임부터 프레임을 받습니다. 구독자가 모두 나가면 on_empty 가 호출됩니다.
+
+    구독자는 언제든 {"type": "viewport", "bbox": [...], "zoom": ..., "vehicleTypes": [...]}
+    메시지로 받을 차량을 제한할 수 있습니다 (bbox 와 vehicleTypes 가 모두 없고 줌이
+    집계 기준 이상이면 해제). 줌이 기준 미만이면 격자 집계를 받습니다.
+    """
+
+    def __init__(
+        self,
+        encoder_factory: Callable[[], Any],
+        on_command: Callable[[Dict[str, Any]], None],
+        on_empty: Callable[[], None]
+    ):
+        self.encoder_factory = encoder_factory
+        self.on_command = on_command
+        self.on_empty = on_empty
+        self.default_view = FrameView(encoder_factory())
+        self.subscribers: List[Subscriber] = []
+        self.controller: Optional[Subscriber] = None
+        self.closed = False
+        self.logger = logging.getLogger(__name__)
+
+    def views(self) -> List[FrameView]:
+        """[작업 스레드] 구독자가 있는 뷰 목록 (구독자가 없으면 기본 뷰만)"""
+        views = []
+        for subscriber in list(self.subscribers):
+            if subscriber.view not in views:
+                views.append(subscriber.view)
+        return views or [self.default_view]
+
+    def add(self, websocket: WebSocket, role: str) -> Subscriber:
+        """구독자를 기본 뷰에 추가하고 제어 메시지 수신 태스크를 시작"""
+        subscriber = Subscriber(websocket, role, self.default_view)
+        if role == ROLE_CONTROLLER:
+            self.controller = subscriber
+        self._join_view(subscriber, self.default_view)
+        self.subscribers.append(subscriber)
+        subscriber.receiver = asyncio.create_task(self._receive(subscriber))
+        subscriber.sender = asyncio.create_task(self._send_loop(subscriber))
+        self.logger.info(f"구독자 추가 ({role}, 현재 {len(self.subscribers)}명)")
+        return subscriber
+
+    def _join_view(self, subscriber: Subscriber, view: FrameView) -> None:
+        if subscriber in subscriber.view.subscribers:
+            subscriber.view.subscribers.remove(subscriber)
+        subscriber.view = view
+        subscriber.synced = False
+        subscriber.needs_keyframe = False
+        subscriber.queue.discard_frame()
+        view.subscribers.append(subscriber)
+        view.keyframe_requests += 1
+
+    def set_view(self, subscriber: Subscriber, msg: Dict[str, Any]) -> None:
+        """구독자의 화면 영역/줌/차량 타입 필터를 변경 (형식이 잘못되면 ValueError)"""
+        view_filter = ViewFilter.from_message(msg)
+        if view_filter.selects_all:
+            if subscriber.view is not self.default_view:
+                self._join_view(subscriber, self.default_view)
+        elif subscriber.view is not self.default_view:
+            # 전용 뷰는 인코더 상태를 유지한 채 필터만 교체
+            subscriber.view.filter = view_filter
+        else:
+            self._join_view(subscriber, FrameView(self.encoder_factory(), view_filter))
+
+    def remove(self, subscriber: Subscriber) -> None:
+        """구독자를 제거하고 필요하면 제어 권한을 넘김"""
+        if subscriber not in self.subscribers:
+            return
+        self.subscribers.remove(subscriber)
+        if subscriber in subscriber.view.subscribers:
+            subscriber.view.subscribers.remove(subscriber)
+        subscriber.done.set()
+        subscriber.queue.close()
+        for task in (subscriber.receiver, subscriber.sender):
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+        stats = subscriber.queue
+        self.logger.info(
+            f"구독자 제거 ({subscriber.role}, 현재 {len(self.subscribers)}명, "
+            f"프레임 전송 {stats.frames_sent} / 버림 {stats.frames_dropped}, 최대 지연 {stats.max_lag * 1000:.0f}ms)"
+        )
+
+        if subscriber is self.controller:
+            self.controller = None
+            if self.subscribers and not self.closed:
+                self.controller = self.subscribers[0]
+                self.controller.role = ROLE_CONTROLLER
+                self._enqueue(self.controller, json.dumps({"type": "session_role", "role": ROLE_CONTROLLER}))
+                self.logger.info("제어 권한을 다음 구독자에게 넘겼습니다")
+
+        if not self.subscribers and not self.closed:
+            self.on_empty()
+
+    async def _receive(self, subscriber: Subscriber) -> None:
+        """[수신 태스크] 구독자의 메시지를 받아 뷰 변경은 적용하고, 제어 명령은 컨트롤러 것만 전달"""
+        while True:
+            try:
+                msg = await subscriber.websocket.receive_json()
+            except WebSocketDisconnect:
+                self.remove(subscriber)
+                return
+            except json.JSONDecodeError as e:
+                self.logger.error(f"잘못된 제어 메시지 형식: {str(e)}")
+                continue
+            except Exception as e:
+                self.logger.error(f"제어 메시지 수신 중 오류: {str(e)}")
+                self.remove(subscriber)
+                return
+
+            if not isinstance(msg, dict):
+                self._enqueue(subscriber, json.dumps({"type": "error", "message": "메시지는 JSON 객체여야 합니다."}))
+                continue
+
+            if msg.get("type") == "viewport":
+                try:
+                    self.set_view(subscriber, msg)
+                except (TypeError, ValueError) as e:
+                    self._enqueue(subscriber, json.dumps({"type": "error", "message": str(e)}))
+                continue
+
+            if subscriber is not self.controller:
+                self._enqueue(subscriber, json.dumps({
+                    "type": "error",
+                    "message": "시청자는 시뮬레이션을 제어할 수 없습니다."
+                }))
+                continue
+
+            self.logger.info(f"제어 메시지 수신: {msg}")
+            self.on_command(msg)
+
+    async def _send(self, subscriber: Subscriber, message: Union[str, bytes]) -> bool:
+        try:
+            if isinstance(message, bytes):
+                await subscriber.websocket.send_bytes(message)
+            else:
+                await subscriber.websocket.send_text(message)
+            return True
+        except Exception as e:
+            self.logger.warning(f"구독자 전송 실패, 연결을 제거합니다: {str(e)}")
+            self.remove(subscriber)
+            return False
+
+    async def _send_loop(self, subscriber: Subscriber) -> None:
+        """[전송 태스크] 구독자의 송신 큐를 비우며 전송 (연결 속도만큼만 보내고 나머지 프레임은 큐에서 버려짐)"""
+        queue = subscriber.queue
+        while True:
+            message, queued_at = await queue.get()
+            started = time.perf_counter()
+            subscriber.sending = True
+            try:
+                if not await self._send(subscriber, message):
+                    return
+            finally:
+                subscriber.sending = False
+            STAGE_SECONDS.observe(time.perf_counter() - started, "send")
+            queue.sent(queued_at)
+            self._request_keyframe_if_idle(subscriber)
+
+    def _request_keyframe_if_idle(self, subscriber: Subscriber) -> None:
+        """밀린 전송이 없으면 다음 프레임을 키프레임으로 요청해 다시 동기화
+
+        보내는 중이거나 큐에 메시지가 남아 있으면 전송 태스크가 그 전송을 마친 뒤 다시 호출합니다.
+        """
+        if subscriber.needs_keyframe and not subscriber.sending and subscriber.queue.empty():
+            subscriber.needs_keyframe = False
+            subscriber.view.keyframe_requests += 1
+
+    def _enqueue(self, subscriber: Subscriber, message: Union[str, bytes]) -> None:
+        """반드시 전달할 메시지를 송신 큐에 추가 (큐가 넘친 구독자는 멈춘 연결로 보고 제거)"""
+        try:
+            subscriber.queue.put_event(message)
+        except SendQueueOverflow as e:
+            self.logger.warning(f"구독자 송신 큐 초과, 연결을 제거합니다: {str(e)}")
+            self.remove(subscriber)
+
+    def broadcast(self, messages: List[ViewMessage]) -> None:
+        """뷰별 메시지를 그 뷰의 동기화된 구독자 송신 큐에 넣음 (키프레임이면 대기 중인 구독자도 포함, 기다리지 않음)"""
+        for view, message, keyframe in messages:
+            if view is None:
+                for subscriber in list(self.subscribers):
+                    self._enqueue(subscriber, message)
+                continue
+            for subscriber in list(view.subscribers):
+                if keyframe:
+                    subscriber.synced = True
+                if subscriber.synced and not subscriber.queue.put_frame(message, keyframe):
+                    # 버린 변경분 없이는 이어서 복원할 수 없으므로 키프레임까지 프레임을 보내지 않음
+                    subscriber.synced = False
+                    subscriber.needs_keyframe = True
+                    # 전송 태스크가 빈 큐에서 기다리는 중이면 깨울 전송이 없으므로 여기서 바로 요청
+                    self._request_keyframe_if_idle(subscriber)
+
+    async def close(self, message: Optional[Dict[str, Any]] = None) -> None:
+        """마지막 메시지를 모든 구독자에게 보내고 해제 (WebSocket 자체는 각 엔드포인트가 닫음)"""
+        if message is not None:
+            text = json.dumps(message)
+            subscribers = list(self.subscribers)
+            for subscriber in subscribers:
+                self._enqueue(subscriber, text)
+            # 남은 메시지까지 보낼 때까지 기다리되, 멈춘 연결 때문에 종료가 늦어지지 않도록 제한
+            drains = [subscriber.queue.drain() for subscriber in subscribers if subscriber in self.subscribers]
+            if drains:
+                _, pending = await asyncio.wait(
+                    [asyncio.ensure_future(drain) for drain in drains], timeout=CLOSE_DRAIN_TIMEOUT
+                )
+                for task in pending:
+                    task.cancel()
+        self.closed = True
+        for subscriber in list(self.subscribers):
+            self.remove(subscriber)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self.subscribers),
+            "viewers": sum(1 for subscriber in self.subscribers if subscriber.role == ROLE_VIEWER),
+            "views": len(self.views()),
+            "clients": [subscriber.snapshot() for subscriber in self.subscribers],
+        }
@@ -0,0 +1,55 @@
+# src/backend/app/services/frame_channel.py
+
+from typing import Any, Optional
+import asyncio, threading
+
+
+class _EndOfStream:
+    """작업 스레드 종료를 알리는 표식 (오류로 끝난 경우 error에 예외를 담음)"""
+
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+
+class FrameChannel:
+    """작업 스레드에서 이벤트 루프로 완성된 프레임을 넘기는 크기 제한 채널
+
+    작업 스레드는 put()으로 프레임을 넣고, 큐가 가득 차면 빈 자리가 생길 때까지
+    기다립니다 (역압). 이벤트 루프 쪽은 await get()으로 프레임을 꺼냅니다.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int = 4):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.slots = threading.Semaphore(maxsize)
+        self.closed = threading.Event()
+
+    def put(self, frame: Any, poll_interval: float = 0.5) -> bool:
+        """[작업 스레드] 프레임을 넣음. 채널이 닫혀 넣지 못하면 False 반환"""
+        while not self.closed.is_set():
+            if self.slots.acquire(timeout=poll_interval):
+                self.loop.call_soon_threadsafe(self.queue.put_nowait, frame)
+                return True
+        return False
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """[작업 스레드] 스트림 종료를 알림 (큐 크기 제한과 무관하게 전달)"""
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, _EndOfStream(error))
+        except RuntimeError:
+            # 이벤트 루프가 이미 종료된 경우
+            pass
+
+    async def get(self) -> Optional[Any]:
+        """[이벤트 루프] 다음 프레임을 꺼냄. 스트림이 끝나면 None, 작업 스레드 오류는 다시 발생"""
+        item = await self.queue.get()
+        if isinstance(item, _EndOfStream):
+            if item.error is not None:
+                raise item.error
+            return None
+        self.slots.release()
+        return item
+
+    def close(self) -> None:
+        """[이벤트 루프] 소비를 중단하고 작업 스레드의 대기를 해제"""
+        self.closed.set()
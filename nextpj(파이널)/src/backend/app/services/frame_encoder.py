@@ -0,0 +1,425 @@
+# src/backend/app/services/frame_encoder.py
+"""
+시뮬레이션 프레임 인코더
+
+프레임(frame)은 한 스텝의 차량 상태를 열 단위로 담은 dict 입니다.
+    ids, types        : 차량 ID / 타입 문자열 리스트
+    lat, lng          : 위도 / 경도 (np.ndarray)
+    angle, speed      : 방향각(도) / 속도(km/h) (np.ndarray)
+    step, progress, vehicleCount, controlStatus, averageSpeed, kpis : 프레임 메타 정보
+                      (kpis 는 traffic_kpis.compute_kpis() 결과)
+
+프로토콜 (초기 설정 메시지의 "protocol" 값으로 선택)
+- json  (기본값): 기존 vehicle_positions 메시지. 매 스텝 모든 차량의 전체 레코드 전송
+- delta : 접속 직후와 keyframeInterval 스텝마다 vehicle_keyframe 을 보내고,
+          그 사이에는 추가/제거/변경된 차량만 담은 vehicle_delta 를 전송
+          차량은 처음 등장할 때 작은 정수 핸들을 부여받으며, 제거된 핸들은 다음 스텝부터 재사용됩니다.
+          vehicle_keyframe.vehicles / vehicle_delta.added : [handle, id, type, lat, lng, angle, speed]
+          vehicle_delta.changed                           : [handle, lat, lng, angle, speed]
+          vehicle_delta.removed                           : [handle, ...]
+          클라이언트는 removed → added → changed 순서로 적용합니다.
+- reckoning : 매 스텝 대신 실제 시간 기준 초당 reckoningRate 번(기본 2)만 vehicle_reckoning 을 전송
+          (메시지마다 전체 상태). 클라이언트는 그 사이 위치를 추측 항법으로 외삽하거나 두 메시지 사이를 보간합니다.
+          time     : 시뮬레이션 시각 (초)
+          rate     : 직전 메시지 이후 실제 1초당 진행한 시뮬레이션 시간 (초, 첫 메시지는 0)
+          vehicles : [id, type, lat, lng, angle, speed, accel] (accel: m/s², 속도는 km/h)
+          events   : 직전 메시지 이후 일어난 [종류, id, 시각(, 새 경로 ID)]
+                     stop / resume : 정류장 등 예정된 정차 시작 / 종료
+                     reroute       : 경로 변경 (직전 메시지와 경로 ID 비교, 시각은 이번 메시지 시각)
+          외삽: 경과 시뮬레이션 시간 dt 동안 angle(북쪽 기준 시계 방향) 방향으로
+                speed/3.6*dt + accel*dt²/2 미터 (속도가 0 아래로 내려가면 멈춤)
+
+코덱 (초기 설정 메시지의 "codec" 값으로 선택, json 프로토콜에서만 사용 가능)
+- json   (기본값): 위 프로토콜 메시지를 send_json 으로 전송
+- binary : 매 스텝 모든 차량을 타입 배열로 묶어 send_bytes 로 전송 (리틀 엔디언)
+          0   uint8   버전 (1)
+          1   uint8   예약 (0)
+          2   uint16  예약 (0)
+          4   uint32  차량 수 N
+          8   uint32  메타 JSON 길이 M
+          12  M 바이트 UTF-8 JSON 메타 + 4바이트 정렬용 패딩
+              (type, step, progress, vehicleCount, controlStatus, averageSpeed, kpis,
+               newIds: 이번에 처음 등장한 [handle, id] 목록,
+               types: 타입 테이블이 바뀐 경우에만 전체 타입 문자열 리스트)
+          이후 uint32 handle[N], int32 lat[N], int32 lng[N] (마이크로 도),
+               uint16 speed[N] (0.01 km/h), uint16 angle[N] (0.01 도), uint8 type[N]
+          프레임에 없는 핸들은 사라진 차량이며, 그 핸들은 다음 프레임부터 다른 차량에 재사용될 수
+          있습니다 (재사용할 때 newIds 로 새 ID 를 다시 보냄).
+
+줌 집계 (vehicle_density)
+    화면 줌이 aggregateBelowZoom 미만인 뷰에는 코덱과 관계없이 JSON 으로 격자 집계를 보냅니다.
+    격자 크기(cellSize, 도)는 줌 레벨 타일 폭의 1/8 이므로 화면당 칸 수가 차량 수와 무관하게 제한됩니다.
+          cells : [lat, lng, count, meanSpeed, typeIndex] (lat/lng 는 칸 안 차량의 평균 위치)
+          types : typeIndex 가 가리키는 기본 차량 타입 목록 (칸에서 가장 많은 타입)
+    집계 메시지는 그 자체로 전체 상태이며, 다시 확대하면 다음 프레임은 키프레임으로 전송됩니다.
+
+키프레임
+    encode(frame, keyframe=True) 로 다음 프레임을 키프레임으로 강제할 수 있습니다 (공유 세션에
+    시청자가 중간에 참가한 경우). delta 는 vehicle_keyframe 을, binary 는 모든 차량을 newIds 에
+    담고 전체 types 를 포함한 프레임을 만듭니다. 직전 encode 결과가 그 프레임만으로 전체
+    상태를 복원할 수 있는지는 last_keyframe 으로 확인합니다.
+"""
+
+from typing import Any, Dict, List, Optional
+import json, struct
+import numpy as np
+
+# 프레임 메타 정보 중 그대로 전달할 키 목록
+FRAME_META_KEYS = ("progress", "vehicleCount", "controlStatus", "averageSpeed", "kpis")
+
+
+class JsonFrameEncoder:
+    """기존 vehicle_positions 형식(차량별 전체 레코드)으로 프레임을 인코딩"""
+
+    # 모든 메시지가 전체 상태를 담음
+    last_keyframe = True
+
+    def encode(self, frame: Dict[str, Any], keyframe: bool = False) -> Dict[str, Any]:
+        vehicle_positions = [
+            {
+                "id": vehicle_id,
+                "position": {"lat": lat, "lng": lng},
+                "type": vehicle_type,
+                "angle": angle,
+                "speed": speed
+            }
+            for vehicle_id, lat, lng, vehicle_type, angle, speed in zip(
+                frame["ids"], frame["lat"].tolist(), frame["lng"].tolist(),
+                frame["types"], frame["angle"].tolist(), frame["speed"].tolist()
+            )
+        ]
+        message = {"type": "vehicle_positions", "data": vehicle_positions}
+        message.update({key: frame[key] for key in FRAME_META_KEYS})
+        return message
+
+
+class DeltaFrameEncoder:
+    """키프레임 + 변경분(delta) 방식으로 프레임을 인코딩 (연결마다 하나씩 생성)"""
+
+    def __init__(
+        self,
+        keyframe_interval: int = 30,
+        position_epsilon: float = 1e-6,
+        angle_epsilon: float = 1.0,
+        speed_epsilon: float = 0.5
+    ):
+        if keyframe_interval < 1:
+            raise ValueError("keyframeInterval은 1 이상이어야 합니다")
+        self.keyframe_interval = keyframe_interval
+        # 변경으로 간주할 최소 변화량 (위경도: 도, 각도: 도, 속도: km/h)
+        self.position_epsilon = position_epsilon
+        self.angle_epsilon = angle_epsilon
+        self.speed_epsilon = speed_epsilon
+
+        self.frames_encoded = 0
+        self.last_keyframe = False
+        self.handles: Dict[str, int] = {}   # 차량 ID -> 핸들
+        self.vehicle_ids: List[str] = []    # 핸들 -> 차량 ID
+        self.free_handles: List[int] = []   # 재사용 가능한 핸들
+        self.next_handle = 0
+
+        # 핸들 인덱스로 접근하는 마지막 전송 상태
+        self.active = np.zeros(0, dtype=bool)
+        self.sent_state = np.zeros((0, 4), dtype=np.float64)  # lat, lng, angle, speed
+
+    def _assign_handle(self, vehicle_id: str) -> int:
+        handle = self.free_handles.pop() if self.free_handles else self.next_handle
+        if handle == self.next_handle:
+            self.next_handle += 1
+            self.vehicle_ids.append(vehicle_id)
+        else:
+            self.vehicle_ids[handle] = vehicle_id
+        self.handles[vehicle_id] = handle
+        return handle
+
+    def _ensure_capacity(self) -> None:
+        capacity = len(self.active)
+        if self.next_handle <= capacity:
+            return
+        new_capacity = max(self.next_handle, capacity * 2, 64)
+        self.active = np.concatenate([self.active, np.zeros(new_capacity - capacity, dtype=bool)])
+        self.sent_state = np.concatenate([self.sent_state, np.zeros((new_capacity - capacity, 4))])
+
+    @staticmethod
+    def _records(handles: np.ndarray, state: np.ndarray, ids: List[str], types: List[str]) -> List[list]:
+        return [
+            [handle, vehicle_id, vehicle_type, lat, lng, angle, speed]
+            for handle, vehicle_id, vehicle_type, (lat, lng, angle, speed) in zip(
+                handles.tolist(), ids, types, state.tolist()
+            )
+        ]
+
+    def encode(self, frame: Dict[str, Any], keyframe: bool = False) -> Dict[str, Any]:
+        ids = frame["ids"]
+        types = frame["types"]
+        count = len(ids)
+
+        # 핸들 조회 및 신규 차량 핸들 부여
+        handles = np.empty(count, dtype=np.int64)
+        is_new = np.zeros(count, dtype=bool)
+        for index, vehicle_id in enumerate(ids):
+            handle = self.handles.get(vehicle_id)
+            if handle is None:
+                handle = self._assign_handle(vehicle_id)
+                is_new[index] = True
+            handles[index] = handle
+        self._ensure_capacity()
+
+        # 전송 정밀도에 맞춰 반올림한 현재 상태 (lat, lng, angle, speed)
+        state = np.column_stack((
+            np.round(frame["lat"], 6), np.round(frame["lng"], 6),
+            np.round(frame["angle"], 1), np.round(frame["speed"], 1)
+        )) if count else np.zeros((0, 4))
+
+        # 사라진 차량 핸들 해제 (같은 메시지 안에서는 재사용되지 않도록 부여 이후에 해제)
+        present = np.zeros(len(self.active), dtype=bool)
+        present[handles] = True
+        removed = np.flatnonzero(self.active & ~present)
+        for handle in removed.tolist():
+            del self.handles[self.vehicle_ids[handle]]
+            self.free_handles.append(handle)
+        self.active = present
+
+        is_keyframe = keyframe or self.frames_encoded % self.keyframe_interval == 0
+        self.frames_encoded += 1
+        self.last_keyframe = is_keyframe
+
+        if is_keyframe:
+            self.sent_state[handles] = state
+            message = {
+                "type": "vehicle_keyframe",
+                "step": frame["step"],
+                "vehicles": self._records(handles, state, ids, types)
+            }
+        else:
+            previous = self.sent_state[handles]
+            epsilons = (self.position_epsilon, self.position_epsilon, self.angle_epsilon, self.speed_epsilon)
+            moved = (np.abs(state - previous) > epsilons).any(axis=1) & ~is_new
+
+            new_index = np.flatnonzero(is_new)
+            moved_index = np.flatnonzero(moved)
+            self.sent_state[handles[new_index]] = state[new_index]
+            self.sent_state[handles[moved_index]] = state[moved_index]
+
+            message = {
+                "type": "vehicle_delta",
+                "step": frame["step"],
+                "added": self._records(
+                    handles[new_index], state[new_index],
+                    [ids[i] for i in new_index], [types[i] for i in new_index]
+                ),
+                "removed": removed.tolist(),
+                "changed": [
+                    [handle, lat, lng, angle, speed]
+                    for handle, (lat, lng, angle, speed) in zip(
+                        handles[moved_index].tolist(), state[moved_index].tolist()
+                    )
+                ]
+            }
+
+        message.update({key: frame[key] for key in FRAME_META_KEYS})
+        return message
+
+
+class BinaryFrameEncoder:
+    """양자화한 타입 배열 바이너리 형식으로 프레임을 인코딩 (연결마다 하나씩 생성)"""
+
+    VERSION = 1
+    HEADER = struct.Struct("<BBHII")  # 버전, 예약, 예약, 차량 수, 메타 길이
+
+    def __init__(self):
+        self.handles: Dict[str, int] = {}                  # 차량 ID -> 핸들
+        self.vehicle_ids: List[Optional[str]] = []         # 핸들 -> 차량 ID (해제된 핸들은 None)
+        self.free_handles: List[int] = []                  # 재사용 가능한 핸들
+        self.type_indices: Dict[str, int] = {}
+        self.last_keyframe = False
+
+    def _assign_handle(self, vehicle_id: str) -> int:
+        if self.free_handles:
+            handle = self.free_handles.pop()
+            self.vehicle_ids[handle] = vehicle_id
+        else:
+            handle = len(self.vehicle_ids)
+            self.vehicle_ids.append(vehicle_id)
+        self.handles[vehicle_id] = handle
+        return handle
+
+    def encode(self, frame: Dict[str, Any], keyframe: bool = False) -> bytes:
+        ids = frame["ids"]
+        count = len(ids)
+        # 첫 프레임은 모든 차량과 타입을 담으므로 키프레임
+        keyframe = keyframe or not self.vehicle_ids
+
+        # 차량 ID -> 핸들, 타입 문자열 -> 인덱스 (처음 등장한 것만 메타로 전달)
+        new_ids = []
+        handles = np.empty(count, dtype="<u4")
+        for index, vehicle_id in enumerate(ids):
+            handle = self.handles.get(vehicle_id)
+            if handle is None:
+                handle = self._assign_handle(vehicle_id)
+                new_ids.append([handle, vehicle_id])
+            elif keyframe:
+                new_ids.append([handle, vehicle_id])
+            handles[index] = handle
+
+        # 사라진 차량 핸들 해제 (같은 프레임 안에서는 재사용되지 않도록 부여 이후에 해제)
+        present = np.zeros(len(self.vehicle_ids), dtype=bool)
+        present[handles] = True
+        for handle in np.flatnonzero(~present).tolist():
+            vehicle_id = self.vehicle_ids[handle]
+            if vehicle_id is not None:
+                del self.handles[vehicle_id]
+                self.vehicle_ids[handle] = None
+                self.free_handles.append(handle)
+
+        type_count = len(self.type_indices)
+        type_index = np.fromiter(
+            (self.type_indices.setdefault(vehicle_type, len(self.type_indices)) for vehicle_type in frame["types"]),
+            dtype=np.int64, count=count
+        )
+        if len(self.type_indices) > 255:
+            raise ValueError("바이너리 코덱은 최대 255개의 차량 타입만 지원합니다")
+
+        meta = {"type": "vehicle_positions", "step": frame["step"], "newIds": new_ids}
+        meta.update({key: frame[key] for key in FRAME_META_KEYS})
+        if keyframe or len(self.type_indices) != type_count:
+            meta["types"] = list(self.type_indices)
+        self.last_keyframe = keyframe
+        meta_bytes = json.dumps(meta, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        padding = -len(meta_bytes) % 4
+
+        return b"".join((
+            self.HEADER.pack(self.VERSION, 0, 0, count, len(meta_bytes)),
+            meta_bytes,
+            b"\0" * padding,
+            handles.tobytes(),
+            np.round(frame["lat"] * 1e6).astype("<i4").tobytes(),
+            np.round(frame["lng"] * 1e6).astype("<i4").tobytes(),
+            np.clip(np.round(frame["speed"] * 100), 0, 65535).astype("<u2").tobytes(),
+            (np.round(np.mod(frame["angle"], 360.0) * 100) % 36000).astype("<u2").tobytes(),
+            type_index.astype("u1").tobytes(),
+        ))
+
+
+# 줌 레벨 타일 폭(도)을 나누는 격자 칸 수
+DENSITY_CELLS_PER_TILE = 8
+
+
+def encode_density(
+    frame: Dict[str, Any],
+    type_names: np.ndarray,
+    type_codes: np.ndarray,
+    zoom: float,
+    indices: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
+    """차량을 줌에 맞는 격자로 집계한 vehicle_density 메시지 (indices 가 있으면 그 차량만)"""
+    lat, lng, speed = frame["lat"], frame["lng"], frame["speed"]
+    if indices is not None:
+        lat, lng, speed, type_codes = lat[indices], lng[indices], speed[indices], type_codes[indices]
+
+    cell_size = 360.0 / (2.0 ** zoom) / DENSITY_CELLS_PER_TILE
+    message = {"type": "vehicle_density", "step": frame["step"], "zoom": zoom, "cellSize": cell_size}
+
+    # 전체 타입 문자열을 기본 타입으로 묶음 (passenger_passenger -> passenger)
+    base_names, base_of_type = np.unique(
+        np.array([str(name).split("_")[0] for name in type_names], dtype=str), return_inverse=True
+    ) if len(type_names) else (np.zeros(0, dtype=str), np.zeros(0, dtype=np.int64))
+    message["types"] = base_names.tolist()
+
+    if len(lat) == 0:
+        message["cells"] = []
+    else:
+        rows = np.floor(lat / cell_size).astype(np.int64)
+        cols = np.floor(lng / cell_size).astype(np.int64)
+        cell_keys, inverse, counts = np.unique((rows << 32) + (cols + (1 << 31)), return_inverse=True, return_counts=True)
+        cell_count = len(cell_keys)
+        mean_lat = np.bincount(inverse, weights=lat, minlength=cell_count) / counts
+        mean_lng = np.bincount(inverse, weights=lng, minlength=cell_count) / counts
+        mean_speed = np.bincount(inverse, weights=speed, minlength=cell_count) / counts
+
+        # 칸별 기본 타입 빈도에서 최빈 타입
+        base_count = len(base_names)
+        type_histogram = np.bincount(
+            inverse * base_count + base_of_type[type_codes], minlength=cell_count * base_count
+        ).reshape(cell_count, base_count)
+        dominant = type_histogram.argmax(axis=1)
+
+        message["cells"] = [
+            list(cell) for cell in zip(
+                np.round(mean_lat, 6).tolist(), np.round(mean_lng, 6).tolist(), counts.tolist(),
+                np.round(mean_speed, 1).tolist(), dominant.tolist()
+            )
+        ]
+
+    message.update({key: frame[key] for key in FRAME_META_KEYS})
+    return message
+
+
+class ReckoningFrameEncoder:
+    """추측 항법용 전체 상태 메시지(vehicle_reckoning)로 프레임을 인코딩 (연결마다 하나씩 생성)"""
+
+    # 모든 메시지가 전체 상태를 담음
+    last_keyframe = True
+
+    def __init__(self):
+        self.routes: Dict[str, str] = {}  # 직전 메시지의 차량별 경로 ID
+
+    def encode(self, frame: Dict[str, Any], keyframe: bool = False) -> Dict[str, Any]:
+        ids = frame["ids"]
+        routes = dict(zip(ids, frame["routes"]))
+        previous = self.routes
+        events = list(frame["events"])
+        events.extend(
+            ["reroute", vehicle_id, frame["time"], route]
+            for vehicle_id, route in routes.items()
+            if previous.get(vehicle_id, route) != route
+        )
+        self.routes = routes
+
+        vehicles = [
+            [vehicle_id, vehicle_type, lat, lng, angle, speed, accel]
+            for vehicle_id, vehicle_type, lat, lng, angle, speed, accel in zip(
+                ids, frame["types"], np.round(frame["lat"], 6).tolist(), np.round(frame["lng"], 6).tolist(),
+                np.round(frame["angle"], 1).tolist(), np.round(frame["speed"], 1).tolist(),
+                np.round(frame["accel"], 2).tolist()
+            )
+        ]
+        message = {
+            "type": "vehicle_reckoning",
+            "step": frame["step"],
+            "time": frame["time"],
+            "rate": frame["rate"],
+            "vehicles": vehicles,
+            "events": events
+        }
+        message.update({key: frame[key] for key in FRAME_META_KEYS})
+        return message
+
+
+def reckoning_interval(options: Dict[str, Any]) -> Optional[float]:
+    """reckoning 프로토콜이면 메시지 전송 간격(실제 시간, 초), 아니면 None"""
+    if options.get("protocol", "json") != "reckoning":
+        return None
+    rate = float(options.get("reckoningRate", 2))
+    if not rate > 0:
+        raise ValueError("reckoningRate는 0보다 커야 합니다")
+    return 1.0 / rate
+
+
+def create_frame_encoder(options: Dict[str, Any]):
+    """클라이언트 설정 메시지에 맞는 프레임 인코더를 생성"""
+    protocol = options.get("protocol", "json")
+    codec = options.get("codec", "json")
+    if codec == "binary":
+        if protocol != "json":
+            raise ValueError(f"binary 코덱은 {protocol} 프로토콜과 함께 사용할 수 없습니다")
+        return BinaryFrameEncoder()
+    if codec != "json":
+        raise ValueError(f"지원하지 않는 코덱입니다: {codec}")
+    if protocol == "json":
+        return JsonFrameEncoder()
+    if protocol == "delta":
+        return DeltaFrameEncoder(keyframe_interval=int(options.get("keyframeInterval", 30)))
+    if protocol == "reckoning":
+        return ReckoningFrameEncoder()
+    raise ValueError(f"지원하지 않는 프로토콜입니다: {protocol}")
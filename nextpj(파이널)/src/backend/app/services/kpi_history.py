@@ -0,0 +1,209 @@
+# src/backend/app/services/kpi_history.py
+"""
+세션별 KPI 시계열 저장소
+
+프레임마다 계산한 KPI(traffic_kpis)를 해상도별 고정 크기 링 버퍼에 모읍니다.
+    1초  해상도: 최근 1시간
+    10초 해상도: 최근 6시간
+    60초 해상도: 최근 24시간
+각 해상도의 한 행은 그 구간에 기록된 값의 평균(누적 값인 arrived/teleports 는 합계)입니다.
+조회 결과의 마지막 점은 아직 끝나지 않은 현재 구간일 수 있으며, 이때 "partial" 이 true 입니다.
+속도와 대기 시간은 모든 차량 관측값을 로그 간격 히스토그램 스케치(DDSketch 방식)에
+누적해 분위수를 상대 오차 1% 이내로 제공합니다.
+
+작업 스레드가 record()로 쓰고 이벤트 루프의 REST 핸들러가 query()로 읽으므로 잠금으로 보호합니다.
+"""
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+import math, threading
+import numpy as np
+
+# (해상도 초, 보관 행 수)
+KPI_TIERS = ((1.0, 3600), (10.0, 2160), (60.0, 1440))
+# 링 버퍼에 저장하는 KPI 항목 (SUM_FIELDS 는 구간 합계, 나머지는 구간 평균)
+KPI_FIELDS = ("running", "meanSpeed", "halting", "meanWaitingTime", "arrived", "teleports")
+SUM_FIELDS = ("arrived", "teleports")
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class KpiRingBuffer:
+    """시각 + KPI 행을 담는 고정 크기 배열 링 버퍼 (가득 차면 가장 오래된 행부터 덮어씀)"""
+
+    def __init__(self, capacity: int, width: int):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros((capacity, width), dtype=np.float64)
+        self.head = 0  # 다음에 쓸 위치
+        self.count = 0
+
+    def append(self, time: float, row: np.ndarray) -> None:
+        self.times[self.head] = time
+        self.values[self.head] = row
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def window(self, start: float, end: float) -> Tuple[np.ndarray, np.ndarray]:
+        """start <= 시각 <= end 인 행을 시간 순서대로 반환 (시각 배열, 값 배열)"""
+        if self.count < self.capacity:
+            order = np.arange(self.count)
+        else:
+            order = (np.arange(self.capacity) + self.head) % self.capacity
+        times = self.times[order]
+        order = order[np.searchsorted(times, start, side="left"):np.searchsorted(times, end, side="right")]
+        return self.times[order], self.values[order]
+
+
+class _Tier:
+    """한 해상도의 구간 집계기 + 링 버퍼"""
+
+    def __init__(self, resolution: float, capacity: int, sum_mask: np.ndarray):
+        self.resolution = resolution
+        self.buffer = KpiRingBuffer(capacity, len(sum_mask))
+        self.sum_mask = sum_mask
+        self.bucket: Optional[int] = None
+        self.sums = np.zeros(len(sum_mask))
+        self.samples = 0
+
+    def add(self, time: float, row: np.ndarray) -> None:
+        bucket = int(time // self.resolution)
+        if self.bucket is not None and bucket != self.bucket:
+            self.flush()
+        self.bucket = bucket
+        self.sums += row
+        self.samples += 1
+
+    def current(self) -> Optional[Tuple[float, np.ndarray]]:
+        """진행 중인 구간의 (시작 시각, 지금까지의 집계 행) (없으면 None)"""
+        if not self.samples:
+            return None
+        return self.bucket * self.resolution, np.where(self.sum_mask, self.sums, self.sums / self.samples)
+
+    def flush(self) -> None:
+        """진행 중인 구간을 한 행으로 확정"""
+        current = self.current()
+        if current is None:
+            return
+        self.buffer.append(*current)
+        self.sums[:] = 0
+        self.samples = 0
+
+
+class QuantileSketch:
+    """로그 간격 버킷 히스토그램 분위수 스케치 (DDSketch 방식)
+
+    양수 값 v 는 ceil(log_gamma(v)) 버킷에 세고, min_value 미만 값은 0 버킷에 셉니다.
+    버킷 대표값의 상대 오차는 relative_accuracy 이내이며, 스텝마다 np.bincount 한 번으로 누적합니다.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 0.01, max_value: float = 1e5):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.offset = math.ceil(math.log(min_value) / self.log_gamma)
+        self.buckets = math.ceil(math.log(max_value) / self.log_gamma) - self.offset + 1
+        self.counts = np.zeros(self.buckets + 1, dtype=np.int64)  # 0번은 min_value 미만 값
+
+    def add(self, values: np.ndarray) -> None:
+        if not len(values):
+            return
+        positive = values[values >= self.min_value]
+        self.counts[0] += len(values) - len(positive)
+        if len(positive):
+            indices = np.ceil(np.log(positive) / self.log_gamma).astype(np.int64) - self.offset
+            self.counts[1:] += np.bincount(np.clip(indices, 0, self.buckets - 1), minlength=self.buckets)
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def quantile(self, q: float) -> Optional[float]:
+        total = self.total
+        if total == 0:
+            return None
+        index = int(np.searchsorted(np.cumsum(self.counts), q * (total - 1) + 1))
+        if index == 0:
+            return 0.0
+        # 버킷 (gamma^(k-1), gamma^k] 의 대표값
+        return 2 * self.gamma ** (index - 1 + self.offset) / (self.gamma + 1)
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        snapshot = {}
+        for q in QUANTILES:
+            value = self.quantile(q)
+            snapshot[f"p{round(q * 100)}"] = round(value, 2) if value is not None else None
+        return snapshot
+
+
+class KpiHistory:
+    """한 세션의 KPI 시계열 (해상도별 링 버퍼 + 속도/대기 시간 분위수 스케치)"""
+
+    def __init__(self, tiers: Sequence[Tuple[float, int]] = KPI_TIERS):
+        sum_mask = np.array([field in SUM_FIELDS for field in KPI_FIELDS])
+        self.tiers = [_Tier(resolution, capacity, sum_mask) for resolution, capacity in tiers]
+        self.speed_sketch = QuantileSketch(max_value=1000)
+        self.waiting_sketch = QuantileSketch()
+        self.lock = threading.Lock()
+
+    def record(self, time: float, kpis: Dict[str, Any], speeds: np.ndarray, waiting: np.ndarray) -> None:
+        """[작업 스레드] 한 프레임의 KPI 와 차량별 속도(km/h)/대기 시간(초) 기록"""
+        row = np.array([kpis[field] for field in KPI_FIELDS], dtype=np.float64)
+        with self.lock:
+            for tier in self.tiers:
+                tier.add(time, row)
+            self.speed_sketch.add(speeds)
+            self.waiting_sketch.add(waiting)
+
+    def finish(self) -> None:
+        """진행 중인 구간을 모두 확정 (시뮬레이션 종료 시)"""
+        with self.lock:
+            for tier in self.tiers:
+                tier.flush()
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        resolution: Optional[float] = None,
+        max_points: int = 500
+    ) -> Dict[str, Any]:
+        """구간 [start, end] 의 KPI 시계열
+
+        resolution 을 지정하지 않으면 max_points 이하로 담을 수 있는 가장 세밀한 해상도를 고릅니다.
+        진행 중인 구간이 범위 안에 있으면 마지막 점으로 덧붙이고 partial 을 true 로 표시합니다.
+        지원하지 않는 해상도면 ValueError.
+        """
+        start = -math.inf if start is None else start
+        end = math.inf if end is None else end
+        with self.lock:
+            if resolution is not None:
+                matches = [tier for tier in self.tiers if tier.resolution == resolution]
+                if not matches:
+                    supported = ", ".join(f"{tier.resolution:g}" for tier in self.tiers)
+                    raise ValueError(f"지원하지 않는 해상도입니다: {resolution:g} (지원: {supported})")
+                tier = matches[0]
+                times, values = tier.buffer.window(start, end)
+            else:
+                for tier in self.tiers:
+                    times, values = tier.buffer.window(start, end)
+                    if len(times) < max_points:
+                        break
+
+            current = tier.current()
+            partial = current is not None and start <= current[0] <= end
+            if partial:
+                times = np.append(times, current[0])
+                values = np.vstack((values, current[1]))
+
+            series = {field: values[:, i].round(2).tolist() for i, field in enumerate(KPI_FIELDS)}
+            # 구간 처리량 (veh/h)
+            series["throughput"] = (values[:, KPI_FIELDS.index("arrived")] * 3600 / tier.resolution).round(1).tolist()
+            return {
+                "resolution": tier.resolution,
+                "times": times.tolist(),
+                "partial": partial,
+                "series": series,
+                "quantiles": {
+                    "speed": self.speed_sketch.snapshot(),
+                    "waitingTime": self.waiting_sketch.snapshot(),
+                },
+            }
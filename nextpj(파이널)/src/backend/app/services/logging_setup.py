@@ -0,0 +1,161 @@
+# src/backend/app/services/logging_setup.py
+"""
+프로세스 전체 로깅 설정
+
+서버 시작 시 configure_logging() 을 한 번 호출하면 루트 로거에 QueueHandler 만 붙이고,
+실제 파일/콘솔 출력은 QueueListener 의 백그라운드 스레드가 수행합니다. 로그를 남기는 쪽
+(시뮬레이션 스텝 루프 등)은 큐에 넣기만 하므로 디스크 쓰기를 기다리지 않습니다.
+
+출력 위치 (LOG_DIR, 기본값: data/logs):
+    server.log              : 모든 로그 (크기 순환)
+    sessions/<컨텍스트>.log : 세션/작업별 로그 (context_logger 또는 log_context 로 지정한 로그만)
+    콘솔(stdout)            : 모든 로그
+"""
+
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+import os, sys, time, queue, logging, logging.handlers
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(context_prefix)s%(message)s"
+# server.log 순환 크기와 보관 개수
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+# 동시에 열어 둘 세션/작업별 로그 파일 수 (넘으면 가장 오래 연 파일부터 닫고, 다음 기록 시 이어서 씀)
+MAX_CONTEXT_FILES = 32
+# 스텝 루프처럼 자주 반복되는 로그의 최소 기록 간격 (초)
+LOG_THROTTLE_INTERVAL = float(os.environ.get("LOG_THROTTLE_INTERVAL", "5"))
+
+# 현재 작업의 로그 컨텍스트 (이벤트 루프 태스크마다 따로 유지, 모듈 로거의 로그도 세션 로그에 포함)
+log_context: ContextVar[Optional[str]] = ContextVar("log_context", default=None)
+
+_queue: Optional[queue.SimpleQueue] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _ContextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        context = getattr(record, "log_context", None)
+        record.context_prefix = f"[{context}] " if context else ""
+        return super().format(record)
+
+
+class _ContextFilter(logging.Filter):
+    """[로그를 남기는 스레드] 명시한 컨텍스트가 없으면 현재 log_context 를 기록에 붙임"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "log_context", None) is None:
+            record.log_context = log_context.get()
+        return True
+
+
+def _not_close_marker(record: logging.LogRecord) -> bool:
+    return not getattr(record, "log_context_close", False)
+
+
+class _ContextFileHandler(logging.Handler):
+    """[리스너 스레드] 컨텍스트가 있는 로그를 컨텍스트별 파일로 나눠 기록"""
+
+    def __init__(self, directory: str, formatter: logging.Formatter):
+        super().__init__()
+        self.directory = directory
+        self.formatter = formatter
+        self.files: Dict[str, logging.FileHandler] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        context = getattr(record, "log_context", None)
+        if context is None:
+            return
+        if getattr(record, "log_context_close", False):
+            handler = self.files.pop(context, None)
+            if handler is not None:
+                handler.close()
+            return
+        handler = self.files.get(context)
+        if handler is None:
+            if len(self.files) >= MAX_CONTEXT_FILES:
+                self.files.pop(next(iter(self.files))).close()
+            os.makedirs(self.directory, exist_ok=True)
+            handler = logging.FileHandler(os.path.join(self.directory, f"{context}.log"), encoding="utf-8")
+            handler.setFormatter(self.formatter)
+            self.files[context] = handler
+        handler.emit(record)
+
+    def close(self) -> None:
+        for handler in self.files.values():
+            handler.close()
+        self.files.clear()
+        super().close()
+
+
+def configure_logging(log_dir: str) -> None:
+    """루트 로거를 QueueHandler + 백그라운드 QueueListener 로 설정 (여러 번 호출해도 한 번만 적용)"""
+    global _queue, _listener
+    if _listener is not None:
+        return
+
+    os.makedirs(log_dir, exist_ok=True)
+    formatter = _ContextFormatter(LOG_FORMAT)
+    console = logging.StreamHandler(sys.stdout)
+    server_file = logging.handlers.RotatingFileHandler(
+        os.path.join(log_dir, "server.log"), maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+    )
+    for handler in (console, server_file):
+        handler.setFormatter(formatter)
+        handler.addFilter(_not_close_marker)
+    context_files = _ContextFileHandler(os.path.join(log_dir, "sessions"), formatter)
+
+    _queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(_queue)
+    queue_handler.addFilter(_ContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(_queue, console, server_file, context_files)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 로그를 모두 기록하고 리스너 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def context_logger(name: str, context: str) -> logging.LoggerAdapter:
+    """모든 로그에 컨텍스트(세션/작업 ID)를 붙이는 로거 (작업 스레드에서도 세션 로그로 기록됨)"""
+    return logging.LoggerAdapter(logging.getLogger(name), {"log_context": context})
+
+
+def close_context_log(context: str) -> None:
+    """컨텍스트 로그 파일 닫기 (앞서 큐에 넣은 로그를 모두 쓴 뒤 리스너 스레드에서 닫힘)"""
+    if _queue is not None:
+        _queue.put_nowait(logging.makeLogRecord({"log_context": context, "log_context_close": True}))
+
+
+class ThrottledLog:
+    """interval 초에 한 번만 기록하는 로그 (그 사이 생략한 건수는 다음 기록에 덧붙임)"""
+
+    def __init__(self, logger: Any, interval: float = LOG_THROTTLE_INTERVAL):
+        self.logger = logger
+        self.interval = interval
+        self.last = -float("inf")
+        self.suppressed = 0
+
+    def info(self, message: str) -> None:
+        now = time.monotonic()
+        if now - self.last < self.interval:
+            self.suppressed += 1
+            return
+        if self.suppressed:
+            message = f"{message} (이전 {self.suppressed}건 생략)"
+        self.logger.info(message)
+        self.last = now
+        self.suppressed = 0
@@ -0,0 +1,61 @@
+# src/backend/app/services/loop_monitor.py
+
+from collections import deque
+from typing import Any, Dict, Optional
+import asyncio
+
+
+class EventLoopLagMonitor:
+    """이벤트 루프 지연(lag)을 주기적으로 측정하는 클래스
+
+    interval 만큼 sleep 한 뒤 실제로 깨어난 시각과의 차이를 지연으로 기록합니다.
+    블로킹 호출이 이벤트 루프를 점유하면 이 값이 커집니다.
+    """
+
+    def __init__(self, interval: float = 0.1, window: int = 600):
+        self.interval = interval
+        self.samples: deque = deque(maxlen=window)  # 최근 지연 값 (초)
+        self.total_samples = 0
+        self.max_lag = 0.0
+        self.task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self.samples.append(lag)
+            self.total_samples += 1
+            self.max_lag = max(self.max_lag, lag)
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """최근 구간의 지연 통계 (밀리초)"""
+        recent = sorted(self.samples)
+        if not recent:
+            return {"samples": 0, "lastMs": 0.0, "meanMs": 0.0, "p99Ms": 0.0, "maxMs": 0.0, "maxSinceStartMs": 0.0}
+        return {
+            "samples": self.total_samples,
+            "lastMs": round(self.samples[-1] * 1000, 3),
+            "meanMs": round(sum(recent) / len(recent) * 1000, 3),
+            "p99Ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.99))] * 1000, 3),
+            "maxMs": round(recent[-1] * 1000, 3),
+            "maxSinceStartMs": round(self.max_lag * 1000, 3),
+        }
+
+
+# 프로세스 전체에서 공유하는 모니터 (main.py 에서 시작)
+loop_lag_monitor = EventLoopLagMonitor()
@@ -0,0 +1,148 @@
+# src/backend/app/services/metrics.py
+"""
+프로세스 내 성능 지표 (Prometheus 텍스트 형식으로 /metrics 에 노출)
+
+외부 라이브러리 없이 고정 버킷 히스토그램과 게이지만 제공합니다. 관측은 버킷 위치 탐색과
+정수 증가뿐이므로 프레임당 수 마이크로초 수준이며, METRICS_ENABLED=false 면 관측을 건너뜁니다.
+
+    sumo_stage_seconds{stage}              : 프레임 처리 단계별 소요 시간 히스토그램
+        simulation_step, collect, transfer(libsumo 작업 프로세스 파이프), kpis, projection,
+        record, encode, send(구독자별 송신 큐에서 메시지 하나를 보내는 시간)
+    sumo_active_sessions                   : 실행 중인 시뮬레이션 세션 수
+    sumo_session_vehicles{session}         : 세션의 최근 스텝 차량 수
+    sumo_session_frame_bytes{session}      : 세션의 최근 프레임 전송 크기 (모든 뷰 합계)
+    sumo_session_realtime_factor{session}  : 세션의 시뮬레이션 시간 / 실제 시간 (약 1초 구간)
+    sumo_generation_stage_seconds{stage}   : 최근 시나리오 생성 단계별 소요 시간
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import os, bisect, threading
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+
+# 단계 소요 시간 버킷 (초)
+STAGE_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) or abs(value) >= 1e15 else str(int(value))
+
+
+class Histogram:
+    """레이블 값 조합별 고정 버킷 히스토그램"""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float], label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self.series: Dict[Tuple[str, ...], List[float]] = {}  # 레이블 -> [버킷별 개수..., +Inf 개수, 합계]
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        if not METRICS_ENABLED:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            snapshot = [(labels, list(series)) for labels, series in self.series.items()]
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """레이블 값 조합별 현재 값 (function 을 주면 조회 시점에 계산)"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 function: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.function = function
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, *label_values: str) -> None:
+        if METRICS_ENABLED:
+            self.values[label_values] = value
+
+    def remove(self, *label_values: str) -> None:
+        self.values.pop(label_values, None)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        if self.function is not None:
+            lines.append(f"{self.name} {_number(self.function())}")
+        for labels, value in list(self.values.items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """지표 목록과 텍스트 형식 출력"""
+
+    def __init__(self):
+        self.metrics: List[object] = []
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float], label_names: Sequence[str] = ()) -> Histogram:
+        metric = Histogram(name, help_text, buckets, label_names)
+        self.metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, help_text: str, label_names: Sequence[str] = (),
+              function: Optional[Callable[[], float]] = None) -> Gauge:
+        metric = Gauge(name, help_text, label_names, function)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 전체에서 공유하는 지표
+metrics = MetricsRegistry()
+STAGE_SECONDS = metrics.histogram(
+    "sumo_stage_seconds", "프레임 처리 단계별 소요 시간 (초)", STAGE_BUCKETS, ("stage",)
+)
+SESSION_VEHICLES = metrics.gauge("sumo_session_vehicles", "세션의 최근 스텝 차량 수", ("session",))
+SESSION_FRAME_BYTES = metrics.gauge("sumo_session_frame_bytes", "세션의 최근 프레임 전송 크기 (바이트)", ("session",))
+SESSION_REALTIME_FACTOR = metrics.gauge(
+    "sumo_session_realtime_factor", "세션의 시뮬레이션 시간 / 실제 시간", ("session",)
+)
+GENERATION_STAGE_SECONDS = metrics.gauge(
+    "sumo_generation_stage_seconds", "최근 시나리오 생성 단계별 소요 시간 (초)", ("stage",)
+)
+
+
+def remove_session_metrics(session_id: str) -> None:
+    """끝난 세션의 레이블 값 제거"""
+    for gauge in (SESSION_VEHICLES, SESSION_FRAME_BYTES, SESSION_REALTIME_FACTOR):
+        gauge.remove(session_id)
@@ -0,0 +1,240 @@
+# src/backend/app/services/network_index.py
+"""
+SUMO 네트워크 인덱스 캐시
+
+osm.net.xml.gz 를 세션마다 DOM 으로 파싱하는 대신, 시나리오 생성 시 한 번 iterparse 로
+스트리밍 파싱해 필요한 정보만 .npy 배열로 저장하고 세션은 이를 메모리 매핑으로 읽습니다.
+
+저장 위치: data/network_index/<네트워크 파일 SHA-1>/
+    meta.json       : location 속성(netOffset, projParameter, convBoundary, origBoundary), 엣지 타입 표
+    edge_ids.npy    : 엣지 ID (내부 엣지 제외)
+    edge_types.npy  : 엣지 타입 표 인덱스 (uint16)
+    lane_counts.npy : 차로 수 (uint8)
+    lengths.npy     : 첫 차로 길이 (m, float32)
+    speeds.npy      : 첫 차로 제한 속도 (m/s, float32)
+    lane_shape_offsets.npy : 차로별 형상 점 시작 위치 (int64, 차로 수 + 1)
+    lane_shapes.npy : 엣지 순서대로 이어 붙인 차로 형상 점 (네트워크 좌표 x, y, float64, 점 수 x 2)
+    lane_permissions.npy : 엣지 순서대로 이어 붙인 차로별 원래 통행 허용 설정
+                      ("allow:bus taxi", "disallow:pedestrian", 설정이 없으면 "")
+data/network_index/files.json 은 네트워크 파일의 (크기, 수정 시각) 별 해시를 기억해
+같은 파일을 다시 해시하지 않도록 합니다.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import os, gzip, hashlib, json, logging, shutil, threading, uuid
+import xml.etree.ElementTree as ET
+import numpy as np
+
+INDEX_VERSION = 3
+INDEX_DIR_NAME = "network_index"
+FILES_CACHE = "files.json"
+ARRAY_NAMES = (
+    "edge_ids", "edge_types", "lane_counts", "lengths", "speeds",
+    "lane_permissions", "lane_shape_offsets", "lane_shapes"
+)
+
+_build_lock = threading.Lock()
+logger = logging.getLogger(__name__)
+
+
+class NetworkIndex:
+    """메모리 매핑된 네트워크 인덱스 (배열은 읽기 전용)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.location: Dict[str, str] = meta["location"]
+        self.type_names: List[str] = meta["types"]
+        self.sha1: str = meta["sha1"]
+        for name in ARRAY_NAMES:
+            setattr(self, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r"))
+        self._positions: Optional[Dict[str, int]] = None
+        self._lane_offsets: Optional[np.ndarray] = None
+
+    def positions(self, edge_ids: List[str]) -> np.ndarray:
+        """엣지 ID 목록을 인덱스 배열 위치로 변환 (없는 ID 가 있으면 ValueError)"""
+        if self._positions is None:
+            self._positions = {edge_id: i for i, edge_id in enumerate(self.edge_ids.tolist())}
+        missing = [edge_id for edge_id in edge_ids if edge_id not in self._positions]
+        if missing:
+            raise ValueError(f"네트워크에 없는 엣지입니다: {', '.join(missing[:5])}")
+        return np.array([self._positions[edge_id] for edge_id in edge_ids], dtype=np.int64)
+
+    def lane_offsets(self) -> np.ndarray:
+        """엣지별 첫 차로의 전체 차로 순번 (엣지 수 + 1)"""
+        if self._lane_offsets is None:
+            self._lane_offsets = np.concatenate(([0], np.cumsum(self.lane_counts, dtype=np.int64)))
+        return self._lane_offsets
+
+    def lane_permission(self, position: int, lane: int) -> str:
+        """position 위치 엣지의 lane 번 차로 원래 통행 허용 설정"""
+        return str(self.lane_permissions[self.lane_offsets()[position] + lane])
+
+    def edges_of_type(self, edge_type: str) -> List[str]:
+        """해당 타입(예: highway.motorway_link)의 엣지 ID 목록"""
+        if edge_type not in self.type_names:
+            return []
+        return self.edge_ids[self.edge_types == self.type_names.index(edge_type)].tolist()
+
+
+def _index_root(net_file_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(net_file_path)), INDEX_DIR_NAME)
+
+
+def _file_sha1(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cached_sha1(net_file_path: str) -> str:
+    """(크기, 수정 시각)이 같으면 기억해 둔 해시를 사용하고, 다르면 다시 계산해 기록"""
+    root = _index_root(net_file_path)
+    cache_path = os.path.join(root, FILES_CACHE)
+    stat = os.stat(net_file_path)
+    key = os.path.abspath(net_file_path)
+    signature = [stat.st_size, stat.st_mtime_ns]
+
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            files = json.load(f)
+    except (OSError, ValueError):
+        files = {}
+    entry = files.get(key)
+    if entry and entry.get("signature") == signature:
+        return entry["sha1"]
+
+    sha1 = _file_sha1(net_file_path)
+    files[key] = {"signature": signature, "sha1": sha1}
+    os.makedirs(root, exist_ok=True)
+    temp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(files, f)
+    os.replace(temp_path, cache_path)
+    return sha1
+
+
+def _shape_points(shape: str) -> List[Tuple[float, float]]:
+    """차로 shape 속성("x,y x,y ..." 또는 "x,y,z ...")의 (x, y) 점 목록"""
+    points = []
+    for point in shape.split():
+        x, y = point.split(",")[:2]
+        points.append((float(x), float(y)))
+    return points
+
+
+def _lane_permission(lane: ET.Element) -> str:
+    if lane.get("allow") is not None:
+        return f"allow:{lane.get('allow')}"
+    if lane.get("disallow") is not None:
+        return f"disallow:{lane.get('disallow')}"
+    return ""
+
+
+def _parse_network(net_file_path: str) -> Dict[str, Any]:
+    """네트워크 파일을 iterparse 로 스트리밍 파싱 (처리한 요소는 바로 해제해 메모리 사용량 일정)"""
+    location: Optional[Dict[str, str]] = None
+    edge_ids: List[str] = []
+    edge_types: List[int] = []
+    lane_counts: List[int] = []
+    lengths: List[float] = []
+    speeds: List[float] = []
+    shape_offsets: List[int] = [0]
+    shapes: List[Tuple[float, float]] = []
+    lane_permissions: List[str] = []
+    type_codes: Dict[str, int] = {}
+
+    opener = gzip.open if net_file_path.endswith(".gz") else open
+    with opener(net_file_path, "rb") as net_file:
+        root = None
+        depth = 0
+        for event, elem in ET.iterparse(net_file, events=("start", "end")):
+            if event == "start":
+                root = elem if root is None else root
+                depth += 1
+                continue
+            depth -= 1
+            if depth != 1:
+                continue
+            if elem.tag == "location":
+                location = dict(elem.attrib)
+            elif elem.tag == "edge":
+                if elem.get("function") != "internal":
+                    lanes = elem.findall("lane")
+                    edge_ids.append(elem.get("id"))
+                    edge_types.append(type_codes.setdefault(elem.get("type", ""), len(type_codes)))
+                    lane_counts.append(len(lanes))
+                    lengths.append(float(lanes[0].get("length", 0)) if lanes else 0.0)
+                    speeds.append(float(lanes[0].get("speed", 0)) if lanes else 0.0)
+                    for lane in lanes:
+                        lane_permissions.append(_lane_permission(lane))
+                        shapes.extend(_shape_points(lane.get("shape", "")))
+                        shape_offsets.append(len(shapes))
+            # 최상위 요소 바로 아래 요소(엣지, 교차로, 연결 등)는 처리 후 바로 제거
+            root.clear()
+
+    if location is None:
+        raise ValueError("XML 파일에서 location 요소를 찾을 수 없습니다")
+    return {
+        "location": location,
+        "types": list(type_codes),
+        "arrays": {
+            "edge_ids": np.array(edge_ids, dtype=str),
+            "edge_types": np.array(edge_types, dtype=np.uint16),
+            "lane_counts": np.array(lane_counts, dtype=np.uint8),
+            "lengths": np.array(lengths, dtype=np.float32),
+            "speeds": np.array(speeds, dtype=np.float32),
+            "lane_permissions": np.array(lane_permissions, dtype=str),
+            "lane_shape_offsets": np.array(shape_offsets, dtype=np.int64),
+            "lane_shapes": np.array(shapes, dtype=np.float64).reshape(-1, 2),
+        },
+    }
+
+
+def _is_current(directory: str) -> bool:
+    try:
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            return json.load(f).get("version") == INDEX_VERSION
+    except (OSError, ValueError):
+        return False
+
+
+def load_network_index(net_file_path: str) -> NetworkIndex:
+    """네트워크 파일 해시에 해당하는 인덱스를 읽고, 없으면 만들어 저장 (블로킹)"""
+    sha1 = _cached_sha1(net_file_path)
+    directory = os.path.join(_index_root(net_file_path), sha1)
+    with _build_lock:
+        if _is_current(directory):
+            return NetworkIndex(directory)
+        # 형식이 바뀐 이전 버전 인덱스는 다시 생성
+        shutil.rmtree(directory, ignore_errors=True)
+
+        parsed = _parse_network(net_file_path)
+        # 임시 디렉토리에 모두 쓴 뒤 이름을 바꿔, 다른 프로세스가 만들다 만 인덱스를 읽지 않게 함
+        temp_dir = f"{directory}.{uuid.uuid4().hex}.tmp"
+        os.makedirs(temp_dir)
+        try:
+            for name, array in parsed["arrays"].items():
+                np.save(os.path.join(temp_dir, f"{name}.npy"), array)
+            with open(os.path.join(temp_dir, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": INDEX_VERSION,
+                    "sha1": sha1,
+                    "source": os.path.basename(net_file_path),
+                    "location": parsed["location"],
+                    "types": parsed["types"],
+                }, f, ensure_ascii=False)
+            try:
+                os.rename(temp_dir, directory)
+            except OSError:
+                # 다른 프로세스가 먼저 만든 경우
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        logger.info(f"네트워크 인덱스 생성: {directory} (엣지 {len(parsed['arrays']['edge_ids'])}개)")
+    return NetworkIndex(directory)
+
@@ -2,13 +2,17 @@
 
 import os
 import sys
+import time
+import asyncio
 import subprocess
 import osmnx as ox
 from typing import Dict, Any, AsyncGenerator
-import logging
 from pathlib import Path
 import gzip
 from datetime import datetime
+from services.network_index import load_network_index
+from services.logging_setup import close_context_log, context_logger
+from services.metrics import GENERATION_STAGE_SECONDS
 
 class OSMGenerator:
     def __init__(self):
@@ -29,20 +33,9 @@ class OSMGenerator:
         # 파일 이름 접두사 설정
         self.prefix = "osm"
 
-        # 로깅 설정
-        log_file = os.path.join(self.data_dir, 'simulation_runner.log')
-        if os.path.exists(log_file):
-            os.remove(log_file)  # 기존 로그 파일 삭제
-        
-        logging.basicConfig(
-            level=logging.INFO,  # DEBUG에서 INFO로 변경하여 로그 양 감소
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        # 로깅 설정 (프로세스 전체 설정은 서버 시작 시 한 번, 생성 작업마다 sessions/generate-<시각>.log 에도 기록)
+        self.log_context = f"generate-{datetime.now():%Y%m%d-%H%M%S}"
+        self.logger = context_logger(__name__, self.log_context)
 
 
         # OSMnx 기본 설정
@@ -200,6 +193,7 @@ class OSMGenerator:
 
             try:
                 # OSM 데이터 다운로드
+                stage_started = time.perf_counter()
                 G = ox.graph_from_point(
                     center_point=center_point,
                     dist=distance,
@@ -213,6 +207,7 @@ class OSMGenerator:
 
                 node_count = len(G.nodes)
                 edge_count = len(G.edges)
+                GENERATION_STAGE_SECONDS.set(round(time.perf_counter() - stage_started, 3), "download")
                 self.logger.info(f"OSM 데이터 다운로드 성공. 노드 수: {node_count}, 엣지 수: {edge_count}")
                 yield {"progress": 30, "message": "OSM 데이터 다운로드 완료"}
 
@@ -230,7 +225,9 @@ class OSMGenerator:
 
             try:
                 # OSM XML 형식으로 저장
+                stage_started = time.perf_counter()
                 ox.save_graph_xml(G, filepath=osm_file)
+                GENERATION_STAGE_SECONDS.set(round(time.perf_counter() - stage_started, 3), "save_osm")
                 self.logger.info(f"OSM 파일 저장 성공: {osm_file}")
                 yield {"progress": 50, "message": "OSM 데이터 저장 완료"}
             except Exception as e:
@@ -271,7 +268,9 @@ class OSMGenerator:
             ]
 
             try:
+                stage_started = time.perf_counter()
                 result = subprocess.run(netconvert_options, check=True, capture_output=True, text=True)
+                GENERATION_STAGE_SECONDS.set(round(time.perf_counter() - stage_started, 3), "netconvert")
                 self.logger.info("SUMO 네트워크 생성 성공")
                 self.logger.debug(f"netconvert 출력: {result.stdout}")
 
@@ -281,6 +280,15 @@ class OSMGenerator:
                         f_out.write(f_in.read())
                 os.remove(net_file)  # 원본 파일 삭제
                 self.logger.info("네트워크 파일 압축 완료")
+
+                # 세션마다 네트워크 전체를 파싱하지 않도록 인덱스를 미리 생성 (실패해도 세션 시작 시 다시 생성)
+                # 파싱이 오래 걸리므로 이벤트 루프를 막지 않도록 작업 스레드에서 실행
+                try:
+                    stage_started = time.perf_counter()
+                    await asyncio.to_thread(load_network_index, f"{net_file}.gz")
+                    GENERATION_STAGE_SECONDS.set(round(time.perf_counter() - stage_started, 3), "network_index")
+                except Exception as e:
+                    self.logger.warning(f"네트워크 인덱스 생성 실패: {str(e)}")
                 yield {"progress": 70, "message": "SUMO 네트워크 생성 완료"}
             except Exception as e:
                 self.logger.error(f"SUMO 네트워크 생성 실패: {str(e)}")
@@ -290,7 +298,9 @@ class OSMGenerator:
             # 경로 생성
             yield {"progress": 80, "message": "경로 생성 중..."}
             try:
+                stage_started = time.perf_counter()
                 await self._generate_routes(data["vehicles"], data["duration"])
+                GENERATION_STAGE_SECONDS.set(round(time.perf_counter() - stage_started, 3), "routes")
                 self.logger.info("경로 생성 성공")
                 yield {"progress": 90, "message": "경로 생성 완료"}
             except Exception as e:
@@ -313,4 +323,6 @@ class OSMGenerator:
 
         except Exception as e:
             self.logger.error(f"예상치 못한 오류 발생: {str(e)}")
-            yield {"progress": 0, "message": f"예상치 못한 오류가 발생했습니다: {str(e)}"}
\ No newline at end of file
+            yield {"progress": 0, "message": f"예상치 못한 오류가 발생했습니다: {str(e)}"}
+        finally:
+            close_context_log(self.log_context)
\ No newline at end of file
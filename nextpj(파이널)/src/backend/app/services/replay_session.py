@@ -0,0 +1,188 @@
+# src/backend/app/services/replay_session.py
+
+from fastapi import WebSocket
+from typing import Any, Dict, Optional, Tuple
+import os, asyncio, json, logging
+from starlette.websockets import WebSocketDisconnect
+from services.frame_broadcaster import FrameView
+from services.frame_encoder import create_frame_encoder
+from services.trajectory_store import TrajectoryStore
+from services.view_filter import FrameIndex, ViewFilter
+
+# 재생 속도 상한 (시뮬레이션 시간 / 실제 시간)
+REPLAY_MAX_SPEED = float(os.environ.get("REPLAY_MAX_SPEED", "32"))
+
+
+class ReplaySession:
+    """저장된 궤적을 WebSocket 하나로 재생하는 클래스 (SUMO 없이 디스크 읽기만 수행)
+
+    재생 중 받을 수 있는 메시지:
+        {"seek": 시각}       : 해당 시각으로 이동 (다음 프레임은 키프레임)
+        {"speed": 배속}      : 재생 속도 변경 (0 초과 REPLAY_MAX_SPEED 이하)
+        {"paused": true}     : 일시 정지/재개
+        {"type": "viewport", ...} : 실시간 세션과 같은 화면 영역/줌/차량 타입 필터
+
+    화면 영역과 겹치지 않는 블록은 읽지 않고 빈 프레임으로 대신합니다. 끝까지 재생하면
+    replay_complete 를 보내고 다음 seek 를 기다립니다.
+    """
+
+    def __init__(self, store: TrajectoryStore, websocket: WebSocket, options: Dict[str, Any]):
+        self.store = store
+        self.websocket = websocket
+        self.options = options
+        if options.get("protocol") == "reckoning":
+            # 저장된 궤적에는 가속도/경로가 없고, 재생은 이미 저장된 스텝만 보내므로 지원하지 않음
+            raise ValueError("재생에서는 reckoning 프로토콜을 사용할 수 없습니다")
+        self.view = FrameView(create_frame_encoder(options))
+        self.speed = 1.0
+        self.paused = False
+        self.seek_to: Optional[float] = store.start  # 다음에 재생을 시작할 시각 (재생 중 seek 요청)
+        # 재생 설정이 바뀔 때마다 증가 (재생 시계 기준점을 다시 잡음)
+        self.revision = 0
+        self.changed = asyncio.Event()
+        self.logger = logging.getLogger(__name__)
+
+        initial = {key: options[key] for key in ("speed", "paused") if key in options}
+        if "startTime" in options:
+            initial["seek"] = options["startTime"]
+        self.apply(initial)
+        if options.get("viewport"):
+            self._set_view(options["viewport"])
+
+    def _set_view(self, msg: Dict[str, Any]) -> None:
+        view_filter = ViewFilter.from_message(msg)
+        self.view.filter = None if view_filter.selects_all else view_filter
+        self.view.keyframe_requests += 1
+
+    def apply(self, msg: Dict[str, Any]) -> None:
+        """재생 제어 메시지 적용 (형식이 잘못되면 TypeError / ValueError)"""
+        if not isinstance(msg, dict):
+            raise TypeError("재생 제어 메시지는 JSON 객체여야 합니다")
+        if msg.get("type") == "viewport":
+            self._set_view(msg)
+        if "speed" in msg:
+            speed = float(msg["speed"])
+            if not 0 < speed <= REPLAY_MAX_SPEED:
+                raise ValueError(f"재생 속도는 0보다 크고 {REPLAY_MAX_SPEED:g} 이하여야 합니다")
+            self.speed = speed
+        if "paused" in msg:
+            self.paused = bool(msg["paused"])
+        if "seek" in msg:
+            self.seek_to = min(max(float(msg["seek"]), self.store.start), self.store.end)
+
+    async def _receive(self) -> None:
+        """[수신 태스크] 재생 제어 메시지를 받아 적용하고 재생 루프를 깨움"""
+        while True:
+            try:
+                msg = await self.websocket.receive_json()
+            except json.JSONDecodeError as e:
+                self.logger.error(f"잘못된 재생 제어 메시지 형식: {str(e)}")
+                continue
+            try:
+                self.apply(msg)
+            except (TypeError, ValueError) as e:
+                await self.websocket.send_text(json.dumps({"type": "error", "message": str(e)}))
+                continue
+            self.revision += 1
+            self.changed.set()
+
+    async def _wait_changed(self, timeout: Optional[float] = None) -> bool:
+        """설정 변경을 기다림 (timeout 안에 바뀌면 True)"""
+        self.changed.clear()
+        try:
+            await asyncio.wait_for(self.changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _visible(self, block: Dict[str, Any]) -> bool:
+        """블록 bbox 가 화면 영역과 겹치는지 여부 (겹치지 않으면 블록을 읽지 않음)"""
+        if block["bbox"] is None:
+            return False
+        view_filter = self.view.filter
+        if view_filter is None or view_filter.bbox is None:
+            return True
+        west, south, east, north = view_filter.bbox
+        block_west, block_south, block_east, block_north = block["bbox"]
+        return not (west > block_east or east < block_west or south > block_north or north < block_south)
+
+    def _encode(self, block_index: int, position: int, arrays: Optional[Dict[str, Any]]) -> Tuple[Any, bool]:
+        """[작업 스레드] 저장된 스텝 하나를 프레임으로 만들어 인코딩"""
+        frame = self.store.frame(block_index, position, arrays)
+        return self.view.encode(frame, FrameIndex(frame))
+
+    async def _send(self, message: Any) -> None:
+        if isinstance(message, bytes):
+            await self.websocket.send_bytes(message)
+        else:
+            await self.websocket.send_text(message)
+
+    async def _play(self, start: float) -> bool:
+        """start 시각부터 재생 (끝까지 재생하면 True, seek 로 중단되면 False)"""
+        self.view.keyframe_requests += 1
+        loop = asyncio.get_running_loop()
+        origin: Optional[Tuple[float, float, int]] = None  # (실제 시각, 시뮬레이션 시각, 설정 revision)
+        shown = False  # 일시 정지 중 seek 해도 이동한 시각의 프레임은 한 번 보여 줌
+
+        for block_index in range(self.store.locate(start), len(self.store.blocks)):
+            block = self.store.blocks[block_index]
+            arrays = None
+            if self._visible(block):
+                arrays = await asyncio.to_thread(self.store.load_block, block_index)
+
+            for position, sim_time in enumerate(block["times"]):
+                if sim_time < start:
+                    continue
+                # 재생 시계에 맞춰 대기 (속도/일시 정지 변경 시 현재 프레임을 기준으로 다시 계산)
+                while True:
+                    if self.seek_to is not None:
+                        return False
+                    if self.paused and shown:
+                        await self._wait_changed()
+                        origin = None
+                        continue
+                    if origin is None or origin[2] != self.revision:
+                        origin = (loop.time(), sim_time, self.revision)
+                    delay = origin[0] + (sim_time - origin[1]) / self.speed - loop.time()
+                    if delay <= 0 or not await self._wait_changed(delay):
+                        break
+
+                if arrays is None and self._visible(block):
+                    # 화면 영역이 바뀌어 이 블록이 필요해진 경우
+                    arrays = await asyncio.to_thread(self.store.load_block, block_index)
+                message, _ = await asyncio.to_thread(self._encode, block_index, position, arrays)
+                await self._send(message)
+                shown = True
+        return True
+
+    async def run(self) -> None:
+        """연결이 끊길 때까지 재생 (끝에 도달하면 seek 를 기다림)"""
+        await self.websocket.send_text(json.dumps({
+            "type": "replay_started",
+            **self.store.summary(),
+            "speed": self.speed,
+            "protocol": self.options.get("protocol", "json"),
+            "codec": self.options.get("codec", "json")
+        }))
+        receiver = asyncio.create_task(self._receive())
+        player = asyncio.create_task(self._player())
+        try:
+            done, _ = await asyncio.wait({receiver, player}, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        except WebSocketDisconnect:
+            self.logger.info("재생 WebSocket 연결이 종료되었습니다")
+        finally:
+            for task in (receiver, player):
+                task.cancel()
+            await asyncio.gather(receiver, player, return_exceptions=True)
+
+    async def _player(self) -> None:
+        while True:
+            start, self.seek_to = self.seek_to, None
+            if start is None:
+                await self._wait_changed()
+                continue
+            self.logger.info(f"재생 시작: {start:.0f}s (x{self.speed:g})")
+            if await self._play(start):
+                await self.websocket.send_text(json.dumps({"type": "replay_complete", "time": self.store.end}))
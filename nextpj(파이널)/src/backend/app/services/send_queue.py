@@ -0,0 +1,118 @@
+# src/backend/app/services/send_queue.py
+
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple, Union
+import os, asyncio, time
+
+# 구독자별로 쌓아 둘 수 있는 전달 보장 메시지(알림, 오류, 완료 등) 수 (넘으면 연결이 멈춘 것으로 보고 제거)
+SEND_QUEUE_MAX_EVENTS = int(os.environ.get("SEND_QUEUE_MAX_EVENTS", "256"))
+
+Message = Union[str, bytes]
+
+
+class SendQueueOverflow(Exception):
+    """전달 보장 메시지가 SEND_QUEUE_MAX_EVENTS 를 넘게 쌓인 경우"""
+
+
+class SendQueue:
+    """구독자 한 명의 송신 큐 (위치 프레임은 최신 것 하나만, 그 밖의 메시지는 모두 순서대로)
+
+    위치 프레임은 한 칸에만 보관해 아직 보내지 못한 프레임이 있으면 새 프레임으로 교체합니다
+    (버린 프레임 수를 기록). 새 프레임이 키프레임이 아니면 버린 프레임의 변경분 없이는 복원할 수
+    없으므로 둘 다 버리고 put_frame() 이 False 를 반환하며, 호출한 쪽은 다음 키프레임을 요청합니다.
+    알림/오류/완료 메시지는 버리지 않으며, 모든 메시지는 넣은 순서대로 보냅니다.
+
+    lag 는 프레임을 큐에 넣은 시각부터 전송이 끝난 시각까지의 시간입니다.
+    """
+
+    def __init__(self, max_events: int = SEND_QUEUE_MAX_EVENTS):
+        self.max_events = max_events
+        self.events: Deque[Tuple[int, Message]] = deque()  # (순번, 메시지)
+        self.frame: Optional[Tuple[int, Message, float]] = None  # (순번, 메시지, 큐에 넣은 시각)
+        self.sequence = 0
+        self.ready = asyncio.Event()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.events_sent = 0
+        self.last_lag = 0.0
+        self.mean_lag = 0.0
+        self.max_lag = 0.0
+
+    def put_event(self, message: Message) -> None:
+        """반드시 전달할 메시지 추가 (한도를 넘으면 SendQueueOverflow)"""
+        if len(self.events) >= self.max_events:
+            raise SendQueueOverflow(f"전송 대기 메시지가 {self.max_events}개를 넘었습니다")
+        self.sequence += 1
+        self.events.append((self.sequence, message))
+        self._wake()
+
+    def put_frame(self, message: Message, keyframe: bool) -> bool:
+        """위치 프레임 추가 (보내지 못한 이전 프레임은 버림). 이어지는 변경분이 끊겼으면 False"""
+        if self.frame is not None:
+            self.frames_dropped += 1
+            if not keyframe:
+                self.frame = None
+                self.frames_dropped += 1
+                return False
+        self.sequence += 1
+        self.frame = (self.sequence, message, time.perf_counter())
+        self._wake()
+        return True
+
+    def discard_frame(self) -> None:
+        """보내지 않은 프레임 버림 (뷰가 바뀌어 이전 뷰의 프레임이 의미 없어진 경우)"""
+        if self.frame is not None:
+            self.frame = None
+            self.frames_dropped += 1
+
+    def _wake(self) -> None:
+        self.idle.clear()
+        self.ready.set()
+
+    async def get(self) -> Tuple[Message, Optional[float]]:
+        """다음에 보낼 (메시지, 프레임을 큐에 넣은 시각) (프레임이 아니면 시각은 None)"""
+        while not self.events and self.frame is None:
+            self.idle.set()
+            self.ready.clear()
+            await self.ready.wait()
+        if self.frame is None or (self.events and self.events[0][0] < self.frame[0]):
+            return self.events.popleft()[1], None
+        _, message, queued_at = self.frame
+        self.frame = None
+        return message, queued_at
+
+    def sent(self, queued_at: Optional[float]) -> None:
+        """전송 완료 기록"""
+        if queued_at is None:
+            self.events_sent += 1
+            return
+        lag = time.perf_counter() - queued_at
+        self.frames_sent += 1
+        self.last_lag = lag
+        self.mean_lag += (lag - self.mean_lag) / self.frames_sent
+        self.max_lag = max(self.max_lag, lag)
+
+    def empty(self) -> bool:
+        return not self.events and self.frame is None
+
+    async def drain(self) -> None:
+        """큐에 남은 메시지를 모두 보낼 때까지 대기 (close() 하면 바로 끝남)"""
+        await self.idle.wait()
+
+    def close(self) -> None:
+        """남은 메시지를 버리고 drain() 대기를 끝냄 (구독자가 제거된 경우)"""
+        self.events.clear()
+        self.frame = None
+        self.idle.set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "framesSent": self.frames_sent,
+            "framesDropped": self.frames_dropped,
+            "pendingEvents": len(self.events),
+            "lastLagMs": round(self.last_lag * 1000, 3),
+            "meanLagMs": round(self.mean_lag * 1000, 3),
+            "maxLagMs": round(self.max_lag * 1000, 3),
+        }
@@ -0,0 +1,115 @@
+# src/backend/app/services/session_manager.py
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import os, logging, time, asyncio
+from services.simulation_runner import SimulationRunner
+from services.kpi_history import KpiHistory
+from services.metrics import metrics
+
+# 끝난 세션의 KPI 시계열을 조회할 수 있게 남겨 두는 시간 (초, 재연결한 클라이언트가 다시 받아 갈 수 있도록)
+KPI_HISTORY_GRACE_SECONDS = float(os.environ.get("KPI_HISTORY_GRACE_SECONDS", "600"))
+# 남겨 두는 끝난 세션 KPI 시계열의 최대 개수 (넘으면 가장 먼저 끝난 세션부터 제거)
+KPI_HISTORY_MAX_FINISHED = 32
+
+
+class SessionLimitExceeded(Exception):
+    """동시 실행 가능한 시뮬레이션 세션 수를 초과한 경우"""
+
+
+class SimulationSessionManager:
+    """WebSocket 연결별 시뮬레이션 세션(SUMO 프로세스 + 라벨 TraCI 연결)을 관리하는 클래스
+
+    세션마다 별도의 SimulationRunner가 SUMO 프로세스 풀에서 받은 전용 라벨
+    TraCI 연결을 가지므로, 여러 사용자가 독립적인 시뮬레이션을 병렬로 실행할
+    수 있습니다.
+    """
+
+    def __init__(self, max_sessions: int):
+        if max_sessions < 1:
+            raise ValueError("최대 세션 수는 1 이상이어야 합니다")
+        self.max_sessions = max_sessions
+        self.sessions: Dict[str, SimulationRunner] = {}
+        self.started_at: Dict[str, float] = {}
+        # 러너를 만드는 중인 세션 수 (생성 중에도 최대 세션 수에 포함)
+        self.creating = 0
+        # 끝난 세션 ID -> (종료 시각, KPI 시계열)
+        self.finished_kpis: "OrderedDict[str, Tuple[float, KpiHistory]]" = OrderedDict()
+        self.logger = logging.getLogger(__name__)
+
+    async def create_session(self, data_dir: str) -> SimulationRunner:
+        """새 세션을 만들고 러너를 반환 (최대 세션 수를 넘으면 SessionLimitExceeded)
+
+        러너 생성은 네트워크 인덱스 확인(해시 계산, 캐시가 없으면 생성)을 포함하므로 작업 스레드에서 수행합니다.
+        """
+        if len(self.sessions) + self.creating >= self.max_sessions:
+            raise SessionLimitExceeded(
+                f"동시 실행 가능한 시뮬레이션 수({self.max_sessions})를 초과했습니다. 잠시 후 다시 시도하세요."
+            )
+        self.creating += 1
+        try:
+            runner = await asyncio.to_thread(SimulationRunner, data_dir=data_dir)
+        finally:
+            self.creating -= 1
+        self.sessions[runner.session_id] = runner
+        self.started_at[runner.session_id] = time.time()
+        self.logger.info(f"시뮬레이션 세션 생성: {runner.session_id} ({len(self.sessions)}/{self.max_sessions})")
+        return runner
+
+    def get_session(self, session_id: str) -> Optional[SimulationRunner]:
+        """세션 ID로 실행 중인 러너 조회 (시청자 참가용)"""
+        return self.sessions.get(session_id)
+
+    def get_kpi_history(self, session_id: str) -> Optional[KpiHistory]:
+        """실행 중이거나 KPI_HISTORY_GRACE_SECONDS 안에 끝난 세션의 KPI 시계열"""
+        runner = self.sessions.get(session_id)
+        if runner is not None:
+            return runner.kpi_history
+        self._expire_kpi_histories()
+        finished = self.finished_kpis.get(session_id)
+        return finished[1] if finished is not None else None
+
+    def _expire_kpi_histories(self) -> None:
+        deadline = time.time() - KPI_HISTORY_GRACE_SECONDS
+        while self.finished_kpis and (
+            len(self.finished_kpis) > KPI_HISTORY_MAX_FINISHED
+            or next(iter(self.finished_kpis.values()))[0] < deadline
+        ):
+            self.finished_kpis.popitem(last=False)
+
+    async def close_session(self, session_id: str) -> None:
+        """세션을 정리하고 목록에서 제거 (KPI 시계열은 KPI_HISTORY_GRACE_SECONDS 동안 남겨 둠)"""
+        runner = self.sessions.pop(session_id, None)
+        self.started_at.pop(session_id, None)
+        if runner is not None:
+            await runner.cleanup()
+            runner.kpi_history.finish()
+            self.finished_kpis[session_id] = (time.time(), runner.kpi_history)
+            self._expire_kpi_histories()
+            self.logger.info(f"시뮬레이션 세션 종료: {session_id} ({len(self.sessions)}/{self.max_sessions})")
+
+    async def shutdown(self) -> None:
+        """서버 종료 시 남아 있는 모든 세션 정리"""
+        for session_id in list(self.sessions):
+            await self.close_session(session_id)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """활성 세션 목록"""
+        now = time.time()
+        return [
+            {
+                "sessionId": session_id,
+                "step": runner.simulation_step,
+                "running": runner.traci_started,
+                "uptimeSeconds": round(now - self.started_at[session_id], 1),
+                "viewers": runner.broadcaster.snapshot()["viewers"] if runner.broadcaster else 0,
+                # 구독자별 프레임 전송/버림 수와 전송 지연
+                "clients": runner.broadcaster.snapshot()["clients"] if runner.broadcaster else [],
+            }
+            for session_id, runner in self.sessions.items()
+        ]
+
+
+# 프로세스 전체에서 공유하는 세션 관리자 (MAX_SIMULATION_SESSIONS 환경 변수로 최대 세션 수 설정)
+session_manager = SimulationSessionManager(int(os.environ.get("MAX_SIMULATION_SESSIONS", "4")))
+metrics.gauge("sumo_active_sessions", "실행 중인 시뮬레이션 세션 수", function=lambda: len(session_manager.sessions))
@@ -1,14 +1,42 @@
 # src/app/backend/service/simulation_runner.py
 
-from pyproj import Transformer
 from fastapi import WebSocket
-from typing import Optional
-import os, sys, traceback, logging, glob, traci, json, asyncio, gzip
-import xml.etree.ElementTree as ET
+from typing import Any, Dict, Optional
+import os, traceback, glob, math, traci, json, asyncio, queue, threading, time, uuid, contextvars
 from starlette.websockets import WebSocketDisconnect
+from services.coordinate_converter import CoordinateConverter
+from services.network_index import load_network_index
+from services.edge_control import EdgeController, EdgeGroups, MOTORWAY_LINKS
+from services.frame_encoder import create_frame_encoder, reckoning_interval
+from services.frame_channel import FrameChannel
+from services.sumo_pool import sumo_pool, PooledSumo
+from services.sumo_backend import BACKENDS, DEFAULT_BACKEND
+from services.frame_broadcaster import FrameBroadcaster, ROLE_CONTROLLER, ROLE_VIEWER
+from services.view_filter import FrameIndex, type_table
+from services.traffic_kpis import compute_kpis
+from services.kpi_history import KpiHistory
+from services.whatif_fork import WhatIfFork, parse_fork_request
+from services.trajectory_store import TrajectoryWriter, trajectory_root
+from services.logging_setup import ThrottledLog, close_context_log, context_logger, log_context
+from services.metrics import (
+    STAGE_SECONDS, SESSION_FRAME_BYTES, SESSION_REALTIME_FACTOR, SESSION_VEHICLES, remove_session_metrics
+)
+
+# 작업 스레드와 이벤트 루프 사이에 대기할 수 있는 최대 프레임 수
+FRAME_QUEUE_SIZE = 4
+# 빠른 진행 시 한 번의 simulationStep(시각) 호출로 진행할 최대 시뮬레이션 시간 (초)
+FAST_FORWARD_CHUNK = 60.0
+# 빠른 진행 중 진행률 메시지 전송 간격 (실제 시간, 초)
+FAST_FORWARD_REPORT_INTERVAL = 0.5
+# 실행 중 차량 궤적을 재생용 저장소에 기록할지 기본값 (세션 설정의 "record" 값이 우선)
+# 보관 개수는 TRAJECTORY_MAX_RUNS 로 제한되어 오래된 실행부터 삭제됨
+TRAJECTORY_RECORDING = os.environ.get("TRAJECTORY_RECORDING", "true").lower() == "true"
 
 class SimulationRunner:
-    def __init__(self, data_dir: str):
+    def __init__(self, data_dir: str, session_id: Optional[str] = None):
+        # 세션 식별자 (세션별 출력 파일 이름에 사용)
+        self.session_id = session_id or uuid.uuid4().hex[:12]
+
         # 기본 디렉토리 및 설정 초기화
         self.data_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', data_dir))
         config_files = glob.glob(os.path.join(self.data_dir, "*.sumocfg"))
@@ -22,27 +50,11 @@ class SimulationRunner:
             "block_applied": False
         }
 
-        # 로깅 설정
-        log_file = os.path.join(self.data_dir, 'simulation_runner.log')
-        if os.path.exists(log_file):
-            os.remove(log_file)
-            
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
-        
-        # 좌표 변환기 설정
-        self.transformer = Transformer.from_crs(
-            "+proj=utm +zone=52 +ellps=WGS84 +datum=WGS84 +units=m +no_defs",
-            "EPSG:4326",
-            always_xy=True
-        )
+        # 로깅 설정 (프로세스 전체 설정은 서버 시작 시 한 번, 이 세션의 로그는 sessions/session-<ID>.log 에도 기록)
+        self.log_context = f"session-{self.session_id}"
+        self.logger = context_logger(__name__, self.log_context)
+        # 스텝 루프의 반복 로그는 LOG_THROTTLE_INTERVAL 간격으로만 기록
+        self.vehicle_count_log = ThrottledLog(self.logger)
         
         # 네트워크 파일에서 offset 값 로드
         net_file_path = os.path.join(self.data_dir, "osm.net.xml.gz")
@@ -50,63 +62,212 @@ class SimulationRunner:
             raise FileNotFoundError(f"필수 네트워크 파일을 찾을 수 없습니다: {net_file_path}")
             
         try:
-            with gzip.open(net_file_path, 'rb') as gz_file:
-                tree = ET.parse(gz_file)
-                root = tree.getroot()
-                location = root.find('location')
-                if location is None:
-                    raise ValueError("XML 파일에서 location 요소를 찾을 수 없습니다")
-                    
-                net_offset = location.get('netOffset')
-                if not net_offset:
-                    raise ValueError("location 요소에서 netOffset 속성을 찾을 수 없습니다")
-                    
-                offset_x, offset_y = map(float, net_offset.split(','))
-                self.center_x = -offset_x
-                self.center_y = -offset_y
-                
-                # 고속도로 진입로 정보 로드
-                for edge in root.findall('.//edge'):
-                    edge_type = edge.get('type')
-                    if edge_type == 'highway.motorway_link':
-                        self.motorway_links.append(edge.get('id'))
-                self.logger.info(f'고속도로 진입로 {len(self.motorway_links)}개를 찾았습니다')
-                
+            # 시나리오 생성 시 만들어 둔 네트워크 인덱스를 메모리 매핑으로 읽음 (없으면 이번에 생성)
+            self.network = load_network_index(net_file_path)
+
+            # 좌표 변환기 설정 (네트워크의 projParameter/netOffset 사용)
+            self.converter = CoordinateConverter.from_location(self.network.location)
+
+            # 고속도로 진입로 정보 로드
+            self.motorway_links = self.network.edges_of_type('highway.motorway_link')
+            self.logger.info(f'고속도로 진입로 {len(self.motorway_links)}개를 찾았습니다')
+
+            # 그룹 단위 도로 제어 (기본 그룹은 네트워크 인덱스에서 미리 계산, 제어 상태는 실행마다 새로 시작)
+            self.edge_groups = EdgeGroups(self.network, self.converter)
+            self.edge_control = EdgeController(self.edge_groups, self.carType)
+
         except Exception as e:
             self.logger.error(f"center 값 설정 중 오류가 발생했습니다: {str(e)}")
             self.logger.error(traceback.format_exc())
             raise
 
         self.traci_started = False
+        self.sumo: Optional[PooledSumo] = None  # 풀에서 받은 SUMO 프로세스
+        self.backend: Any = None  # 세션 전용 SUMO 백엔드 (traci 연결 또는 libsumo 작업 프로세스)
+        self.backend_kind = DEFAULT_BACKEND
         self.simulation_step = 0
+        self.duration = 0  # 요청된 시뮬레이션 스텝 수
+        self.fast_forward_to: Optional[float] = None  # 수집/전송 없이 진행할 목표 시각 (초)
+        self.steps_per_frame = 1  # 프레임 하나가 진행하는 스텝 수 (1보다 크면 실시간보다 빠르게)
+        # reckoning 프로토콜의 프레임 전송 간격 (실제 시간, 초). None 이면 매 프레임 전송
+        self.reckoning_interval: Optional[float] = None
         self.lock = asyncio.Lock()
+        # 이벤트 루프에서 받은 (제어 명령, 수신 시각) (작업 스레드가 스텝 사이에 적용)
+        self.pending_commands: queue.Queue = queue.Queue()
+        self.client_disconnected = False
+        # 프레임을 받는 WebSocket 구독자들 (실행 중에만 존재, 시청자가 참가할 수 있음)
+        self.broadcaster: Optional[FrameBroadcaster] = None
+        self.options: Dict[str, Any] = {}
+        # 프레임별 KPI 시계열 (재접속한 클라이언트가 REST 로 이력을 조회)
+        self.kpi_history = KpiHistory()
+        # 진행 중인 what-if 분기 비교 (세션당 하나)
+        self.fork: Optional[WhatIfFork] = None
+        self.fork_task: Optional[asyncio.Future] = None
+        self.cmd: list = []  # SUMO 실행 옵션 (분기 변형도 같은 옵션으로 실행)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # 재생용 궤적 기록기 (data/trajectories/<세션 ID>, 기록하지 않으면 None)
+        self.recorder: Optional[TrajectoryWriter] = None
+        # 제어 명령 수신부터 그 효과가 반영된 첫 프레임을 송신 큐에 넣기까지의 지연 (밀리초)
+        self.control_latency = {"count": 0, "lastMs": 0.0, "meanMs": 0.0, "maxMs": 0.0}
+
+    async def attach_viewer(self, websocket: WebSocket) -> bool:
+        """실행 중인 시뮬레이션에 시청자로 참가하고, 연결이 끝나거나 시뮬레이션이 끝날 때까지 대기"""
+        broadcaster = self.broadcaster
+        if broadcaster is None or broadcaster.closed:
+            await websocket.send_text(json.dumps({"type": "error", "message": "실행 중인 시뮬레이션이 아닙니다."}))
+            return False
+        await websocket.send_text(json.dumps({
+            "type": "session_joined",
+            "sessionId": self.session_id,
+            "role": ROLE_VIEWER,
+            "protocol": self.options.get("protocol", "json"),
+            "codec": self.options.get("codec", "json")
+        }))
+        subscriber = broadcaster.add(websocket, ROLE_VIEWER)
+        await subscriber.done.wait()
+        return True
+
+    def _on_all_clients_left(self, channel: FrameChannel) -> None:
+        self.client_disconnected = True
+        channel.close()
+
+    def record_control_latency(self, received_at: float) -> None:
+        """제어 명령이 반영된 프레임을 송신 큐에 넣은 시점에 지연 시간을 기록"""
+        latency_ms = (time.perf_counter() - received_at) * 1000
+        stats = self.control_latency
+        stats["count"] += 1
+        stats["lastMs"] = round(latency_ms, 3)
+        stats["meanMs"] = round(stats["meanMs"] + (latency_ms - stats["meanMs"]) / stats["count"], 3)
+        stats["maxMs"] = round(max(stats["maxMs"], latency_ms), 3)
+        self.control_status["latencyMs"] = stats["lastMs"]
+        self.logger.info(f"제어 명령 반영 지연: {latency_ms:.1f}ms")
+
+    def set_playback(self, msg: Dict[str, Any]) -> None:
+        """빠른 진행 목표 시각(fastForward/startTime)과 프레임당 스텝 수(stepsPerFrame) 설정"""
+        target = msg.get("fastForward", msg.get("startTime"))
+        if target is not None:
+            target = float(target)
+            if target < 0:
+                raise ValueError("빠른 진행 목표 시각은 0 이상이어야 합니다")
+            self.fast_forward_to = target
+        if "stepsPerFrame" in msg:
+            steps_per_frame = int(msg["stepsPerFrame"])
+            if steps_per_frame < 1:
+                raise ValueError("stepsPerFrame은 1 이상이어야 합니다")
+            self.steps_per_frame = steps_per_frame
+
+    @staticmethod
+    def motorway_command(block: bool) -> Dict[str, Any]:
+        """고속도로 진입로 차단/해제 edgeControl 메시지"""
+        return {"commands": [{"group": MOTORWAY_LINKS, "op": "close" if block else "open"}]}
 
-    async def handle_simulation_control(self, websocket: WebSocket) -> None:
-        """WebSocket을 통해 받은 제어 명령을 처리하는 함수"""
+    def fork_control_calls(self, commands: Dict[str, Any]) -> list:
+        """[작업 스레드] 분기 변형에 적용할 호출 목록 (분기 시점의 제어 상태에 변형의 명령을 바로 적용, 예약 시각은 무시)
+
+        변형이 정의한 그룹은 복사한 그룹 목록에만 등록되어 실행 중인 세션에는 남지 않습니다.
+        """
+        controller = self.edge_control.copy(self.edge_groups.copy())
+        if "blockMotorwayLinks" in commands:
+            controller.submit(self.motorway_command(bool(commands["blockMotorwayLinks"])), immediate=True)
+        if "edgeControl" in commands:
+            controller.submit(commands["edgeControl"], immediate=True)
+        return controller.state_calls()
+
+    def apply_edge_control(self, now: float) -> None:
+        """[작업 스레드] 도래한 도로 제어 호출을 스텝 사이에 call_many 로 적용 (스텝당 개수 제한)"""
+        calls = self.edge_control.take(now)
+        if not calls:
+            return
         try:
-            msg = await asyncio.wait_for(websocket.receive_json(), timeout=0.1)
-            self.logger.info(f"제어 메시지 수신: {msg}")
-            
+            self.backend.call_many(calls)
+            self.control_status["block_applied"] = True
+        except traci.exceptions.TraCIException as e:
+            self.logger.error(f"도로 제어 적용 실패: {str(e)}")
+            self.control_status["block_applied"] = False
+        self.control_status["edgeControl"] = self.edge_control.status()
+
+    def apply_control(self, msg: Dict[str, Any]) -> None:
+        """[작업 스레드] 제어 명령을 TraCI에 적용하는 함수"""
+        if 'fastForward' in msg or 'stepsPerFrame' in msg:
+            try:
+                self.set_playback(msg)
+            except (TypeError, ValueError) as e:
+                self.logger.error(f"재생 설정 변경 실패: {str(e)}")
+        if 'fork' in msg:
+            self.start_fork(msg['fork'])
+        try:
+            if 'edgeControl' in msg:
+                self.edge_control.submit(msg['edgeControl'])
             if 'blockMotorwayLinks' in msg:
                 new_block_state = bool(msg['blockMotorwayLinks'])
                 if new_block_state != self.block_motorway:
                     self.block_motorway = new_block_state
-                    try:
-                        for edge_id in self.motorway_links:
-                            if new_block_state:
-                                traci.edge.setDisallowed(edge_id, self.carType)
-                            else:
-                                traci.edge.setAllowed(edge_id, self.carType)
-                        self.control_status["block_applied"] = True
-                        self.logger.info(f"도로 차단 상태 변경 적용됨: {self.block_motorway}")
-                    except traci.exceptions.TraCIException as e:
-                        self.logger.error(f"도로 차단 상태 변경 실패: {str(e)}")
-                        self.control_status["block_applied"] = False
-                        
-        except asyncio.TimeoutError:
-            pass
-        except Exception as e:
-            self.logger.error(f"제어 메시지 처리 중 오류: {str(e)}")
+                    self.edge_control.submit(self.motorway_command(new_block_state))
+                    self.logger.info(f"도로 차단 상태 변경: {self.block_motorway}")
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"도로 제어 명령 실패: {str(e)}")
+            self.notify({"type": "error", "message": f"도로 제어 명령 실패: {str(e)}"})
+        self.control_status["edgeControl"] = self.edge_control.status()
+
+    def start_fork(self, request: Any) -> None:
+        """[작업 스레드] 현재 상태를 저장하고 변형들의 병렬 실행을 이벤트 루프에 예약"""
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("fork 요청은 객체여야 합니다")
+            if self.fork is not None:
+                raise ValueError("이미 분기 비교가 진행 중입니다")
+            variants, horizon = parse_fork_request(request)
+            # 변형별 호출 목록은 제어 상태를 가진 이 스레드에서 미리 만듦 (변형 스레드는 호출 목록만 사용)
+            for variant in variants:
+                try:
+                    variant["calls"] = self.fork_control_calls(variant["commands"])
+                except (TypeError, ValueError) as e:
+                    raise ValueError(f"{variant['name']}: {str(e)}")
+
+            delta_t = self.backend.delta_t()
+            fork_time = self.simulation_step * delta_t
+            end_time = self.duration * delta_t
+            if horizon is not None:
+                end_time = min(end_time, fork_time + horizon)
+            if end_time <= fork_time:
+                raise ValueError("분기 시점 이후 남은 시뮬레이션 시간이 없습니다")
+
+            state_dir = os.path.join(self.data_dir, "states")
+            os.makedirs(state_dir, exist_ok=True)
+            state_file = os.path.join(state_dir, f"fork_{self.session_id}_{self.simulation_step}.xml.gz")
+            self.backend.call("simulation", "saveState", state_file)
+        except (TypeError, ValueError, traci.exceptions.TraCIException) as e:
+            self.logger.error(f"분기 요청 실패: {str(e)}")
+            self.notify({"type": "error", "message": f"분기 요청 실패: {str(e)}"})
+            return
+
+        self.fork = WhatIfFork(self.cmd, self.backend_kind, state_file, fork_time, end_time, variants)
+        self.logger.info(f"분기 비교 시작: {fork_time:.0f}s -> {end_time:.0f}s, 변형 {len(variants)}개")
+        self.fork_task = asyncio.run_coroutine_threadsafe(self._run_fork(self.fork), self.loop)
+
+    async def _run_fork(self, fork: WhatIfFork) -> None:
+        await self.broadcast_message({
+            "type": "fork_started",
+            "forkTime": fork.fork_time,
+            "endTime": fork.end_time,
+            "variants": [variant["name"] for variant in fork.variants]
+        })
+        try:
+            result = await asyncio.to_thread(fork.run)
+        finally:
+            self.fork = None
+        await self.broadcast_message(result)
+
+    def notify(self, message: Dict[str, Any]) -> None:
+        """[작업 스레드] 모든 구독자에게 보낼 메시지를 이벤트 루프에 예약"""
+        if self.loop is not None:
+            asyncio.run_coroutine_threadsafe(self.broadcast_message(message), self.loop)
+
+    async def broadcast_message(self, message: Dict[str, Any]) -> None:
+        """프레임과 별개인 메시지를 모든 구독자에게 전송 (실행 중일 때만)"""
+        broadcaster = self.broadcaster
+        if broadcaster is not None and not broadcaster.closed:
+            broadcaster.broadcast([(None, json.dumps(message, ensure_ascii=False), False)])
 
     async def initialize_simulation(self, duration: int, websocket: Optional[WebSocket] = None) -> bool:
         """시뮬레이션 초기화 함수"""
@@ -130,13 +291,21 @@ class SimulationRunner:
                 "--default.carfollowmodel", "EIDM",
                 "--device.rerouting.probability", "1",
                 "--ignore-route-errors", "true",
-                "--fcd-output", os.path.join(self.data_dir, "fcd_output.xml")
+                # what-if 분기 상태 파일에 난수 상태까지 저장해 변형 간 차이가 제어 명령에서만 생기도록 함
+                "--save-state.rng", "true"
             ]
+            self.cmd = cmd
 
             if not self.traci_started:
-                traci.start(cmd)
+                # 풀의 대기 중인 SUMO에 시나리오를 로드 (블로킹 작업이므로 이벤트 루프 밖에서 수행)
+                started = time.perf_counter()
+                self.sumo = await asyncio.to_thread(sumo_pool.acquire, cmd, self.backend_kind)
+                self.backend = self.sumo.backend
                 self.traci_started = True
-                self.logger.info("TraCI 연결이 성공적으로 설정되었습니다")
+                self.logger.info(
+                    f"TraCI 연결이 성공적으로 설정되었습니다 "
+                    f"({(time.perf_counter() - started) * 1000:.0f}ms, {self.sumo.label}, {self.backend_kind})"
+                )
             
             return True
 
@@ -146,73 +315,109 @@ class SimulationRunner:
             if websocket:
                 await websocket.send_text(json.dumps({"type": "error", "message": str(e)}))
             return False
-        
-        
-    async def run_simulation(self, duration: int, websocket: Optional[WebSocket] = None) -> bool:
+
+    async def run_simulation(
+        self,
+        duration: int,
+        websocket: Optional[WebSocket] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> bool:
         """메인 시뮬레이션 실행 함수"""
         async with self.lock:
+            # 이 태스크에서 만든 태스크/스레드 작업(구독자, SUMO 풀 등)의 로그도 세션 로그에 포함
+            context_token = log_context.set(self.log_context)
             try:
+                self.options = options or {}
+                # 데이터만 필요한 세션은 libsumo 백엔드로 TCP 통신 비용 없이 실행 가능
+                self.backend_kind = self.options.get("backend", DEFAULT_BACKEND)
+                if self.backend_kind not in BACKENDS:
+                    raise ValueError(f"지원하지 않는 SUMO 백엔드입니다: {self.backend_kind}")
+                # 시작 시각으로 빠른 진행, 실시간보다 빠른 재생 설정
+                self.fast_forward_to = None
+                self.steps_per_frame = 1
+                # 추측 항법 프로토콜이면 초당 reckoningRate 번만 프레임을 만들어 전송
+                self.reckoning_interval = reckoning_interval(self.options)
+                if bool(self.options.get("record", TRAJECTORY_RECORDING)):
+                    self.recorder = TrajectoryWriter(
+                        os.path.join(trajectory_root(self.data_dir), self.session_id),
+                        meta={"sessionId": self.session_id, "duration": duration}
+                    )
+                self.set_playback({
+                    key: self.options[key] for key in ("startTime", "stepsPerFrame") if key in self.options
+                })
+                # 도로 제어 상태는 실행마다 새로 시작
+                self.block_motorway = False
+                self.control_status = {"block_applied": False}
+                self.edge_control = EdgeController(self.edge_groups, self.carType)
+
+                # 스텝 실행과 차량 수집/인코딩은 작업 스레드에서 수행하고,
+                # 이벤트 루프는 완성된 프레임 전송과 제어 메시지 수신만 담당
+                self.loop = asyncio.get_running_loop()
+                self.duration = duration
+                channel = FrameChannel(self.loop, FRAME_QUEUE_SIZE)
+                self.client_disconnected = False
+                # 클라이언트가 요청한 프로토콜에 맞는 프레임 인코더를 뷰마다 생성
+                self.broadcaster = FrameBroadcaster(
+                    encoder_factory=lambda: create_frame_encoder(self.options),
+                    on_command=lambda msg: self.pending_commands.put((msg, time.perf_counter())),
+                    on_empty=lambda: self._on_all_clients_left(channel)
+                )
+                if websocket:
+                    # 다른 클라이언트가 이 세션 ID로 시청자 참가 가능
+                    await websocket.send_text(json.dumps({
+                        "type": "session_created",
+                        "sessionId": self.session_id,
+                        "role": ROLE_CONTROLLER,
+                        # 기록하는 경우 종료 후 /ws/replay 에서 이 ID로 다시 볼 수 있음
+                        "runId": self.session_id if self.recorder is not None else None
+                    }))
+                    controller = self.broadcaster.add(websocket, ROLE_CONTROLLER)
+                    if self.options.get("viewport"):
+                        self.broadcaster.set_view(controller, self.options["viewport"])
+
+                # 설정에 담긴 초기 도로 제어 명령은 첫 스텝 전에 적용
+                initial_control = {
+                    key: self.options[key] for key in ("blockMotorwayLinks", "edgeControl") if key in self.options
+                }
+                if initial_control:
+                    self.apply_control(initial_control)
+
                 if not await self.initialize_simulation(duration, websocket):
                     return False
 
-                total_steps = duration
-                last_vehicle_count = 0
-    
-                while traci.simulation.getMinExpectedNumber() > 0:
-                    # 제어 메시지 처리
-                    if websocket:
-                        await self.handle_simulation_control(websocket)
-
-                    # 시뮬레이션 스텝 실행
-                    traci.simulationStep()
-                    
-                    # 차량 정보 수집 및 전송
-                    current_vehicles = traci.vehicle.getIDList()
-                    current_vehicle_count = len(current_vehicles)
-
-                    if current_vehicle_count != last_vehicle_count:
-                        self.logger.info(f"현재 차량 수: {current_vehicle_count}")
-                        last_vehicle_count = current_vehicle_count
-
-                    if websocket:
-                        vehicle_positions = []
-                        
-                        for vehicle_id in current_vehicles:
-                            try:
-                                x, y = traci.vehicle.getPosition(vehicle_id)
-                                speed = traci.vehicle.getSpeed(vehicle_id)
-                                adjusted_x = x + self.center_x
-                                adjusted_y = y + self.center_y
-                                longitude, latitude = self.transformer.transform(adjusted_x, adjusted_y)
-                                vehicle_positions.append({
-                                    "id": vehicle_id,
-                                    "position": {"lat": latitude, "lng": longitude},
-                                    "type": traci.vehicle.getTypeID(vehicle_id),
-                                    "angle": traci.vehicle.getAngle(vehicle_id),
-                                    "speed": speed * 3.6
-                                })
-                            except traci.exceptions.TraCIException as e:
-                                self.logger.error(f"차량 {vehicle_id} 처리 중 오류: {str(e)}")
-                                continue
-                        average_speed = (sum(v["speed"] for v in vehicle_positions) / 
-                                        len(vehicle_positions)) if vehicle_positions else 0
-                                    
-                        # 차량 위치와 제어 상태 전송
-                        await websocket.send_json({
-                            "type": "vehicle_positions",
-                            "data": vehicle_positions,
-                            "progress": ((self.simulation_step * 100) // total_steps),
-                            "vehicleCount": current_vehicle_count,
-                            "controlStatus": self.control_status,
-                            "averageSpeed" : round(average_speed, 2)
-                        })
+                # 작업 스레드의 모듈 로거 로그도 세션 로그에 남도록 현재 log_context 를 복사해 실행
+                worker = threading.Thread(
+                    target=contextvars.copy_context().run,
+                    args=(self._step_loop, duration, channel, websocket is not None),
+                    name="simulation-step-loop",
+                    daemon=True
+                )
+                worker.start()
 
-                    self.simulation_step += 1
-                    if self.simulation_step >= duration:
-                        break
+                try:
+                    while True:
+                        item = await channel.get()
+                        if item is None:
+                            break
+                        messages, applied_commands = item
 
-                if websocket:
-                    await websocket.send_text(json.dumps({"type": "simulation_complete"}))
+                        # 차량 위치와 제어 상태를 뷰마다 같은 바이트로 구독자별 송신 큐에 넣음 (전송을 기다리지 않음)
+                        self.broadcaster.broadcast(messages)
+
+                        for received_at in applied_commands:
+                            self.record_control_latency(received_at)
+                finally:
+                    channel.close()
+                    await asyncio.to_thread(worker.join)
+
+                if self.client_disconnected:
+                    raise WebSocketDisconnect()
+
+                # 진행 중인 분기 비교 결과를 받은 뒤 종료
+                if self.fork_task is not None:
+                    await asyncio.wrap_future(self.fork_task)
+
+                await self.broadcaster.close({"type": "simulation_complete"})
 
                 return True
 
@@ -222,26 +427,230 @@ class SimulationRunner:
             except Exception as e:
                 self.logger.error(f"시뮬레이션 실행 중 오류 발생: {str(e)}")
                 self.logger.error(traceback.format_exc())
-                if websocket:
-                    try:
-                        await websocket.send_text(json.dumps({
-                            "type": "error",
-                            "message": "시뮬레이션 중 오류가 발생했습니다."
-                        }))
-                    except Exception as send_error:
-                        self.logger.error(f"오류 메시지 전송 실패: {str(send_error)}")
+                if self.broadcaster is not None:
+                    await self.broadcaster.close({
+                        "type": "error",
+                        "message": "시뮬레이션 중 오류가 발생했습니다."
+                    })
                 return False
             finally:
+                if self.broadcaster is not None:
+                    await self.broadcaster.close()
+                    self.broadcaster = None
                 await self.cleanup()
+                await self.close_recorder()
+                remove_session_metrics(self.session_id)
+                log_context.reset(context_token)
+                close_context_log(self.log_context)
+
+    def _step_loop(self, duration: int, channel: FrameChannel, stream: bool) -> None:
+        """[작업 스레드] 시뮬레이션 스텝 실행, 차량 수집, 프레임 인코딩 루프"""
+        try:
+            total_steps = duration
+            last_vehicle_count = 0
+            reckoning = self.reckoning_interval is not None
+            # 풀에서 재사용하는 백엔드이므로 가속도/경로 수집 여부를 세션마다 설정
+            self.backend.set_dynamics(reckoning)
+            delta_t = self.backend.delta_t()
+            min_expected = self.backend.min_expected()
+            # 실시간 배율 측정 구간의 시작 (실제 시각, 시뮬레이션 시각)
+            rate_window = (time.perf_counter(), self.simulation_step * delta_t)
+            # 마지막으로 전송한 프레임의 (실제 시각, 시뮬레이션 시각)과 그 뒤 쌓인 이벤트 (reckoning)
+            last_frame = None
+            events = []
+            # 다음 전송 프레임에 반영된 것으로 기록할 제어 명령 수신 시각
+            applied_commands = []
+
+            while not channel.closed.is_set() and min_expected > 0:
+                # 대기 중인 제어 명령을 기다리지 않고 모두 적용
+                while True:
+                    try:
+                        msg, received_at = self.pending_commands.get_nowait()
+                    except queue.Empty:
+                        break
+                    self.apply_control(msg)
+                    applied_commands.append(received_at)
+                self.apply_edge_control(self.simulation_step * delta_t)
+
+                # 목표 시각까지 수집/전송 없이 진행
+                if self.fast_forward_to is not None:
+                    if not self._fast_forward(duration, delta_t, channel, stream):
+                        break
+                    if self.simulation_step >= duration or self.backend.min_expected() == 0:
+                        break
+
+                # 시뮬레이션 스텝 실행과 차량 수집 (여러 스텝이면 simulationStep(목표 시각) 한 번으로 진행)
+                steps = min(self.steps_per_frame, duration - self.simulation_step)
+                previous_time = self.simulation_step * delta_t
+                # 예약된 도로 제어 시각을 넘어 한 번에 진행하지 않음
+                next_control = self.edge_control.next_time()
+                if next_control is not None and next_control > previous_time:
+                    steps = max(1, min(steps, math.ceil((next_control - previous_time) / delta_t - 1e-9)))
+                target_time = (self.simulation_step + steps) * delta_t if steps > 1 else 0.0
+                started = time.perf_counter()
+                now, min_expected, columns = self.backend.advance(target_time)
+                advanced = time.perf_counter()
+                step_seconds, collect_seconds = self.backend.last_timing
+                STAGE_SECONDS.observe(step_seconds, "simulation_step")
+                STAGE_SECONDS.observe(collect_seconds, "collect")
+                if self.backend_kind == "libsumo":
+                    STAGE_SECONDS.observe(max(0.0, advanced - started - step_seconds - collect_seconds), "transfer")
+                current_vehicle_count = len(columns["ids"])
+                SESSION_VEHICLES.set(current_vehicle_count, self.session_id)
+
+                # 약 1초마다 실제 시간 대비 시뮬레이션 진행 속도 갱신
+                if advanced - rate_window[0] >= 1.0:
+                    SESSION_REALTIME_FACTOR.set(
+                        round((now - rate_window[1]) / (advanced - rate_window[0]), 2), self.session_id
+                    )
+                    rate_window = (advanced, now)
+
+                if current_vehicle_count != last_vehicle_count:
+                    self.vehicle_count_log.info(f"현재 차량 수: {current_vehicle_count}")
+                    last_vehicle_count = current_vehicle_count
+
+                # 네트워크/차량 타입별 지표는 열 배열 집계와 SUMO 의 도착/텔레포트 수로 계산
+                types = type_table(columns["types"])
+                kpis = compute_kpis(columns, now - previous_time, types)
+                speeds = columns["speed"] * 3.6
+                self.kpi_history.record(now, kpis, speeds, columns["waiting"])
+                measured = time.perf_counter()
+                STAGE_SECONDS.observe(measured - advanced, "kpis")
+
+                # reckoning 이면 전송 간격이 지났거나 마지막 스텝일 때만 프레임 생성
+                send_frame = stream and (
+                    not reckoning or last_frame is None
+                    or advanced - last_frame[0] >= self.reckoning_interval
+                    or self.simulation_step + steps >= duration or min_expected == 0
+                )
+                if reckoning:
+                    events.extend(["stop", vehicle_id, now] for vehicle_id in columns["stopStarting"])
+                    events.extend(["resume", vehicle_id, now] for vehicle_id in columns["stopEnding"])
+
+                if send_frame or self.recorder is not None:
+                    longitudes, latitudes = self.converter.to_lnglat(columns["x"], columns["y"])
+                    projected = time.perf_counter()
+                    STAGE_SECONDS.observe(projected - measured, "projection")
+                    measured = projected
+                if self.recorder is not None:
+                    self.recorder.append(
+                        now, columns["ids"], columns["types"], latitudes, longitudes, columns["angle"], speeds
+                    )
+                    STAGE_SECONDS.observe(time.perf_counter() - measured, "record")
+
+                if send_frame:
+                    frame = {
+                        "step": self.simulation_step,
+                        "ids": columns["ids"],
+                        "types": columns["types"],
+                        "lat": latitudes,
+                        "lng": longitudes,
+                        "angle": columns["angle"],
+                        "speed": speeds,
+                        "progress": ((self.simulation_step * 100) // total_steps),
+                        "vehicleCount": current_vehicle_count,
+                        "controlStatus": dict(self.control_status),
+                        "averageSpeed": kpis["meanSpeed"],
+                        "kpis": kpis
+                    }
+                    if reckoning:
+                        frame.update({
+                            "time": now,
+                            "rate": round((now - last_frame[1]) / (advanced - last_frame[0]), 3) if last_frame else 0,
+                            "accel": columns["accel"],
+                            "routes": columns["routes"],
+                            "events": events
+                        })
+                        last_frame = (advanced, now)
+                        events = []
+
+                    # 뷰(필터)마다 한 번씩 인코딩과 JSON 직렬화까지 작업 스레드에서 끝낸 뒤 이벤트 루프로 전달
+                    encoding = time.perf_counter()
+                    index = FrameIndex(frame, types)
+                    messages = [(view, *view.encode(frame, index)) for view in self.broadcaster.views()]
+                    STAGE_SECONDS.observe(time.perf_counter() - encoding, "encode")
+                    SESSION_FRAME_BYTES.set(sum(len(message) for _, message, _ in messages), self.session_id)
+                    if not channel.put((messages, applied_commands)):
+                        break
+                    applied_commands = []
+
+                self.simulation_step += steps
+                if self.simulation_step >= duration:
+                    break
+
+            self.kpi_history.finish()
+            channel.finish()
+        except Exception as e:
+            channel.finish(e)
+
+    def _fast_forward(self, duration: int, delta_t: float, channel: FrameChannel, stream: bool) -> bool:
+        """[작업 스레드] 차량 수집과 프레임 전송 없이 목표 시각까지 진행 (채널이 닫히면 False)
+
+        FAST_FORWARD_CHUNK 초 단위로 나눠 진행하며, 진행률은 FAST_FORWARD_REPORT_INTERVAL
+        간격으로만 전송합니다. 끝나면 그 사이 출발한 차량을 구독합니다.
+        """
+        target = min(self.fast_forward_to, duration * delta_t)
+        self.fast_forward_to = None
+        started = time.perf_counter()
+        last_report = started
+        now = self.simulation_step * delta_t
+        self.logger.info(f"빠른 진행 시작: {now:.0f}s -> {target:.0f}s")
+
+        min_expected = self.backend.min_expected()
+        while now < target and not channel.closed.is_set() and min_expected > 0:
+            # 예약된 도로 제어는 그 시각에 멈춰 적용
+            self.apply_edge_control(now)
+            chunk_end = min(target, now + FAST_FORWARD_CHUNK)
+            next_control = self.edge_control.next_time()
+            if next_control is not None and now < next_control < chunk_end:
+                chunk_end = next_control
+            now, min_expected, _ = self.backend.advance(chunk_end, collect=False)
+            if stream and time.perf_counter() - last_report >= FAST_FORWARD_REPORT_INTERVAL:
+                last_report = time.perf_counter()
+                if not channel.put(([self._fast_forward_message(now, target, duration, delta_t, False)], [])):
+                    return False
+
+        self.simulation_step = int(round(now / delta_t))
+        self.backend.resubscribe()
+        self.logger.info(f"빠른 진행 완료: {now:.0f}s ({time.perf_counter() - started:.2f}초 소요)")
+        if stream:
+            return channel.put(([self._fast_forward_message(now, target, duration, delta_t, True)], []))
+        return not channel.closed.is_set()
+
+    def _fast_forward_message(self, now: float, target: float, duration: int, delta_t: float, done: bool):
+        """모든 구독자에게 보내는 빠른 진행 상태 메시지 (뷰와 무관)"""
+        message = json.dumps({
+            "type": "fast_forward",
+            "time": now,
+            "target": target,
+            "done": done,
+            "progress": int(now / delta_t * 100 // duration)
+        })
+        return None, message, False
+
+    async def close_recorder(self) -> None:
+        """기록한 궤적의 남은 블록과 manifest 를 저장 (디스크 쓰기이므로 이벤트 루프 밖에서 수행)"""
+        recorder, self.recorder = self.recorder, None
+        if recorder is None:
+            return
+        try:
+            await asyncio.to_thread(recorder.close)
+        except Exception as e:
+            self.logger.error(f"궤적 저장 중 오류 발생: {str(e)}")
 
     async def cleanup(self):
         """시뮬레이션 종료 시 정리 작업을 수행하는 함수"""
+        if self.fork is not None:
+            # 남은 분기 변형은 다음 스텝에서 중단하고 프로세스를 풀에 반환
+            self.fork.cancelled.set()
         try:
             if self.traci_started:
-                self.logger.info("TraCI 연결을 종료합니다")
-                traci.close()
+                self.logger.info("SUMO 프로세스를 풀에 반환합니다")
+                await asyncio.to_thread(sumo_pool.release, self.sumo)
                 self.traci_started = False
+                self.sumo = None
+                self.backend = None
                 self.simulation_step = 0
-                self.logger.info("TraCI 연결이 안전하게 종료되었습니다")
+                self.logger.info("TraCI 연결이 안전하게 정리되었습니다")
         except Exception as e:
             self.logger.error(f"TraCI 종료 중 오류 발생: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,113 @@
+# src/backend/app/services/spatial_index.py
+"""
+네트워크 엣지 공간 인덱스
+
+네트워크 인덱스(network_index)에 저장된 차로 형상으로 shapely STRtree 를 만들어
+지도 클릭/그린 영역에서 SUMO 엣지 ID 를 찾습니다. 형상 배열은 시나리오 생성 시 네트워크
+인덱스와 함께 저장되고, 트리는 프로세스마다 처음 조회할 때 그 배열로 한 번에 만듭니다
+(네트워크 해시별로 공유). 좌표는 모두 네트워크 좌표(미터)에서 계산하므로 거리는 미터 단위입니다.
+
+    nearest(lng, lat)             : 가장 가까운 엣지/차로와 거리
+    edges_in_bbox(w, s, e, n)     : 경위도 영역과 겹치는 엣지
+    edges_in_polygon([[lng, lat]]) : 다각형과 겹치는 엣지
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import os, threading
+import numpy as np
+import shapely
+from services.coordinate_converter import CoordinateConverter
+from services.network_index import NetworkIndex, load_network_index
+
+# 네트워크 해시별 공간 인덱스 캐시 (세션과 REST 조회가 공유)
+_indexes: Dict[str, "EdgeSpatialIndex"] = {}
+# (네트워크 파일 경로, 크기, 수정 시각)별 공간 인덱스 (REST 조회마다 인덱스를 다시 열지 않음)
+_files: Dict[Tuple[str, int, int], "EdgeSpatialIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+class EdgeSpatialIndex:
+    """차로 형상 STRtree (결과는 엣지 인덱스 배열 위치)"""
+
+    def __init__(self, index: NetworkIndex, converter: CoordinateConverter):
+        self.index = index
+        self.converter = converter
+        offsets = np.asarray(index.lane_shape_offsets)
+        counts = np.diff(offsets)
+        # 점이 2개 미만인 차로는 형상이 없으므로 제외
+        valid = np.flatnonzero(counts >= 2)
+        lane_of_point = np.repeat(np.arange(len(counts)), counts)
+        keep = np.isin(lane_of_point, valid)
+        self.lanes = valid
+        self.lane_edges = np.repeat(np.arange(len(index.lane_counts)), index.lane_counts)[valid]
+        # 각 차로 형상을 한 번의 벡터 연산으로 LineString 배열로 만든 뒤 일괄 적재
+        self.geometries = shapely.linestrings(
+            np.asarray(index.lane_shapes)[keep],
+            indices=np.searchsorted(valid, lane_of_point[keep])
+        )
+        self.tree = shapely.STRtree(self.geometries)
+
+    def _unique_edges(self, lane_hits: np.ndarray) -> np.ndarray:
+        return np.unique(self.lane_edges[lane_hits])
+
+    def nearest(self, lng: float, lat: float, max_distance: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """가장 가까운 차로와 그 엣지 (max_distance 미터 안에 없으면 None)"""
+        x, y = self.converter.to_xy(lng, lat)
+        point = shapely.Point(float(x), float(y))
+        hits, distances = self.tree.query_nearest(point, max_distance=max_distance, return_distance=True)
+        if not len(hits):
+            return None
+        hit = int(hits[0])
+        position = int(self.lane_edges[hit])
+        lane = int(self.lanes[hit] - self.index.lane_offsets()[position])
+        edge_id = str(self.index.edge_ids[position])
+        return {
+            "edge": edge_id,
+            "lane": f"{edge_id}_{lane}",
+            "type": self.index.type_names[int(self.index.edge_types[position])],
+            "distance": round(float(distances[0]), 2),
+        }
+
+    def edges_in_bbox(self, west: float, south: float, east: float, north: float) -> np.ndarray:
+        """경위도 사각형과 겹치는 엣지 위치 배열 (네트워크 좌표에서는 네 꼭짓점의 다각형으로 검사)"""
+        return self.edges_in_polygon([[west, south], [east, south], [east, north], [west, north]])
+
+    def edges_in_polygon(self, polygon: Sequence[Sequence[float]]) -> np.ndarray:
+        """[경도, 위도] 다각형과 겹치는 엣지 위치 배열 (형식이 잘못되면 ValueError)"""
+        points = np.asarray(polygon, dtype=np.float64)
+        if points.ndim != 2 or points.shape[1] != 2 or len(points) < 3:
+            raise ValueError("polygon은 [경도, 위도] 좌표 3개 이상의 목록이어야 합니다")
+        x, y = self.converter.to_xy(points[:, 0], points[:, 1])
+        area = shapely.Polygon(np.column_stack((x, y)))
+        if not area.is_valid:
+            area = shapely.make_valid(area)
+        return self._unique_edges(self.tree.query(area, predicate="intersects"))
+
+    def describe(self, positions: np.ndarray, limit: int) -> Dict[str, Any]:
+        """REST 응답용 엣지 목록 (최대 limit 개)"""
+        edges: List[str] = self.index.edge_ids[positions[:limit]].tolist()
+        return {"count": len(positions), "edges": edges, "truncated": len(positions) > limit}
+
+
+def get_spatial_index(index: NetworkIndex, converter: CoordinateConverter) -> EdgeSpatialIndex:
+    """네트워크 해시에 해당하는 공간 인덱스를 캐시에서 가져오거나 생성 (블로킹)"""
+    spatial = _indexes.get(index.sha1)
+    if spatial is None:
+        with _indexes_lock:
+            spatial = _indexes.get(index.sha1)
+            if spatial is None:
+                spatial = EdgeSpatialIndex(index, converter)
+                _indexes[index.sha1] = spatial
+    return spatial
+
+
+def load_spatial_index(net_file_path: str) -> EdgeSpatialIndex:
+    """네트워크 파일의 공간 인덱스 (파일이 바뀌지 않았으면 캐시 사용, 블로킹)"""
+    stat = os.stat(net_file_path)
+    key = (os.path.abspath(net_file_path), stat.st_size, stat.st_mtime_ns)
+    spatial = _files.get(key)
+    if spatial is None:
+        index = load_network_index(net_file_path)
+        spatial = get_spatial_index(index, CoordinateConverter.from_location(index.location))
+        _files[key] = spatial
+    return spatial
@@ -0,0 +1,236 @@
+# src/backend/app/services/sumo_backend.py
+"""
+SUMO 백엔드
+
+SimulationRunner 와 SUMO 프로세스 풀은 아래 인터페이스만 사용합니다.
+    load(args), delta_t(), time(), min_expected(),
+    advance(target_time, collect) -> (시각, 남은 예상 차량 수, 차량 열 데이터 또는 None),
+    resubscribe(), set_dynamics(enabled), call(domain, method, *args), call_many(calls), close()
+    last_timing: 마지막 advance 의 (simulationStep 시간, 차량 수집 시간)
+
+- traci   (기본값): TraCI TCP 소켓으로 별도 sumo 프로세스와 통신 (DirectBackend + traci 연결)
+- libsumo : 전용 작업 프로세스 안에서 libsumo 로 SUMO 를 직접 실행 (LibsumoProcessBackend)
+            libsumo 는 프로세스당 하나의 시뮬레이션만 가질 수 있으므로 세션마다 작업 프로세스를
+            두고, 파이프로는 스텝 단위 요청(진행 + 수집)만 주고받습니다.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import os, logging, multiprocessing, threading, time
+import traci
+import traci.constants as tc
+from services.vehicle_collector import VehicleCollector
+
+BACKENDS = ("traci", "libsumo")
+# SUMO_BACKEND 환경 변수로 기본 백엔드 선택 (세션 설정의 "backend" 값이 우선)
+DEFAULT_BACKEND = os.environ.get("SUMO_BACKEND", "traci")
+
+# 스텝 응답에 함께 받는 시뮬레이션 변수 (시각, 남은 예상 차량 수, 이번 스텝 출발 차량, 도착/텔레포트 시작 차량 수,
+# 정류장 등 예정된 정차를 시작/종료한 차량)
+SIMULATION_VARIABLES = (
+    tc.VAR_TIME, tc.VAR_MIN_EXPECTED_VEHICLES, tc.VAR_DEPARTED_VEHICLES_IDS,
+    tc.VAR_ARRIVED_VEHICLES_NUMBER, tc.VAR_TELEPORT_STARTING_VEHICLES_NUMBER,
+    tc.VAR_STOP_STARTING_VEHICLES_IDS, tc.VAR_STOP_ENDING_VEHICLES_IDS
+)
+
+
+class DirectBackend:
+    """traci 연결 객체 또는 libsumo 모듈을 같은 프로세스에서 직접 호출하는 백엔드"""
+
+    def __init__(self, connection: Any, ignored_errors: Tuple[type, ...] = (traci.exceptions.TraCIException,)):
+        self.connection = connection
+        self.collector = VehicleCollector(connection, ignored_errors)
+        # 마지막 advance 의 (simulationStep 시간, 차량 수집 시간) (초)
+        self.last_timing: Tuple[float, float] = (0.0, 0.0)
+        self._subscribe_simulation()
+
+    def _subscribe_simulation(self) -> None:
+        # 시뮬레이션 변수를 구독해 두면 스텝마다 별도 요청 없이 응답에 포함됨 (load 후 다시 구독 필요)
+        self.connection.simulation.subscribe(SIMULATION_VARIABLES)
+
+    def load(self, args: List[str]) -> None:
+        self.connection.load(args)
+        self._subscribe_simulation()
+
+    def delta_t(self) -> float:
+        return self.connection.simulation.getDeltaT()
+
+    def time(self) -> float:
+        return self.connection.simulation.getTime()
+
+    def min_expected(self) -> int:
+        return self.connection.simulation.getMinExpectedNumber()
+
+    def advance(self, target_time: float = 0.0, collect: bool = True) -> Tuple[float, int, Optional[Dict[str, Any]]]:
+        """target_time 까지 진행 (0이면 한 스텝)하고 필요하면 차량 상태를 열 단위로 수집
+
+        수집한 열 데이터에는 이번 호출 동안 도착/텔레포트를 시작한 차량 수(arrived, teleports)와
+        마지막 스텝에 정차를 시작/종료한 차량 ID(stopStarting, stopEnding)도 담깁니다.
+        """
+        started = time.perf_counter()
+        self.connection.simulationStep(target_time)
+        results = self.connection.simulation.getSubscriptionResults()
+        stepped = time.perf_counter()
+        columns = None
+        if collect:
+            vehicles = self.collector.collect(results[tc.VAR_DEPARTED_VEHICLES_IDS])
+            columns = VehicleCollector.to_columns(vehicles, self.collector.dynamics)
+            columns["arrived"] = results[tc.VAR_ARRIVED_VEHICLES_NUMBER]
+            columns["teleports"] = results[tc.VAR_TELEPORT_STARTING_VEHICLES_NUMBER]
+            columns["stopStarting"] = list(results[tc.VAR_STOP_STARTING_VEHICLES_IDS])
+            columns["stopEnding"] = list(results[tc.VAR_STOP_ENDING_VEHICLES_IDS])
+        self.last_timing = (stepped - started, time.perf_counter() - stepped)
+        return results[tc.VAR_TIME], results[tc.VAR_MIN_EXPECTED_VEHICLES], columns
+
+    def advance_timed(self, target_time: float = 0.0, collect: bool = True):
+        """advance 결과와 단계별 소요 시간을 함께 반환 (작업 프로세스 백엔드용)"""
+        return self.advance(target_time, collect), self.last_timing
+
+    def resubscribe(self) -> None:
+        self.collector.resubscribe()
+
+    def set_dynamics(self, enabled: bool) -> None:
+        """차량 가속도/경로 ID 수집 여부 (풀에서 재사용되므로 세션마다 설정)"""
+        self.collector.set_dynamics(enabled)
+
+    def call(self, domain: str, method: str, *args) -> Any:
+        """임의의 TraCI 도메인 함수 호출 (예: call("edge", "setDisallowed", edge_id, classes))"""
+        return getattr(getattr(self.connection, domain), method)(*args)
+
+    def call_many(self, calls: Sequence[Tuple[str, str, tuple]]) -> List[Any]:
+        """여러 도메인 함수 호출을 차례로 실행 (traci 연결은 호출마다 TraCI 왕복이 한 번씩 발생, 묶어 보내지 않음)"""
+        return [self.call(domain, method, *args) for domain, method, args in calls]
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def _portable_error(error: BaseException, libsumo_error: type) -> BaseException:
+    """작업 프로세스의 예외를 부모 프로세스에서 그대로 잡을 수 있는 예외로 변환"""
+    if isinstance(error, libsumo_error):
+        return traci.exceptions.TraCIException(str(error))
+    if isinstance(error, (ValueError, TypeError, KeyError)):
+        return error
+    return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+def _libsumo_worker(pipe, cmd: List[str]) -> None:
+    """[작업 프로세스] libsumo 로 시뮬레이션을 실행하고 파이프 요청을 처리"""
+    import libsumo
+
+    try:
+        libsumo.start(cmd)
+        backend = DirectBackend(libsumo, (libsumo.TraCIException,))
+    except Exception as e:
+        pipe.send(("error", _portable_error(e, libsumo.TraCIException)))
+        return
+    pipe.send(("ok", None))
+
+    while True:
+        try:
+            method, args = pipe.recv()
+        except (EOFError, OSError):
+            break
+        if method == "close":
+            try:
+                libsumo.close()
+            finally:
+                pipe.send(("ok", None))
+            break
+        try:
+            pipe.send(("ok", getattr(backend, method)(*args)))
+        except Exception as e:
+            pipe.send(("error", _portable_error(e, libsumo.TraCIException)))
+
+
+class LibsumoProcessBackend:
+    """전용 작업 프로세스의 libsumo 에 파이프로 요청하는 백엔드
+
+    TCP 소켓의 명령별 직렬화/시스템 호출 대신 스텝마다 한 번의 파이프 왕복으로
+    진행과 차량 수집을 함께 처리합니다. 작업 프로세스가 죽으면 FatalTraCIError 를 발생시킵니다.
+    """
+
+    def __init__(self, cmd: List[str]):
+        context = multiprocessing.get_context("spawn")
+        self.pipe, child_pipe = context.Pipe()
+        self.process = context.Process(target=_libsumo_worker, args=(child_pipe, cmd), name="libsumo-worker", daemon=True)
+        self.process.start()
+        child_pipe.close()
+        self.lock = threading.Lock()
+        # 마지막 advance 의 (simulationStep 시간, 차량 수집 시간) (초, 작업 프로세스에서 측정)
+        self.last_timing: Tuple[float, float] = (0.0, 0.0)
+        self.logger = logging.getLogger(__name__)
+        try:
+            self._receive()
+        except Exception:
+            self.process.join(timeout=5)
+            raise
+
+    def _receive(self) -> Any:
+        try:
+            status, value = self.pipe.recv()
+        except (EOFError, OSError) as e:
+            raise traci.exceptions.FatalTraCIError(f"libsumo 작업 프로세스가 종료되었습니다: {str(e)}")
+        if status == "error":
+            raise value
+        return value
+
+    def _request(self, method: str, *args) -> Any:
+        with self.lock:
+            try:
+                self.pipe.send((method, args))
+            except (OSError, ValueError) as e:
+                raise traci.exceptions.FatalTraCIError(f"libsumo 작업 프로세스가 종료되었습니다: {str(e)}")
+            return self._receive()
+
+    def load(self, args: List[str]) -> None:
+        self._request("load", args)
+
+    def delta_t(self) -> float:
+        return self._request("delta_t")
+
+    def time(self) -> float:
+        return self._request("time")
+
+    def min_expected(self) -> int:
+        return self._request("min_expected")
+
+    def advance(self, target_time: float = 0.0, collect: bool = True) -> Tuple[float, int, Optional[Dict[str, Any]]]:
+        result, self.last_timing = self._request("advance_timed", target_time, collect)
+        return result
+
+    def resubscribe(self) -> None:
+        self._request("resubscribe")
+
+    def set_dynamics(self, enabled: bool) -> None:
+        self._request("set_dynamics", enabled)
+
+    def call(self, domain: str, method: str, *args) -> Any:
+        return self._request("call", domain, method, *args)
+
+    def call_many(self, calls: Sequence[Tuple[str, str, tuple]]) -> List[Any]:
+        """호출 목록을 파이프 요청 한 번으로 작업 프로세스에 보내 libsumo 로 실행 (왕복 한 번)"""
+        return self._request("call_many", list(calls))
+
+    def close(self) -> None:
+        try:
+            if self.process.is_alive():
+                self._request("close")
+        except Exception as e:
+            self.logger.error(f"libsumo 작업 프로세스 종료 요청 실패: {str(e)}")
+        finally:
+            self.pipe.close()
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.kill()
+
+
+def start_backend(kind: str, cmd: List[str], label: str, start_lock: threading.Lock):
+    """kind 백엔드로 SUMO 를 시작 (traci.start()는 스레드 안전하지 않으므로 start_lock 으로 직렬화)"""
+    if kind == "traci":
+        with start_lock:
+            traci.start(cmd, label=label, doSwitch=False)
+            connection = traci.getConnection(label)
+        return DirectBackend(connection)
+    if kind == "libsumo":
+        return LibsumoProcessBackend(cmd)
+    raise ValueError(f"지원하지 않는 SUMO 백엔드입니다: {kind}")
@@ -0,0 +1,144 @@
+# src/backend/app/services/sumo_pool.py
+
+from collections import deque
+from typing import Any, Deque, Dict, List
+import os, logging, threading, time, uuid
+from services.sumo_backend import BACKENDS, DEFAULT_BACKEND, start_backend
+
+# traci.start()는 스레드 안전하지 않으므로 직렬화
+_traci_start_lock = threading.Lock()
+
+
+class PooledSumo:
+    """풀에서 관리하는 SUMO 프로세스 하나 (traci 라벨 연결 또는 libsumo 작업 프로세스)"""
+
+    def __init__(self, label: str, kind: str, backend: Any):
+        self.label = label
+        self.kind = kind
+        self.backend = backend
+        self.uses = 0
+        self.created_at = time.time()
+        self.idle_since = time.time()
+
+
+class SumoProcessPool:
+    """이미 TraCI 연결까지 마친 유휴 SUMO 프로세스 풀
+
+    세션은 acquire()로 프로세스를 받아 load()로 새 .sumocfg 를 불러오고,
+    끝나면 release()로 프로세스를 풀에 돌려줍니다. 프로세스 실행과 TraCI 접속
+    비용이 사라져 첫 프레임까지의 시간이 네트워크 로딩 시간만 남습니다.
+
+    재활용 정책: max_uses 회 사용했거나 max_idle_seconds 이상 놀고 있던 프로세스는
+    종료하고, 유휴 프로세스는 백엔드 종류(traci/libsumo)별로 최대 size 개까지만 유지합니다.
+    """
+
+    def __init__(self, size: int, max_uses: int, max_idle_seconds: float):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_idle_seconds = max_idle_seconds
+        self.idle: Dict[str, Deque[PooledSumo]] = {kind: deque() for kind in BACKENDS}
+        self.lock = threading.Lock()
+        self.closed = False
+        self.logger = logging.getLogger(__name__)
+
+    def _launch(self, cmd: List[str], kind: str) -> PooledSumo:
+        """새 SUMO 프로세스를 실행하고 전용 라벨로 접속 (빈 포트 자동 할당)"""
+        label = f"sumo-{uuid.uuid4().hex[:12]}"
+        return PooledSumo(label, kind, start_backend(kind, cmd, label, _traci_start_lock))
+
+    def _discard(self, sumo: PooledSumo) -> None:
+        try:
+            sumo.backend.close()
+        except Exception as e:
+            self.logger.error(f"SUMO 프로세스 종료 중 오류: {str(e)}")
+
+    def prewarm(self, cmd: List[str], kind: str = DEFAULT_BACKEND) -> None:
+        """유휴 프로세스를 size 개까지 미리 실행 (블로킹, 작업 스레드에서 호출)"""
+        while not self.closed:
+            with self.lock:
+                if len(self.idle[kind]) >= self.size:
+                    return
+            try:
+                sumo = self._launch(cmd, kind)
+            except Exception as e:
+                self.logger.error(f"SUMO 프로세스 사전 실행 실패: {str(e)}")
+                return
+            with self.lock:
+                self.idle[kind].append(sumo)
+            self.logger.info(f"SUMO 프로세스 사전 실행 완료 ({kind}, {len(self.idle[kind])}/{self.size})")
+
+    def acquire(self, cmd: List[str], kind: str = DEFAULT_BACKEND) -> PooledSumo:
+        """유휴 프로세스에 cmd 시나리오를 load 하여 반환. 없으면 새로 실행 (블로킹)"""
+        if kind not in BACKENDS:
+            raise ValueError(f"지원하지 않는 SUMO 백엔드입니다: {kind}")
+        while True:
+            with self.lock:
+                idle = self.idle[kind]
+                sumo = idle.popleft() if idle else None
+            if sumo is None:
+                break
+            if time.time() - sumo.idle_since > self.max_idle_seconds:
+                self.logger.info(f"오래 유휴 상태였던 SUMO 프로세스 종료: {sumo.label}")
+                self._discard(sumo)
+                continue
+            try:
+                # 실행 파일 이름을 제외한 옵션으로 새 시나리오 로드
+                sumo.backend.load(cmd[1:])
+                sumo.uses += 1
+                self.logger.info(f"대기 중인 SUMO 프로세스 재사용: {sumo.label} ({sumo.uses}회째)")
+                return sumo
+            except Exception as e:
+                self.logger.warning(f"SUMO 프로세스 재사용 실패, 종료합니다: {str(e)}")
+                self._discard(sumo)
+
+        sumo = self._launch(cmd, kind)
+        sumo.uses = 1
+        self.logger.info(f"새 SUMO 프로세스 실행: {sumo.label} ({kind})")
+        return sumo
+
+    def release(self, sumo: PooledSumo, reusable: bool = True) -> None:
+        """사용이 끝난 프로세스를 풀에 반환하거나 재활용 정책에 따라 종료 (블로킹)"""
+        if reusable:
+            # 연결이 살아 있는지 확인
+            try:
+                sumo.backend.time()
+            except Exception:
+                reusable = False
+        with self.lock:
+            keep = (
+                reusable and not self.closed
+                and sumo.uses < self.max_uses
+                and len(self.idle[sumo.kind]) < self.size
+            )
+            if keep:
+                sumo.idle_since = time.time()
+                self.idle[sumo.kind].append(sumo)
+        if not keep:
+            self._discard(sumo)
+
+    def shutdown(self) -> None:
+        """모든 유휴 프로세스 종료"""
+        with self.lock:
+            self.closed = True
+            idle = [sumo for processes in self.idle.values() for sumo in processes]
+            for processes in self.idle.values():
+                processes.clear()
+        for sumo in idle:
+            self._discard(sumo)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "size": self.size,
+                "idle": {kind: len(processes) for kind, processes in self.idle.items()},
+                "maxUses": self.max_uses,
+                "maxIdleSeconds": self.max_idle_seconds,
+            }
+
+
+# 프로세스 전체에서 공유하는 SUMO 풀 (환경 변수로 크기와 재활용 정책 설정)
+sumo_pool = SumoProcessPool(
+    size=int(os.environ.get("SUMO_POOL_SIZE", "2")),
+    max_uses=int(os.environ.get("SUMO_POOL_MAX_USES", "20")),
+    max_idle_seconds=float(os.environ.get("SUMO_POOL_MAX_IDLE_SECONDS", "600")),
+)
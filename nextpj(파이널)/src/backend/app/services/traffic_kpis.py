@@ -0,0 +1,71 @@
+# src/backend/app/services/traffic_kpis.py
+"""
+교통 지표(KPI) 계산
+
+프레임마다 작은 kpis 객체를 붙여 전송합니다. 차량별 값은 이미 수집한 열 배열에서
+numpy 집계(평균, 합계, bincount)로만 계산하고, 도착/텔레포트 수는 시뮬레이션 변수
+구독(VAR_ARRIVED_VEHICLES_NUMBER, VAR_TELEPORT_STARTING_VEHICLES_NUMBER)으로 SUMO 에서
+바로 받습니다. 여러 스텝을 한 번에 진행하면 도착/텔레포트 수는 그 구간 전체의 합입니다.
+
+kpis:
+    running          : 네트워크 위 차량 수
+    meanSpeed        : 평균 속도 (km/h)
+    halting          : 정지 차량 수 (속도 HALTING_SPEED 미만, SUMO 의 halting 기준과 같음)
+    meanWaitingTime  : 차량당 평균 대기 시간 (초, SUMO 의 연속 정지 시간)
+    arrived          : 직전 프레임 이후 도착한 차량 수
+    throughput       : 직전 프레임 이후 구간의 시간당 도착 차량 수 (veh/h)
+    teleports        : 직전 프레임 이후 텔레포트를 시작한 차량 수
+    byType           : 기본 차량 타입별 {running, meanSpeed, halting, meanWaitingTime}
+"""
+
+from typing import Any, Dict, Tuple
+import numpy as np
+
+# SUMO 가 차량을 정지(halting)로 보는 속도 기준 (m/s)
+HALTING_SPEED = 0.1
+
+
+def _group_stats(count: int, speed_sum: float, halting: int, waiting_sum: float) -> Dict[str, Any]:
+    return {
+        "running": count,
+        "meanSpeed": round(speed_sum / count * 3.6, 2) if count else 0,
+        "halting": halting,
+        "meanWaitingTime": round(waiting_sum / count, 2) if count else 0,
+    }
+
+
+def compute_kpis(columns: Dict[str, Any], interval: float, types: Tuple[np.ndarray, np.ndarray]) -> Dict[str, Any]:
+    """[작업 스레드] 한 프레임의 KPI 계산
+
+    columns : advance()가 반환한 차량 열 데이터 (speed 는 m/s, waiting, arrived, teleports 포함)
+    interval: 직전 프레임 이후 진행한 시뮬레이션 시간 (초)
+    types   : FrameIndex.type_table() 결과 (고유 타입 배열, 차량별 타입 코드)
+    """
+    speed = columns["speed"]
+    waiting = columns["waiting"]
+    halting = speed < HALTING_SPEED
+    arrived = int(columns["arrived"])
+
+    kpis = _group_stats(len(speed), float(speed.sum()), int(halting.sum()), float(waiting.sum()))
+    kpis.update({
+        "arrived": arrived,
+        "throughput": round(arrived * 3600 / interval, 1) if interval > 0 else 0,
+        "teleports": int(columns["teleports"]),
+    })
+
+    # 타입별 집계는 타입 코드 bincount 로 한 번에 계산한 뒤 기본 타입(passenger_passenger -> passenger)으로 합침
+    names, codes = types
+    by_type: Dict[str, list] = {}
+    if len(names):
+        counts = np.bincount(codes, minlength=len(names))
+        speed_sums = np.bincount(codes, weights=speed, minlength=len(names))
+        halting_counts = np.bincount(codes, weights=halting, minlength=len(names))
+        waiting_sums = np.bincount(codes, weights=waiting, minlength=len(names))
+        for i, name in enumerate(names.tolist()):
+            totals = by_type.setdefault(name.split("_")[0], [0, 0.0, 0, 0.0])
+            totals[0] += int(counts[i])
+            totals[1] += float(speed_sums[i])
+            totals[2] += int(halting_counts[i])
+            totals[3] += float(waiting_sums[i])
+    kpis["byType"] = {name: _group_stats(*totals) for name, totals in by_type.items()}
+    return kpis
@@ -0,0 +1,352 @@
+# src/backend/app/services/trajectory_store.py
+"""
+시뮬레이션 궤적 저장소
+
+실행 중 수집한 차량 상태를 시간 블록 단위의 열 형식 .npz 파일로 저장하고,
+재생 시에는 필요한 블록만 디스크에서 읽습니다 (SUMO 실행 없음).
+
+저장 구조 (data/trajectories/<세션 ID>/):
+    manifest.json    : 시작/끝 시각, 블록 목록(파일, 시각 범위, 행 수, bbox, 스텝별 시각/차량 수/평균 속도)
+    vehicles.npz     : ids (차량 ID 문자열 표), types (차량 타입 문자열 표)
+    block_00000.npz  : offsets  int64  [스텝 수 + 1]  스텝별 행 구간
+                       vehicle  uint32 [행 수]        vehicles.npz ids 의 인덱스
+                       type     uint16 [행 수]        vehicles.npz types 의 인덱스
+                       lat, lng int32  [행 수]        마이크로도 (1e-6 도)
+                       angle    uint16 [행 수]        0.01 도
+                       speed    uint16 [행 수]        0.01 km/h
+
+manifest.json 은 모든 블록을 쓴 뒤 마지막에 기록하므로, 이 파일이 있는 실행만 재생 목록에 나타납니다.
+저장을 마칠 때마다 TRAJECTORY_MAX_RUNS 개를 넘는 오래된 실행부터 삭제합니다.
+기존 fcd-output XML 은 convert_fcd()로 같은 형식으로 변환할 수 있습니다 (POST /replays/import).
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+import os, json, shutil, logging, threading, time
+import xml.etree.ElementTree as ET
+import numpy as np
+
+# 블록 하나가 담는 시뮬레이션 시간 (초)
+TRAJECTORY_BLOCK_SECONDS = float(os.environ.get("TRAJECTORY_BLOCK_SECONDS", "60"))
+# 보관할 저장된 실행 수 (넘으면 오래된 실행부터 삭제, 0이면 제한 없음)
+TRAJECTORY_MAX_RUNS = int(os.environ.get("TRAJECTORY_MAX_RUNS", "20"))
+# 재생 시 메모리에 유지할 최근 블록 수
+BLOCK_CACHE_SIZE = 2
+
+MANIFEST_FILE = "manifest.json"
+VEHICLES_FILE = "vehicles.npz"
+STORE_VERSION = 1
+
+
+def trajectory_root(data_dir: str) -> str:
+    return os.path.join(data_dir, "trajectories")
+
+
+class TrajectoryWriter:
+    """스텝별 차량 열 데이터를 받아 시간 블록 단위로 저장하는 클래스
+
+    append()는 작업 스레드에서 호출되며 배열을 모으기만 하고, 블록 압축/쓰기는
+    전용 쓰기 스레드에서 수행하므로 스텝 루프가 디스크 I/O 를 기다리지 않습니다.
+    """
+
+    def __init__(self, directory: str, block_seconds: float = TRAJECTORY_BLOCK_SECONDS, meta: Optional[Dict[str, Any]] = None):
+        self.directory = directory
+        self.block_seconds = block_seconds
+        self.meta = meta or {}
+        self.vehicle_codes: Dict[str, int] = {}
+        self.type_codes: Dict[str, int] = {}
+        self.blocks: List[Dict[str, Any]] = []
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trajectory-writer")
+        self.writes: List[Future] = []
+        self.delta_t: Optional[float] = None
+        self.closed = False
+        self.logger = logging.getLogger(__name__)
+        self._reset_block()
+
+    def _reset_block(self) -> None:
+        self.block_start: Optional[float] = None
+        self.times: List[float] = []
+        self.counts: List[int] = []
+        self.average_speeds: List[float] = []
+        self.parts: List[tuple] = []
+
+    @staticmethod
+    def _codes(table: Dict[str, int], values: Sequence[str], dtype) -> np.ndarray:
+        return np.fromiter((table.setdefault(value, len(table)) for value in values), dtype=dtype, count=len(values))
+
+    def append(
+        self,
+        sim_time: float,
+        ids: Sequence[str],
+        types: Sequence[str],
+        lat: np.ndarray,
+        lng: np.ndarray,
+        angle: np.ndarray,
+        speed: np.ndarray
+    ) -> None:
+        """[작업 스레드] 한 스텝의 차량 상태 추가 (speed 는 km/h)"""
+        if self.times:
+            if self.delta_t is None:
+                self.delta_t = sim_time - self.times[-1]
+            if sim_time >= self.block_start + self.block_seconds:
+                self._flush()
+        if not self.times:
+            # 블록 경계를 block_seconds 배수에 맞춰 시각으로 블록을 바로 찾을 수 있게 함
+            self.block_start = (sim_time // self.block_seconds) * self.block_seconds
+
+        self.times.append(float(sim_time))
+        self.counts.append(len(ids))
+        self.average_speeds.append(round(float(np.mean(speed)), 2) if len(ids) else 0)
+        self.parts.append((
+            self._codes(self.vehicle_codes, ids, np.uint32),
+            self._codes(self.type_codes, types, np.uint16),
+            np.round(np.asarray(lat) * 1e6).astype(np.int32),
+            np.round(np.asarray(lng) * 1e6).astype(np.int32),
+            (np.round(np.asarray(angle) * 100).astype(np.int64) % 36000).astype(np.uint16),
+            np.clip(np.round(np.asarray(speed) * 100), 0, 65535).astype(np.uint16),
+        ))
+
+    def _flush(self) -> None:
+        """모은 스텝을 블록 하나로 묶어 쓰기 스레드에 넘김"""
+        if not self.times:
+            return
+        columns = [np.concatenate([part[i] for part in self.parts]) for i in range(6)]
+        arrays = dict(zip(("vehicle", "type", "lat", "lng", "angle", "speed"), columns))
+        arrays["offsets"] = np.concatenate(([0], np.cumsum(self.counts))).astype(np.int64)
+
+        lat, lng = arrays["lat"], arrays["lng"]
+        bbox = None
+        if len(lat):
+            bbox = [float(lng.min()) / 1e6, float(lat.min()) / 1e6, float(lng.max()) / 1e6, float(lat.max()) / 1e6]
+
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"block_{len(self.blocks):05d}.npz"
+        self.blocks.append({
+            "file": name,
+            "start": self.block_start,
+            "end": self.times[-1],
+            "times": self.times,
+            # 블록을 읽지 않고도 전체 네트워크 기준 메타 정보를 만들 수 있도록 함께 기록
+            "counts": self.counts,
+            "averageSpeeds": self.average_speeds,
+            "rows": int(arrays["offsets"][-1]),
+            "bbox": bbox,
+        })
+        self.writes.append(self.executor.submit(np.savez_compressed, os.path.join(self.directory, name), **arrays))
+        self._reset_block()
+
+    def close(self) -> Optional[str]:
+        """남은 블록과 ID 표, manifest 를 기록하고 저장소 경로 반환 (기록한 스텝이 없으면 None)"""
+        if self.closed:
+            return None
+        self.closed = True
+        try:
+            self._flush()
+            for write in self.writes:
+                write.result()
+        finally:
+            self.executor.shutdown(wait=True)
+        if not self.blocks:
+            return None
+
+        ids = np.array(list(self.vehicle_codes), dtype=str)
+        types = np.array(list(self.type_codes), dtype=str)
+        np.savez_compressed(os.path.join(self.directory, VEHICLES_FILE), ids=ids, types=types)
+
+        manifest = dict(self.meta)
+        manifest.update({
+            "version": STORE_VERSION,
+            "createdAt": time.time(),
+            "blockSeconds": self.block_seconds,
+            "deltaT": self.delta_t or 1.0,
+            "start": self.blocks[0]["times"][0],
+            "end": self.blocks[-1]["end"],
+            "steps": sum(len(block["times"]) for block in self.blocks),
+            "rows": sum(block["rows"] for block in self.blocks),
+            "vehicleCount": len(ids),
+            "blocks": self.blocks,
+        })
+        temp_path = os.path.join(self.directory, MANIFEST_FILE + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, separators=(",", ":"))
+        os.replace(temp_path, os.path.join(self.directory, MANIFEST_FILE))
+        self.logger.info(
+            f"궤적 저장 완료: {self.directory} ({manifest['steps']}스텝, {manifest['rows']}행, {len(self.blocks)}블록)"
+        )
+        prune_trajectories(os.path.dirname(self.directory))
+        return self.directory
+
+    def discard(self) -> None:
+        """기록을 중단 (manifest 를 쓰지 않으므로 재생 목록에 나타나지 않음)"""
+        self.closed = True
+        self.executor.shutdown(wait=True)
+
+
+class TrajectoryStore:
+    """저장된 궤적 하나를 읽는 클래스 (블록은 요청 시 읽어 최근 BLOCK_CACHE_SIZE 개만 유지)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        with np.load(os.path.join(directory, VEHICLES_FILE)) as vehicles:
+            self.ids = vehicles["ids"]
+            self.types = vehicles["types"]
+        self.blocks: List[Dict[str, Any]] = self.manifest["blocks"]
+        self.block_starts = [block["start"] for block in self.blocks]
+        self.start = self.manifest["start"]
+        self.end = self.manifest["end"]
+        self.delta_t = self.manifest["deltaT"]
+        self._cache: "OrderedDict[int, Dict[str, np.ndarray]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def locate(self, sim_time: float) -> int:
+        """sim_time 이 속한 블록 번호"""
+        return max(0, bisect_right(self.block_starts, sim_time) - 1)
+
+    def load_block(self, block_index: int) -> Dict[str, np.ndarray]:
+        """블록 배열 읽기 (블로킹, 이벤트 루프에서는 asyncio.to_thread 로 호출)"""
+        with self._cache_lock:
+            if block_index in self._cache:
+                self._cache.move_to_end(block_index)
+                return self._cache[block_index]
+        path = os.path.join(self.directory, self.blocks[block_index]["file"])
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        with self._cache_lock:
+            self._cache[block_index] = arrays
+            while len(self._cache) > BLOCK_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return arrays
+
+    def frame(self, block_index: int, position: int, arrays: Optional[Dict[str, np.ndarray]]) -> Dict[str, Any]:
+        """블록의 position 번째 스텝을 SimulationRunner 와 같은 형식의 프레임으로 변환
+
+        arrays 가 None 이면 (화면 영역과 겹치지 않아 읽지 않은 블록) 차량 없는 프레임을 만듭니다.
+        """
+        block = self.blocks[block_index]
+        sim_time = block["times"][position]
+        if arrays is None:
+            lo = hi = 0
+            arrays = {key: np.zeros(0, dtype=np.int64) for key in ("vehicle", "type", "lat", "lng", "angle", "speed")}
+        else:
+            lo, hi = int(arrays["offsets"][position]), int(arrays["offsets"][position + 1])
+
+        span = max(self.end - self.start, self.delta_t)
+        return {
+            "step": int(round(sim_time / self.delta_t)),
+            "time": sim_time,
+            "ids": self.ids[arrays["vehicle"][lo:hi]].tolist(),
+            "types": self.types[arrays["type"][lo:hi]].tolist(),
+            "lat": arrays["lat"][lo:hi] / 1e6,
+            "lng": arrays["lng"][lo:hi] / 1e6,
+            "angle": arrays["angle"][lo:hi] / 100.0,
+            "speed": arrays["speed"][lo:hi] / 100.0,
+            "progress": int((sim_time - self.start) * 100 // span),
+            "vehicleCount": block["counts"][position],
+            "controlStatus": {},
+            "averageSpeed": block["averageSpeeds"][position],
+            # 재생에서는 기록된 차량 수와 평균 속도만 제공
+            "kpis": {"running": block["counts"][position], "meanSpeed": block["averageSpeeds"][position]},
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        manifest = self.manifest
+        return {
+            "runId": os.path.basename(self.directory),
+            "createdAt": manifest["createdAt"],
+            "start": self.start,
+            "end": self.end,
+            "deltaT": self.delta_t,
+            "steps": manifest["steps"],
+            "vehicleCount": manifest["vehicleCount"],
+            "blocks": len(self.blocks),
+        }
+
+
+def open_trajectory(data_dir: str, run_id: str) -> TrajectoryStore:
+    """실행 ID로 저장소 열기 (없거나 잘못된 ID면 FileNotFoundError)"""
+    if not run_id or os.path.basename(run_id) != run_id or run_id.startswith("."):
+        raise FileNotFoundError(f"잘못된 실행 ID입니다: {run_id}")
+    directory = os.path.join(trajectory_root(data_dir), run_id)
+    if not os.path.exists(os.path.join(directory, MANIFEST_FILE)):
+        raise FileNotFoundError(f"저장된 궤적을 찾을 수 없습니다: {run_id}")
+    return TrajectoryStore(directory)
+
+
+def list_trajectories(data_dir: str) -> List[Dict[str, Any]]:
+    """재생 가능한 실행 목록 (최근 실행 먼저)"""
+    root = trajectory_root(data_dir)
+    if not os.path.isdir(root):
+        return []
+    runs = []
+    for run_id in os.listdir(root):
+        try:
+            runs.append(open_trajectory(data_dir, run_id).summary())
+        except (OSError, ValueError, KeyError) as e:
+            logging.getLogger(__name__).warning(f"궤적 목록 조회 중 건너뜀 ({run_id}): {str(e)}")
+    return sorted(runs, key=lambda run: run["createdAt"], reverse=True)
+
+
+def prune_trajectories(root: str, max_runs: int = TRAJECTORY_MAX_RUNS) -> List[str]:
+    """저장을 마친 실행이 max_runs 개를 넘으면 오래된 것부터 삭제하고 삭제한 실행 ID 반환
+
+    manifest 가 없는 디렉토리는 아직 기록 중인 실행일 수 있으므로 건드리지 않습니다.
+    """
+    if max_runs <= 0 or not os.path.isdir(root):
+        return []
+    runs = []
+    for run_id in os.listdir(root):
+        manifest_path = os.path.join(root, run_id, MANIFEST_FILE)
+        try:
+            runs.append((os.path.getmtime(manifest_path), run_id))
+        except OSError:
+            continue
+    runs.sort()
+    removed = [run_id for _, run_id in runs[:max(0, len(runs) - max_runs)]]
+    for run_id in removed:
+        shutil.rmtree(os.path.join(root, run_id), ignore_errors=True)
+    if removed:
+        logging.getLogger(__name__).info(f"보관 한도({max_runs}개)를 넘은 궤적 삭제: {', '.join(removed)}")
+    return removed
+
+
+def convert_fcd(fcd_path: str, directory: str, converter: Any, block_seconds: float = TRAJECTORY_BLOCK_SECONDS) -> Optional[str]:
+    """SUMO fcd-output XML 을 궤적 저장소로 변환 (iterparse 로 스텝 단위 스트리밍, 블로킹)
+
+    converter 는 네트워크 좌표(x, y)를 위경도로 바꾸는 CoordinateConverter 입니다.
+    변환에 실패하거나(잘린 XML 이면 ET.ParseError) 기록한 스텝이 없으면 만들던 디렉토리를 지웁니다.
+    """
+    writer = TrajectoryWriter(directory, block_seconds, {"source": os.path.basename(fcd_path)})
+    try:
+        root = None
+        for event, element in ET.iterparse(fcd_path, events=("start", "end")):
+            if root is None:
+                root = element
+            if event != "end" or element.tag != "timestep":
+                continue
+            vehicles = element.findall("vehicle")
+            x = np.array([float(vehicle.get("x")) for vehicle in vehicles])
+            y = np.array([float(vehicle.get("y")) for vehicle in vehicles])
+            lng, lat = converter.to_lnglat(x, y) if vehicles else (x, y)
+            writer.append(
+                float(element.get("time")),
+                [vehicle.get("id") for vehicle in vehicles],
+                [vehicle.get("type", "") for vehicle in vehicles],
+                lat,
+                lng,
+                np.array([float(vehicle.get("angle", 0)) for vehicle in vehicles]),
+                np.array([float(vehicle.get("speed", 0)) * 3.6 for vehicle in vehicles]),
+            )
+            # 처리한 스텝은 루트에서 떼어내 메모리 사용량을 일정하게 유지
+            root.clear()
+    except Exception:
+        writer.discard()
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+    path = writer.close()
+    if path is None:
+        shutil.rmtree(directory, ignore_errors=True)
+    return path
@@ -0,0 +1,98 @@
+# src/backend/app/services/vehicle_collector.py
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+import numpy as np
+import traci
+import traci.constants as tc
+
+# 차량마다 구독할 변수 목록 (위치, 속도, 타입, 방향각, 대기 시간)
+VEHICLE_VARIABLES = (tc.VAR_POSITION, tc.VAR_SPEED, tc.VAR_TYPE, tc.VAR_ANGLE, tc.VAR_WAITING_TIME)
+# 추측 항법(reckoning) 프로토콜 세션에서만 추가로 구독하는 변수 (가속도, 경로 ID)
+DYNAMICS_VARIABLES = (tc.VAR_ACCELERATION, tc.VAR_ROUTE_ID)
+
+
+class VehicleCollector:
+    """TraCI 구독(subscription)을 이용해 스텝별 차량 상태를 한 번에 수집하는 클래스
+
+    차량은 출발 시점에 한 번만 구독하고, 이후 매 스텝에서는
+    getAllSubscriptionResults() 한 번으로 모든 차량 값을 읽어옵니다.
+    도착한 차량의 구독은 SUMO가 자동으로 해제하며, 텔레포트 중인 차량은
+    getIDList()와 동일하게 결과에서 제외합니다.
+    """
+
+    def __init__(self, connection: Any = traci, ignored_errors: Tuple[type, ...] = (traci.exceptions.TraCIException,)):
+        # traci 모듈, traci.Connection 객체 또는 libsumo 모듈
+        self.connection = connection
+        # 구독 실패 시 무시할 예외 (libsumo 는 자체 TraCIException 을 발생시킴)
+        self.ignored_errors = ignored_errors
+        self.dynamics = False
+        self.variables = VEHICLE_VARIABLES
+
+    def set_dynamics(self, enabled: bool) -> None:
+        """가속도/경로 ID 구독 여부 변경 (이미 구독 중인 차량도 새 변수 목록으로 다시 구독)
+
+        load() 직후에는 구독 결과에 이전 시뮬레이션 차량이 남아 있을 수 있으므로 현재 차량만 다시 구독합니다.
+        """
+        if enabled == self.dynamics:
+            return
+        self.dynamics = enabled
+        self.variables = VEHICLE_VARIABLES + DYNAMICS_VARIABLES if enabled else VEHICLE_VARIABLES
+        subscribed = self.connection.vehicle.getAllSubscriptionResults()
+        for vehicle_id in self.connection.vehicle.getIDList():
+            if vehicle_id in subscribed:
+                self.connection.vehicle.subscribe(vehicle_id, self.variables)
+
+    def subscribe_existing(self) -> None:
+        """이미 네트워크에 있는 차량을 구독 (시뮬레이션 도중 수집기를 붙일 때 사용)"""
+        for vehicle_id in self.connection.vehicle.getIDList():
+            self.connection.vehicle.subscribe(vehicle_id, self.variables)
+
+    def resubscribe(self) -> None:
+        """구독되지 않은 현재 차량만 구독 (수집 없이 여러 스텝을 빠르게 진행한 뒤 사용)"""
+        subscribed = self.connection.vehicle.getAllSubscriptionResults()
+        for vehicle_id in self.connection.vehicle.getIDList():
+            if vehicle_id not in subscribed:
+                self.connection.vehicle.subscribe(vehicle_id, self.variables)
+
+    def collect(self, departed: Optional[Sequence[str]] = None) -> Dict[str, Dict[int, Any]]:
+        """simulationStep() 직후 호출하여 현재 차량들의 구독 결과를 반환
+
+        departed: 이번 스텝에 출발한 차량 ID (시뮬레이션 변수 구독으로 이미 받은 경우 전달)
+        """
+        if departed is None:
+            departed = self.connection.simulation.getDepartedIDList()
+        for vehicle_id in departed:
+            try:
+                self.connection.vehicle.subscribe(vehicle_id, self.variables)
+            except self.ignored_errors:
+                # 여러 스텝을 한 번에 진행한 경우 그 사이 출발 후 도착한 차량
+                pass
+        results = self.connection.vehicle.getAllSubscriptionResults()
+        # 텔레포트 중인 차량은 무효값(INVALID_DOUBLE_VALUE)을 반환하므로 제외
+        return {
+            vehicle_id: values for vehicle_id, values in results.items()
+            if values[tc.VAR_SPEED] != tc.INVALID_DOUBLE_VALUE
+        }
+
+    @staticmethod
+    def to_columns(results: Dict[str, Dict[int, Any]], dynamics: bool = False) -> Dict[str, Any]:
+        """구독 결과를 열(column) 단위 배열로 변환 (좌표 일괄 변환 및 인코딩용, dynamics 면 accel/routes 포함)"""
+        count = len(results)
+        values = results.values()
+        positions = np.fromiter(
+            (coord for v in values for coord in v[tc.VAR_POSITION]),
+            dtype=np.float64, count=count * 2
+        ).reshape(count, 2)
+        columns = {
+            "ids": list(results),
+            "x": positions[:, 0],
+            "y": positions[:, 1],
+            "speed": np.fromiter((v[tc.VAR_SPEED] for v in values), dtype=np.float64, count=count),
+            "angle": np.fromiter((v[tc.VAR_ANGLE] for v in values), dtype=np.float64, count=count),
+            "waiting": np.fromiter((v[tc.VAR_WAITING_TIME] for v in values), dtype=np.float64, count=count),
+            "types": [v[tc.VAR_TYPE] for v in values],
+        }
+        if dynamics:
+            columns["accel"] = np.fromiter((v[tc.VAR_ACCELERATION] for v in values), dtype=np.float64, count=count)
+            columns["routes"] = [v[tc.VAR_ROUTE_ID] for v in values]
+        return columns
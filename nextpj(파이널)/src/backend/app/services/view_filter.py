@@ -0,0 +1,178 @@
+# src/backend/app/services/view_filter.py
+
+from typing import Any, Dict, FrozenSet, Optional, Sequence, Tuple
+import os
+import numpy as np
+
+# 이 줌 레벨 미만에서는 개별 차량 대신 격자 집계(vehicle_density)를 전송 (클라이언트가 aggregateBelowZoom 으로 변경 가능)
+AGGREGATE_BELOW_ZOOM = float(os.environ.get("AGGREGATE_BELOW_ZOOM", "14"))
+
+
+def type_table(types: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(고유 타입 문자열 배열, 차량별 타입 코드 배열)"""
+    if len(types):
+        return np.unique(np.asarray(types), return_inverse=True)
+    return np.zeros(0, dtype=str), np.zeros(0, dtype=np.int64)
+
+
+class VehicleGrid:
+    """한 스텝의 차량 위경도에 대한 균일 격자 인덱스
+
+    차량을 cells x cells 격자 칸 번호로 정렬해 두고, 영역 질의 시 겹치는 격자 행마다
+    연속된 칸 구간을 이진 탐색으로 찾아 후보만 정확히 검사합니다.
+    """
+
+    def __init__(self, lat: np.ndarray, lng: np.ndarray, cells: int = 64):
+        self.lat = lat
+        self.lng = lng
+        self.cells = cells
+        self.count = len(lat)
+        if self.count == 0:
+            return
+
+        self.south, self.north = float(lat.min()), float(lat.max())
+        self.west, self.east = float(lng.min()), float(lng.max())
+        self.cell_lat = max(self.north - self.south, 1e-9) / cells
+        self.cell_lng = max(self.east - self.west, 1e-9) / cells
+
+        keys = self._rows(lat) * cells + self._cols(lng)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    def _rows(self, lat) -> np.ndarray:
+        return np.clip(((np.asarray(lat) - self.south) / self.cell_lat).astype(np.int64), 0, self.cells - 1)
+
+    def _cols(self, lng) -> np.ndarray:
+        return np.clip(((np.asarray(lng) - self.west) / self.cell_lng).astype(np.int64), 0, self.cells - 1)
+
+    def query(self, west: float, south: float, east: float, north: float) -> np.ndarray:
+        """영역 안의 차량 인덱스 (프레임 순서대로 정렬)"""
+        if self.count == 0 or west > self.east or east < self.west or south > self.north or north < self.south:
+            return np.zeros(0, dtype=np.int64)
+
+        row_start, row_end = self._rows([south, north])
+        col_start, col_end = self._cols([west, east])
+        row_keys = np.arange(row_start, row_end + 1) * self.cells
+        lo = np.searchsorted(self.sorted_keys, row_keys + col_start, side="left")
+        hi = np.searchsorted(self.sorted_keys, row_keys + col_end, side="right")
+        candidates = np.concatenate([self.order[a:b] for a, b in zip(lo.tolist(), hi.tolist())])
+
+        lat = self.lat[candidates]
+        lng = self.lng[candidates]
+        inside = (lat >= south) & (lat <= north) & (lng >= west) & (lng <= east)
+        return np.sort(candidates[inside])
+
+
+class FrameIndex:
+    """한 스텝 프레임에 대한 공간/타입 인덱스 (필터가 요청할 때 한 번만 생성해 뷰끼리 공유)
+
+    types 로 이미 계산한 type_table() 결과를 넘기면 다시 계산하지 않습니다.
+    """
+
+    def __init__(self, frame: Dict[str, Any], types: Optional[Tuple[np.ndarray, np.ndarray]] = None):
+        self.frame = frame
+        self._grid: Optional[VehicleGrid] = None
+        self._type_names, self._type_codes = types if types is not None else (None, None)
+
+    @property
+    def grid(self) -> VehicleGrid:
+        if self._grid is None:
+            self._grid = VehicleGrid(self.frame["lat"], self.frame["lng"])
+        return self._grid
+
+    def type_table(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(고유 타입 문자열 배열, 차량별 타입 코드 배열)"""
+        if self._type_codes is None:
+            self._type_names, self._type_codes = type_table(self.frame["types"])
+        return self._type_names, self._type_codes
+
+    def type_mask(self, vehicle_types: FrozenSet[str]) -> np.ndarray:
+        """기본 타입(예: passenger_passenger -> passenger)이 vehicle_types 에 속하는 차량 마스크"""
+        names, codes = self.type_table()
+        allowed = np.array([str(name).split("_")[0] in vehicle_types for name in names], dtype=bool)
+        return allowed[codes] if len(allowed) else np.zeros(0, dtype=bool)
+
+
+class ViewFilter:
+    """클라이언트 화면 영역(bbox), 줌, 표시할 차량 타입"""
+
+    def __init__(
+        self,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        zoom: Optional[float] = None,
+        vehicle_types: Optional[FrozenSet[str]] = None,
+        aggregate_below_zoom: Optional[float] = AGGREGATE_BELOW_ZOOM
+    ):
+        self.bbox = bbox  # (west, south, east, north)
+        self.zoom = zoom
+        self.vehicle_types = vehicle_types
+        self.aggregate_below_zoom = aggregate_below_zoom  # None 이면 집계하지 않음
+
+    @classmethod
+    def from_message(cls, msg: Dict[str, Any]) -> "ViewFilter":
+        """{"bbox": [west, south, east, north], "zoom": 15, "vehicleTypes": ["passenger", ...]} 형식 파싱"""
+        bbox = msg.get("bbox")
+        if bbox is not None:
+            if not isinstance(bbox, (list, tuple)) or len(bbox) != 4:
+                raise ValueError("bbox는 [west, south, east, north] 형식이어야 합니다")
+            west, south, east, north = (float(value) for value in bbox)
+            if west > east or south > north:
+                raise ValueError("bbox의 west/south 값은 east/north 값보다 클 수 없습니다")
+            bbox = (west, south, east, north)
+
+        zoom = msg.get("zoom")
+        if zoom is not None:
+            zoom = float(zoom)
+
+        vehicle_types = msg.get("vehicleTypes")
+        if vehicle_types is not None:
+            if not isinstance(vehicle_types, (list, tuple)):
+                raise ValueError("vehicleTypes는 차량 타입 문자열 목록이어야 합니다")
+            vehicle_types = frozenset(str(vehicle_type).split("_")[0] for vehicle_type in vehicle_types)
+
+        aggregate_below_zoom = msg.get("aggregateBelowZoom", AGGREGATE_BELOW_ZOOM)
+        if aggregate_below_zoom is not None:
+            aggregate_below_zoom = float(aggregate_below_zoom)
+
+        return cls(bbox, zoom, vehicle_types, aggregate_below_zoom)
+
+    @property
+    def aggregates(self) -> bool:
+        """현재 줌에서 개별 차량 대신 격자 집계를 보내야 하는지 여부"""
+        return self.zoom is not None and self.aggregate_below_zoom is not None and self.zoom < self.aggregate_below_zoom
+
+    @property
+    def selects_all(self) -> bool:
+        """모든 차량을 그대로 전송하는 필터인지 여부"""
+        return self.bbox is None and self.vehicle_types is None and not self.aggregates
+
+    def select(self, index: FrameIndex) -> Optional[np.ndarray]:
+        """필터에 맞는 차량 인덱스 (영역/타입 제한이 없으면 None)"""
+        indices = index.grid.query(*self.bbox) if self.bbox is not None else None
+        if self.vehicle_types is not None:
+            mask = index.type_mask(self.vehicle_types)
+            indices = np.flatnonzero(mask) if indices is None else indices[mask[indices]]
+        return indices
+
+    def apply(self, frame: Dict[str, Any], index: FrameIndex) -> Dict[str, Any]:
+        """필터에 맞는 차량만 담은 프레임 (메타 정보는 전체 네트워크 기준 그대로)"""
+        indices = self.select(index)
+        if indices is None:
+            return frame
+
+        ids = frame["ids"]
+        types = frame["types"]
+        selected = indices.tolist()
+        view_frame = dict(frame)
+        view_frame["ids"] = [ids[i] for i in selected]
+        view_frame["types"] = [types[i] for i in selected]
+        for key in ("lat", "lng", "angle", "speed"):
+            view_frame[key] = frame[key][indices]
+        # reckoning 프로토콜 프레임의 가속도/경로와 영역 안 차량의 이벤트
+        if "accel" in frame:
+            view_frame["accel"] = frame["accel"][indices]
+            view_frame["routes"] = [frame["routes"][i] for i in selected]
+        if frame.get("events"):
+            visible = set(view_frame["ids"])
+            view_frame["events"] = [event for event in frame["events"] if event[1] in visible]
+        return view_frame
@@ -0,0 +1,190 @@
+# src/backend/app/services/whatif_fork.py
+"""
+What-if 분기 비교
+
+실행 중인 시뮬레이션의 현재 상태를 simulation.saveState 로 저장한 뒤, 변형(variant)마다
+풀에서 SUMO 프로세스를 받아 --load-state 로 같은 시각부터 이어서 실행합니다.
+변형마다 다른 제어 명령을 적용하고 화면 전송 없이(headless) 끝까지 진행하여 KPI 를 비교합니다.
+변형은 각자의 SUMO 프로세스에서 병렬로 실행되므로 비교 비용은 남은 시뮬레이션 시간뿐입니다.
+
+분기 요청 (컨트롤러의 제어 메시지):
+    {"fork": {"variants": [{"name": "차단", "commands": {"blockMotorwayLinks": true}},
+                           {"name": "기존", "commands": {}}],
+              "horizon": 600}}
+    commands 가 없는 항목은 분기 시점의 제어 상태를 그대로 따릅니다.
+    horizon(초)을 주면 분기 시각부터 그 시간만큼만 비교합니다 (기본값: 시뮬레이션 끝까지).
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import os, logging, threading, time, contextvars
+import numpy as np
+from services.sumo_pool import sumo_pool
+from services.traffic_kpis import HALTING_SPEED
+
+# 한 번에 비교할 수 있는 최대 변형 수 (변형마다 SUMO 프로세스 하나, 코어 수에 맞춰 조정)
+FORK_MAX_VARIANTS = int(os.environ.get("FORK_MAX_VARIANTS", "8"))
+
+
+def parse_fork_request(msg: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Optional[float]]:
+    """분기 요청을 (변형 목록, horizon) 으로 검증 (형식이 잘못되면 ValueError)"""
+    variants = msg.get("variants")
+    if not isinstance(variants, list) or not variants:
+        raise ValueError("variants는 하나 이상의 변형 목록이어야 합니다")
+    if len(variants) > FORK_MAX_VARIANTS:
+        raise ValueError(f"변형은 최대 {FORK_MAX_VARIANTS}개까지 비교할 수 있습니다")
+
+    parsed = []
+    for i, variant in enumerate(variants):
+        if not isinstance(variant, dict):
+            raise ValueError("각 변형은 {\"name\": ..., \"commands\": {...}} 형식이어야 합니다")
+        commands = variant.get("commands") or {}
+        if not isinstance(commands, dict):
+            raise ValueError("commands는 제어 명령 객체여야 합니다")
+        parsed.append({"name": str(variant.get("name", f"variant-{i + 1}")), "commands": commands})
+
+    horizon = msg.get("horizon")
+    if horizon is not None:
+        horizon = float(horizon)
+        if horizon <= 0:
+            raise ValueError("horizon은 0보다 커야 합니다")
+    return parsed, horizon
+
+
+class KpiSummary:
+    """변형 하나의 스텝별 차량 열 데이터를 누적해 구간 전체 KPI 로 요약"""
+
+    def __init__(self):
+        self.vehicle_steps = 0
+        self.speed_sum = 0.0
+        self.halting_sum = 0
+        self.waiting_sum = 0.0
+        self.arrived = 0
+        self.teleports = 0
+        self.steps = 0
+
+    def add(self, columns: Dict[str, Any]) -> None:
+        speed = columns["speed"]
+        self.vehicle_steps += len(speed)
+        self.speed_sum += float(speed.sum())
+        self.halting_sum += int(np.count_nonzero(speed < HALTING_SPEED))
+        self.waiting_sum += float(columns["waiting"].sum())
+        self.arrived += int(columns["arrived"])
+        self.teleports += int(columns["teleports"])
+        self.steps += 1
+
+    def result(self, simulated: float) -> Dict[str, Any]:
+        per_vehicle = self.vehicle_steps or 1
+        return {
+            "meanSpeed": round(self.speed_sum / per_vehicle * 3.6, 2),
+            "meanRunning": round(self.vehicle_steps / (self.steps or 1), 1),
+            "meanHalting": round(self.halting_sum / (self.steps or 1), 1),
+            "meanWaitingTime": round(self.waiting_sum / per_vehicle, 2),
+            "arrived": self.arrived,
+            "throughput": round(self.arrived * 3600 / simulated, 1) if simulated > 0 else 0,
+            "teleports": self.teleports,
+        }
+
+
+def run_variant(
+    cmd: List[str],
+    kind: str,
+    state_file: str,
+    calls: Sequence[Tuple[str, str, tuple]],
+    end_time: float,
+    cancelled: threading.Event
+) -> Dict[str, Any]:
+    """[작업 스레드] 저장 상태에서 변형 하나를 끝까지 실행하고 KPI 요약 반환 (블로킹)"""
+    started = time.perf_counter()
+    sumo = sumo_pool.acquire(cmd + ["--load-state", state_file], kind)
+    reusable = False
+    try:
+        backend = sumo.backend
+        # 상태 파일로 불러온 차량은 출발 목록에 없으므로 직접 구독
+        backend.resubscribe()
+        if calls:
+            backend.call_many(list(calls))
+
+        start_time = now = backend.time()
+        summary = KpiSummary()
+        min_expected = backend.min_expected()
+        while now < end_time and min_expected > 0 and not cancelled.is_set():
+            now, min_expected, columns = backend.advance()
+            summary.add(columns)
+        reusable = True
+    finally:
+        sumo_pool.release(sumo, reusable)
+
+    result = summary.result(now - start_time)
+    result.update({
+        "simulated": round(now - start_time, 1),
+        "elapsedSeconds": round(time.perf_counter() - started, 2),
+        "cancelled": cancelled.is_set(),
+    })
+    return result
+
+
+class WhatIfFork:
+    """분기 시점 상태 파일 하나와 변형들의 병렬 실행"""
+
+    def __init__(
+        self,
+        cmd: List[str],
+        kind: str,
+        state_file: str,
+        fork_time: float,
+        end_time: float,
+        variants: List[Dict[str, Any]]
+    ):
+        self.cmd = cmd
+        self.kind = kind
+        self.state_file = state_file
+        self.fork_time = fork_time
+        self.end_time = end_time
+        # 변형마다 {"name", "commands", "calls"} (calls 는 분기 시점에 만든 TraCI 호출 목록)
+        self.variants = variants
+        self.cancelled = threading.Event()
+        self.logger = logging.getLogger(__name__)
+
+    def run(self) -> Dict[str, Any]:
+        """[작업 스레드] 변형마다 스레드 하나로 SUMO 프로세스를 구동해 병렬 실행 (블로킹)"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(self.variants)
+        started = time.perf_counter()
+
+        def worker(i: int, variant: Dict[str, Any]) -> None:
+            try:
+                results[i] = run_variant(
+                    self.cmd, self.kind, self.state_file, variant["calls"], self.end_time, self.cancelled
+                )
+            except Exception as e:
+                self.logger.error(f"분기 변형 실행 실패 ({variant['name']}): {str(e)}")
+                results[i] = {"error": str(e)}
+
+        # 변형 스레드마다 현재 컨텍스트(세션 log_context)를 복사해 실행
+        threads = [
+            threading.Thread(
+                target=contextvars.copy_context().run, args=(worker, i, variant), name=f"whatif-{i}", daemon=True
+            )
+            for i, variant in enumerate(self.variants)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            try:
+                os.remove(self.state_file)
+            except OSError:
+                pass
+
+        self.logger.info(f"분기 비교 완료: 변형 {len(self.variants)}개 ({time.perf_counter() - started:.1f}초 소요)")
+        return {
+            "type": "fork_result",
+            "forkTime": self.fork_time,
+            "endTime": self.end_time,
+            "elapsedSeconds": round(time.perf_counter() - started, 2),
+            "variants": [
+                {"name": variant["name"], "commands": variant["commands"], **(result or {})}
+                for variant, result in zip(self.variants, results)
+            ],
+        }
@@ -0,0 +1,113 @@
+# src/backend/benchmarks/bench_frame_encoding.py
+"""
+프레임 인코딩 방식별 인코딩 시간과 프레임 크기 비교 벤치마크
+
+- json   : 기존 vehicle_positions (JsonFrameEncoder + send_json 과 같은 json.dumps)
+- delta  : 키프레임 + 변경분 (DeltaFrameEncoder + json.dumps)
+- binary : 양자화 타입 배열 (BinaryFrameEncoder)
+
+SUMO 없이 합성 프레임으로 측정합니다. 매 스텝 일부 차량만 움직이고(moving-ratio),
+소수의 차량이 추가/제거됩니다. deflate 열은 permessage-deflate 적용 시의
+대략적인 전송 크기입니다 (메시지마다 독립 압축).
+
+사용 예:
+    python bench_frame_encoding.py --vehicles 1000 5000 20000 --frames 50
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+import numpy as np
+from services.frame_encoder import create_frame_encoder
+
+VEHICLE_TYPES = ["passenger_passenger", "truck_truck", "bus_bus", "motorcycle_motorcycle", "bicycle_bicycle"]
+
+
+def synthetic_frames(vehicles: int, frames: int, moving_ratio: float, seed: int = 42):
+    """초기 차량 집합에서 시작해 스텝마다 조금씩 움직이는 합성 프레임을 생성"""
+    rng = np.random.default_rng(seed)
+    ids = [f"{VEHICLE_TYPES[i % len(VEHICLE_TYPES)].split('_')[0]}{i}" for i in range(vehicles)]
+    types = [VEHICLE_TYPES[i % len(VEHICLE_TYPES)] for i in range(vehicles)]
+    lat = 37.5665 + rng.uniform(-0.03, 0.03, vehicles)
+    lng = 126.978 + rng.uniform(-0.03, 0.03, vehicles)
+    angle = rng.uniform(0, 360, vehicles)
+    speed = rng.uniform(0, 80, vehicles)
+    next_id = vehicles
+
+    for step in range(frames):
+        moving = rng.random(len(ids)) < moving_ratio
+        heading = np.radians(angle)
+        lat = lat + moving * np.cos(heading) * speed / 3.6 / 111319.5
+        lng = lng + moving * np.sin(heading) * speed / 3.6 / 88000.0
+        speed = np.where(moving, np.clip(speed + rng.normal(0, 2, len(ids)), 0, 120), speed)
+
+        # 약 0.5% 차량 교체
+        replaced = rng.random(len(ids)) < 0.005
+        for index in np.flatnonzero(replaced):
+            ids[index] = f"passenger{next_id}"
+            next_id += 1
+
+        yield {
+            "step": step,
+            "ids": list(ids),
+            "types": types,
+            "lat": lat,
+            "lng": lng,
+            "angle": angle,
+            "speed": speed,
+            "progress": step,
+            "vehicleCount": len(ids),
+            "controlStatus": {"block_applied": False},
+            "averageSpeed": round(float(speed.mean()), 2),
+            "kpis": {"running": len(ids), "meanSpeed": round(float(speed.mean()), 2)},
+        }
+
+
+def run_mode(mode: str, frames: list) -> dict:
+    """인코딩 + 직렬화 시간과 프레임 크기를 측정"""
+    options = {"codec": "binary"} if mode == "binary" else {"protocol": mode}
+    encoder = create_frame_encoder(options)
+    sizes, deflated, elapsed = [], [], 0.0
+
+    for frame in frames:
+        started = time.perf_counter()
+        message = encoder.encode(frame)
+        if not isinstance(message, bytes):
+            message = json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        elapsed += time.perf_counter() - started
+
+        sizes.append(len(message))
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        deflated.append(len(compressor.compress(message) + compressor.flush()))
+
+    return {
+        "encode_ms": elapsed * 1000 / len(frames),
+        "bytes": sum(sizes) / len(sizes),
+        "deflate_bytes": sum(deflated) / len(deflated),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--moving-ratio", type=float, default=0.6)
+    args = parser.parse_args()
+
+    print(f"{'vehicles':>9} {'mode':>7} {'encode_ms':>10} {'bytes':>10} {'deflate':>10}")
+    for vehicles in args.vehicles:
+        frames = list(synthetic_frames(vehicles, args.frames, args.moving_ratio))
+        for mode in ("json", "delta", "binary"):
+            result = run_mode(mode, frames)
+            print(f"{vehicles:>9} {mode:>7} {result['encode_ms']:>10.2f} "
+                  f"{result['bytes']:>10.0f} {result['deflate_bytes']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# src/backend/benchmarks/bench_simulation_runner.py
+"""
+SimulationRunner 전체 프레임 처리량 벤치마크 (스텝 진행 -> 수집 -> KPI -> 좌표 변환 -> 인코딩 -> 전송)
+
+실제 run_simulation() 을 가짜 WebSocket 하나로 실행하고, 구독자가 받은 프레임으로
+steps/s 와 프레임 크기를, /metrics 와 같은 단계별 히스토그램(sumo_stage_seconds)으로
+단계별 평균 시간을 보고합니다. 러너를 최적화한 뒤 같은 옵션으로 다시 실행해 비교합니다.
+
+- fake (기본값): SUMO 없이 fake_traci.FakeTraci 가 합성 차량 N대를 결정적으로 생성
+                 (격자 네트워크 파일도 직접 작성, 수집 모드는 traci 구독 경로)
+- sumo (--sumo) : netgenerate 격자 + randomTrips 시나리오를 실제 SUMO 로 실행
+                 (수집 모드: traci, libsumo 백엔드, SUMO_HOME 환경 변수 필요)
+
+인코딩 모드는 json / delta / binary / reckoning 이며, 궤적 기록은 --record 를 줄 때만 포함합니다.
+reckoning 은 프레임을 초당 몇 번(reckoningRate)만 보내므로 steps/s 를 세션 시작부터 완료까지의
+전체 시간으로 계산하며, 인코딩 간 대역폭은 KB/s(초당 전송량) 열로 비교합니다.
+단계별 시간에는 워밍업 프레임도 포함되며, fake 모드의 simulation_step 에는 가짜 TraCI 가
+구독 결과를 만드는 시간이 들어갑니다 (실제 traci 의 응답 해석에 해당).
+
+사용 예:
+    python bench_simulation_runner.py --vehicles 1000 10000 50000 --steps 100
+    python bench_simulation_runner.py --sumo --vehicles 1000 5000 --steps 100
+"""
+
+import argparse
+import asyncio
+import gzip
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+from fake_traci import FakeTraci, NET_OFFSET, PROJ_PARAMETER, write_grid_network
+from services.metrics import STAGE_SECONDS
+from services.simulation_runner import SimulationRunner
+from services.sumo_backend import DirectBackend
+from services.sumo_pool import PooledSumo, sumo_pool
+
+ENCODINGS = {
+    "json": {"protocol": "json"},
+    "delta": {"protocol": "delta"},
+    "binary": {"codec": "binary"},
+    "reckoning": {"protocol": "reckoning"},
+}
+STAGES = ("simulation_step", "collect", "transfer", "kpis", "projection", "record", "encode", "send")
+
+
+class BenchWebSocket:
+    """받은 메시지의 수신 시각과 크기만 기록하는 WebSocket (제어 메시지는 보내지 않음)"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def send_text(self, text: str) -> None:
+        self.messages.append((time.perf_counter(), len(text.encode("utf-8"))))
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.messages.append((time.perf_counter(), len(data)))
+
+    async def send_json(self, data) -> None:
+        await self.send_text(str(data))
+
+    async def receive_text(self) -> str:
+        await asyncio.Event().wait()
+
+    async def receive_json(self):
+        await asyncio.Event().wait()
+
+
+def fake_scenario(work_dir: str, grid_size: int, block_length: float) -> str:
+    """가짜 TraCI 용 데이터 디렉토리 (격자 네트워크와 빈 .sumocfg)"""
+    data_dir = os.path.join(work_dir, "fake")
+    if not os.path.isdir(data_dir):
+        os.makedirs(data_dir)
+        write_grid_network(os.path.join(data_dir, "osm.net.xml.gz"), grid_size, block_length)
+        with open(os.path.join(data_dir, "grid.sumocfg"), "w", encoding="utf-8") as f:
+            f.write("<configuration/>")
+    return data_dir
+
+
+def sumo_scenario(work_dir: str, vehicles: int, grid_size: int) -> str:
+    """netgenerate 격자 시나리오 데이터 디렉토리 (러너가 읽는 osm.net.xml.gz 에는 투영 정보를 추가)"""
+    from bench_vehicle_collection import build_scenario
+
+    data_dir = os.path.join(work_dir, f"sumo-{vehicles}")
+    os.makedirs(data_dir, exist_ok=True)
+    build_scenario(data_dir, vehicles, grid_size)
+    with open(os.path.join(data_dir, "grid.net.xml"), encoding="utf-8") as f:
+        network = f.read()
+    # netgenerate 네트워크에는 지리 좌표 정보가 없으므로 좌표 변환용으로만 서울 부근 UTM 투영을 기록
+    network = re.sub(r'netOffset="[^"]*"', f'netOffset="{NET_OFFSET[0]:.2f},{NET_OFFSET[1]:.2f}"', network, count=1)
+    network = re.sub(r'projParameter="[^"]*"', f'projParameter="{PROJ_PARAMETER}"', network, count=1)
+    with gzip.open(os.path.join(data_dir, "osm.net.xml.gz"), "wt", encoding="utf-8") as f:
+        f.write(network)
+    return data_dir
+
+
+def stage_means() -> dict:
+    """단계별 평균 시간 (밀리초, 관측이 없는 단계는 None)"""
+    with STAGE_SECONDS.lock:
+        series = {labels[0]: list(values) for labels, values in STAGE_SECONDS.series.items()}
+    means = {}
+    for stage in STAGES:
+        values = series.get(stage)
+        count = sum(values[:-1]) if values else 0
+        means[stage] = values[-1] * 1000 / count if count else None
+    return means
+
+
+async def run_case(data_dir: str, options: dict, steps: int, warmup: int, fake_backend=None) -> dict:
+    """run_simulation() 을 한 번 실행하고 워밍업 이후 프레임으로 처리량을 계산"""
+    if fake_backend is not None:
+        # 풀의 대기 중인 프로세스 자리에 가짜 연결을 넣어 acquire() 가 그대로 load() 하도록 함
+        sumo_pool.idle["traci"].append(PooledSumo("bench-fake", "traci", fake_backend))
+    with STAGE_SECONDS.lock:
+        STAGE_SECONDS.series.clear()
+
+    websocket = BenchWebSocket()
+    runner = SimulationRunner(data_dir=data_dir)
+    try:
+        if not await runner.run_simulation(steps + warmup, websocket, options):
+            raise RuntimeError("시뮬레이션 실행 실패")
+    finally:
+        if fake_backend is not None:
+            sumo_pool.idle["traci"].clear()
+
+    # 첫 메시지는 session_created, 마지막은 simulation_complete
+    frames = websocket.messages[1:-1]
+    if options.get("protocol") == "reckoning":
+        # 스텝마다 프레임을 보내지 않으므로 전체 실행 시간 기준
+        elapsed = websocket.messages[-1][0] - websocket.messages[0][0]
+        steps_done = steps + warmup
+    else:
+        frames = frames[warmup:]
+        elapsed = frames[-1][0] - frames[0][0] if len(frames) > 1 else 0.0
+        steps_done = len(frames) - 1
+    # 프레임이 끊긴 실행을 nan/0 으로 출력하면 결과 표에서 묻히므로 실패로 처리
+    if not frames or elapsed <= 0:
+        raise RuntimeError(
+            f"워밍업 이후 받은 프레임이 부족해 처리량을 계산할 수 없습니다 (프레임 {len(frames)}개, 옵션 {options})"
+        )
+    return {
+        "steps_per_second": steps_done / elapsed,
+        "frame_bytes": sum(size for _, size in frames) / len(frames),
+        "bytes_per_second": sum(size for _, size in frames) / elapsed,
+        "stages": stage_means(),
+    }
+
+
+def print_header(active_stages) -> None:
+    print(f"{'vehicles':>9} {'backend':>9} {'encoding':>9} {'steps/s':>8} {'frame_KB':>9} {'KB/s':>9} "
+          + " ".join(f"{stage[:10]:>10}" for stage in active_stages))
+
+
+def print_row(vehicles: int, collect: str, encoding: str, result: dict, active_stages) -> None:
+    stages = " ".join(
+        f"{result['stages'][stage]:>10.2f}" if result["stages"][stage] is not None else f"{'-':>10}"
+        for stage in active_stages
+    )
+    print(f"{vehicles:>9} {collect:>9} {encoding:>9} {result['steps_per_second']:>8.1f} "
+          f"{result['frame_bytes'] / 1024:>9.1f} {result['bytes_per_second'] / 1024:>9.1f} {stages}")
+
+
+async def run(args) -> None:
+    collects = args.backends if args.sumo else ["fake"]
+    active_stages = [
+        stage for stage in STAGES
+        if (stage != "transfer" or "libsumo" in collects) and (stage != "record" or args.record)
+    ]
+    print("단계별 열은 프레임당 평균 ms")
+    print_header(active_stages)
+
+    work_dir = tempfile.mkdtemp(prefix="bench-runner-")
+    try:
+        for vehicles in args.vehicles:
+            if args.sumo:
+                data_dir = sumo_scenario(work_dir, vehicles, args.grid_size)
+            else:
+                data_dir = fake_scenario(work_dir, args.grid_size, args.block_length)
+            for collect in collects:
+                for encoding in args.encodings:
+                    options = dict(ENCODINGS[encoding], record=args.record)
+                    fake_backend = None
+                    if args.sumo:
+                        options["backend"] = collect
+                    else:
+                        options["backend"] = "traci"
+                        fake_backend = DirectBackend(FakeTraci(
+                            vehicles, args.grid_size, args.block_length,
+                            moving_ratio=args.moving_ratio, churn=args.churn, seed=args.seed
+                        ))
+                    result = await run_case(data_dir, options, args.steps, args.warmup, fake_backend)
+                    print_row(vehicles, collect, encoding, result, active_stages)
+    finally:
+        sumo_pool.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--encodings", nargs="+", choices=list(ENCODINGS), default=list(ENCODINGS))
+    parser.add_argument("--record", action="store_true", help="궤적 기록(재생용 저장)까지 포함")
+    parser.add_argument("--grid-size", type=int, default=30)
+    parser.add_argument("--block-length", type=float, default=200.0, help="[fake] 격자 한 칸 길이 (m)")
+    parser.add_argument("--moving-ratio", type=float, default=0.8, help="[fake] 스텝마다 움직이는 차량 비율")
+    parser.add_argument("--churn", type=float, default=0.002, help="[fake] 스텝마다 도착 후 새로 출발하는 차량 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sumo", action="store_true", help="가짜 TraCI 대신 netgenerate 격자로 실제 SUMO 실행")
+    parser.add_argument("--backends", nargs="+", choices=["traci", "libsumo"], default=["traci", "libsumo"])
+    args = parser.parse_args()
+
+    if args.sumo and 'SUMO_HOME' not in os.environ:
+        raise EnvironmentError("SUMO_HOME 환경 변수가 설정되지 않았습니다.")
+    # 러너의 정보 로그가 결과 표와 섞이지 않도록 경고 이상만 출력
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
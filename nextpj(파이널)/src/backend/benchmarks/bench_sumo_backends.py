@@ -0,0 +1,88 @@
+# src/backend/benchmarks/bench_sumo_backends.py
+"""
+SUMO 백엔드별 스텝 처리량(steps/s) 비교 벤치마크
+
+- traci           : TraCI TCP 소켓으로 별도 sumo 프로세스와 통신 (기본 백엔드)
+- libsumo         : 전용 작업 프로세스의 libsumo 에 파이프로 스텝 단위 요청 (SUMO_BACKEND=libsumo)
+- libsumo-inproc  : 같은 프로세스에서 libsumo 직접 호출 (파이프 왕복 비용을 보기 위한 기준값)
+
+세 방식 모두 SimulationRunner 와 같은 advance() 로 한 스텝 진행 + 차량 구독 결과 수집을 하며,
+--headless 를 주면 수집 없이 진행만 측정합니다. bench_vehicle_collection.py 와 같은
+격자 시나리오를 사용합니다. SUMO_HOME 환경 변수가 필요합니다.
+
+사용 예:
+    python bench_sumo_backends.py --vehicles 1000 5000 --steps 200
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+import threading
+from bench_vehicle_collection import build_scenario
+from services.sumo_backend import DirectBackend, start_backend
+
+MODES = ("traci", "libsumo", "libsumo-inproc")
+
+
+def open_backend(mode: str, cmd: list):
+    if mode == "libsumo-inproc":
+        import libsumo
+        libsumo.start(cmd)
+        return DirectBackend(libsumo, (libsumo.TraCIException,))
+    return start_backend(mode, cmd, f"bench-{mode}", threading.Lock())
+
+
+def run_mode(config_file: str, mode: str, warmup: int, steps: int, collect: bool) -> dict:
+    """지정한 백엔드로 warmup 이후 steps 만큼 진행하여 처리량을 측정"""
+    backend = open_backend(mode, ["sumo", "-c", config_file, "--ignore-route-errors", "true"])
+    try:
+        for _ in range(warmup):
+            backend.advance(collect=collect)
+
+        vehicle_total = 0
+        started = time.perf_counter()
+        for _ in range(steps):
+            _, _, columns = backend.advance(collect=collect)
+            if columns is not None:
+                vehicle_total += len(columns["ids"])
+        elapsed = time.perf_counter() - started
+    finally:
+        backend.close()
+
+    return {
+        "steps_per_second": steps / elapsed,
+        "mean_vehicles": vehicle_total / steps,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--grid-size", type=int, default=30)
+    parser.add_argument("--headless", action="store_true", help="차량 수집 없이 스텝 진행만 측정")
+    args = parser.parse_args()
+
+    if 'SUMO_HOME' not in os.environ:
+        raise EnvironmentError("SUMO_HOME 환경 변수가 설정되지 않았습니다.")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        print(f"{'vehicles':>9} {'backend':>15} {'mean_veh':>9} {'steps/s':>9} {'vs traci':>9}")
+        for vehicles in args.vehicles:
+            config_file = build_scenario(work_dir, vehicles, args.grid_size)
+            baseline = None
+            for mode in MODES:
+                result = run_mode(config_file, mode, args.warmup, args.steps, not args.headless)
+                baseline = baseline or result["steps_per_second"]
+                print(f"{vehicles:>9} {mode:>15} {result['mean_vehicles']:>9.0f} "
+                      f"{result['steps_per_second']:>9.2f} {result['steps_per_second'] / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# src/backend/benchmarks/bench_vehicle_collection.py
+"""
+차량 상태 수집 방식별 스텝 처리량(steps/s) 비교 벤치마크
+
+- legacy: getIDList() 후 차량마다 getPosition/getSpeed/getTypeID/getAngle 호출
+- subscription: 출발 시 한 번 구독, 스텝마다 getAllSubscriptionResults() 한 번
+
+netgenerate 격자 네트워크와 randomTrips 로 만든 N대의 차량을 t=0 에 투입한 뒤
+같은 구간을 두 방식으로 각각 실행합니다. SUMO_HOME 환경 변수가 필요합니다.
+
+사용 예:
+    python bench_vehicle_collection.py --vehicles 1000 5000 20000 --steps 50
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+import traci
+from services.vehicle_collector import VehicleCollector
+
+
+def build_scenario(work_dir: str, vehicles: int, grid_size: int) -> str:
+    """격자 네트워크와 N대의 trip 파일을 만들고 .sumocfg 경로를 반환"""
+    sumo_home = os.environ['SUMO_HOME']
+    net_file = os.path.join(work_dir, "grid.net.xml")
+    trips_file = os.path.join(work_dir, f"grid.{vehicles}.trips.xml")
+    routes_file = os.path.join(work_dir, f"grid.{vehicles}.rou.xml")
+    config_file = os.path.join(work_dir, f"grid.{vehicles}.sumocfg")
+
+    if not os.path.exists(net_file):
+        subprocess.run([
+            os.path.join(sumo_home, 'bin', 'netgenerate'),
+            "--grid", "--grid.number", str(grid_size),
+            "--grid.length", "200", "--default.lanenumber", "2",
+            "--no-turnarounds", "true", "-o", net_file
+        ], check=True, capture_output=True)
+
+    # t=0 직후 1초 안에 N대가 모두 출발하도록 주기를 설정
+    subprocess.run([
+        sys.executable, os.path.join(sumo_home, 'tools', 'randomTrips.py'),
+        "-n", net_file, "-o", trips_file, "-r", routes_file,
+        "-b", "0", "-e", "1", "-p", str(1.0 / vehicles),
+        "--seed", "42", "--min-distance", "2000",
+        "--trip-attributes", 'departPos="random_free" departLane="best" departSpeed="max"'
+    ], check=True, capture_output=True)
+
+    with open(config_file, "w", encoding='utf-8') as f:
+        f.write(f"""<configuration>
+    <input>
+        <net-file value="{net_file}"/>
+        <route-files value="{trips_file}"/>
+    </input>
+    <report>
+        <no-step-log value="true"/>
+        <no-warnings value="true"/>
+    </report>
+</configuration>""")
+    return config_file
+
+
+def collect_legacy(conn) -> int:
+    """기존 run_simulation 과 동일한 차량별 개별 호출 방식"""
+    count = 0
+    for vehicle_id in conn.vehicle.getIDList():
+        try:
+            conn.vehicle.getPosition(vehicle_id)
+            conn.vehicle.getSpeed(vehicle_id)
+            conn.vehicle.getTypeID(vehicle_id)
+            conn.vehicle.getAngle(vehicle_id)
+            count += 1
+        except traci.exceptions.TraCIException:
+            continue
+    return count
+
+
+def run_mode(config_file: str, mode: str, warmup: int, steps: int) -> dict:
+    """지정한 수집 방식으로 warmup 이후 steps 만큼 실행하여 처리량을 측정"""
+    label = f"bench-{mode}"
+    traci.start(["sumo", "-c", config_file, "--ignore-route-errors", "true"], label=label)
+    conn = traci.getConnection(label)
+    try:
+        collector = VehicleCollector(conn)
+        for _ in range(warmup):
+            conn.simulationStep()
+            if mode == "subscription":
+                collector.collect()
+
+        vehicle_total = 0
+        started = time.perf_counter()
+        for _ in range(steps):
+            conn.simulationStep()
+            if mode == "subscription":
+                vehicle_total += len(collector.collect())
+            else:
+                vehicle_total += collect_legacy(conn)
+        elapsed = time.perf_counter() - started
+    finally:
+        conn.close()
+
+    return {
+        "steps_per_second": steps / elapsed,
+        "mean_vehicles": vehicle_total / steps,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--grid-size", type=int, default=30)
+    args = parser.parse_args()
+
+    if 'SUMO_HOME' not in os.environ:
+        raise EnvironmentError("SUMO_HOME 환경 변수가 설정되지 않았습니다.")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        print(f"{'vehicles':>9} {'mode':>13} {'mean_veh':>9} {'steps/s':>9}")
+        for vehicles in args.vehicles:
+            config_file = build_scenario(work_dir, vehicles, args.grid_size)
+            results = {}
+            for mode in ("legacy", "subscription"):
+                results[mode] = run_mode(config_file, mode, args.warmup, args.steps)
+                print(f"{vehicles:>9} {mode:>13} {results[mode]['mean_vehicles']:>9.0f} "
+                      f"{results[mode]['steps_per_second']:>9.2f}")
+            speedup = results["subscription"]["steps_per_second"] / results["legacy"]["steps_per_second"]
+            print(f"{vehicles:>9} {'speedup':>13} {'':>9} {speedup:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
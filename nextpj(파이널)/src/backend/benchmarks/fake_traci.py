@@ -0,0 +1,278 @@
+# src/backend/benchmarks/fake_traci.py
+"""
+SUMO 없이 SimulationRunner 를 실행하기 위한 결정적(deterministic) 가짜 TraCI 연결과 합성 네트워크
+
+FakeTraci 는 DirectBackend / VehicleCollector 가 사용하는 traci 연결의 일부만 흉내 냅니다.
+    simulationStep(목표 시각), load(args), close()
+    simulation: subscribe, getSubscriptionResults, getDeltaT, getTime, getMinExpectedNumber, getDepartedIDList
+    vehicle: subscribe (가속도/경로 ID 구독 포함), getAllSubscriptionResults, getIDList
+    그 밖의 도메인 함수(edge.setDisallowed 등)는 아무 일도 하지 않음
+
+차량 N대는 격자 도로 위를 가로/세로로 달리며(경계에서 반대편으로 이어짐), 스텝마다
+moving_ratio 비율만 움직이고 churn 비율은 도착 후 새 ID 로 다시 출발합니다. 같은 seed 면
+같은 값을 만들며, 구독 결과 dict 는 실제 traci 처럼 simulationStep 안에서 만들어지므로
+그 시간은 벤치마크의 simulation_step 단계에 포함됩니다.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+import gzip
+
+import numpy as np
+import traci
+import traci.constants as tc
+
+VEHICLE_TYPES = ("passenger", "truck", "bus", "motorcycle", "bicycle")
+# 서울 부근 UTM 52N 투영 (격자 좌표를 경위도로 변환할 수 있도록 location 에 기록)
+PROJ_PARAMETER = "+proj=utm +zone=52 +ellps=WGS84 +datum=WGS84 +units=m +no_defs"
+NET_OFFSET = (-322000.0, -4157000.0)
+
+
+def grid_extent(grid_size: int, block_length: float) -> float:
+    return (grid_size - 1) * block_length
+
+
+def location_attributes(extent: float) -> Dict[str, str]:
+    """격자 네트워크의 <location> 속성 (netOffset/projParameter 포함)"""
+    boundary = f"0.00,0.00,{extent:.2f},{extent:.2f}"
+    return {
+        "netOffset": f"{NET_OFFSET[0]:.2f},{NET_OFFSET[1]:.2f}",
+        "convBoundary": boundary,
+        "origBoundary": boundary,
+        "projParameter": PROJ_PARAMETER,
+    }
+
+
+def write_grid_network(path: str, grid_size: int, block_length: float, lanes: int = 2) -> None:
+    """가짜 TraCI 용 격자 네트워크 파일 (.net.xml.gz, 네트워크 인덱스가 읽는 요소만 포함)"""
+    extent = grid_extent(grid_size, block_length)
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<net version="1.20">']
+    attributes = " ".join(f'{key}="{value}"' for key, value in location_attributes(extent).items())
+    lines.append(f"    <location {attributes}/>")
+    for row in range(grid_size):
+        for col in range(grid_size):
+            x, y = col * block_length, row * block_length
+            # 오른쪽, 위쪽 이웃으로 가는 양방향 엣지
+            for name, (dx, dy) in (("h", (block_length, 0.0)), ("v", (0.0, block_length))):
+                if x + dx > extent or y + dy > extent:
+                    continue
+                for suffix, start, end in (("f", (x, y), (x + dx, y + dy)), ("b", (x + dx, y + dy), (x, y))):
+                    edge_id = f"{name}{row}_{col}{suffix}"
+                    lines.append(f'    <edge id="{edge_id}" type="highway.primary">')
+                    for lane in range(lanes):
+                        shape = f"{start[0]:.2f},{start[1]:.2f} {end[0]:.2f},{end[1]:.2f}"
+                        lines.append(
+                            f'        <lane id="{edge_id}_{lane}" index="{lane}" speed="13.89" '
+                            f'length="{block_length:.2f}" shape="{shape}"/>'
+                        )
+                    lines.append("    </edge>")
+    lines.append("</net>")
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+class SyntheticPopulation:
+    """격자 도로 위를 움직이는 N대의 합성 차량 상태 (열 배열)"""
+
+    def __init__(self, vehicles: int, extent: float, block_length: float, moving_ratio: float,
+                 churn: float, max_speed: float, seed: int):
+        self.count = vehicles
+        self.extent = extent
+        self.block_length = block_length
+        self.moving_ratio = moving_ratio
+        self.churn = churn
+        self.max_speed = max_speed
+        self.rng = np.random.default_rng(seed)
+        self.next_id = 0
+        self.types = [VEHICLE_TYPES[i % len(VEHICLE_TYPES)] for i in range(vehicles)]
+        self.ids = [self._new_id(slot) for slot in range(vehicles)]
+
+        roads = int(round(extent / block_length)) + 1
+        # 가로 도로(angle 90/270) 또는 세로 도로(angle 0/180) 위의 임의 위치
+        horizontal = self.rng.random(vehicles) < 0.5
+        forward = self.rng.random(vehicles) < 0.5
+        along = self.rng.uniform(0.0, extent, vehicles)
+        across = self.rng.integers(0, roads, vehicles) * block_length
+        self.x = np.where(horizontal, along, across)
+        self.y = np.where(horizontal, across, along)
+        self.angle = np.where(horizontal, np.where(forward, 90.0, 270.0), np.where(forward, 0.0, 180.0))
+        self.speed = self.rng.uniform(0.0, max_speed, vehicles)
+        self.accel = np.zeros(vehicles)
+        self.waiting = np.zeros(vehicles)
+        self.routes = [f"route{slot}" for slot in range(vehicles)]
+
+    def _new_id(self, slot: int) -> str:
+        vehicle_id = f"{self.types[slot]}{self.next_id}"
+        self.next_id += 1
+        return vehicle_id
+
+    def step(self, delta_t: float) -> List[Tuple[int, str]]:
+        """한 스텝 진행하고 도착 후 다시 출발한 차량의 (위치, 이전 ID) 목록을 반환"""
+        moving = self.rng.random(self.count) < self.moving_ratio
+        speed = np.where(
+            moving, np.clip(self.speed + self.rng.normal(0.0, 1.0, self.count), 1.0, self.max_speed), 0.0
+        )
+        self.accel = (speed - self.speed) / delta_t
+        self.speed = speed
+        self.waiting = np.where(moving, 0.0, self.waiting + delta_t)
+        heading = np.radians(self.angle)
+        # 경계를 넘으면 반대편에서 다시 진입
+        self.x = np.mod(self.x + np.sin(heading) * self.speed * delta_t, self.extent)
+        self.y = np.mod(self.y + np.cos(heading) * self.speed * delta_t, self.extent)
+
+        replaced = []
+        for slot in np.flatnonzero(self.rng.random(self.count) < self.churn).tolist():
+            replaced.append((slot, self.ids[slot]))
+            self.ids[slot] = self._new_id(slot)
+            self.routes[slot] = f"route{self.ids[slot]}"
+            self.waiting[slot] = 0.0
+        return replaced
+
+
+class _Domain:
+    """구현하지 않은 도메인 함수는 아무 일도 하지 않음 (도로 제어 호출 등)"""
+
+    def __getattr__(self, name: str):
+        return lambda *args, **kwargs: None
+
+
+class _SimulationDomain(_Domain):
+    def __init__(self, connection: "FakeTraci"):
+        self.connection = connection
+        self.variables: Sequence[int] = ()
+
+    def subscribe(self, variables: Sequence[int]) -> None:
+        self.variables = tuple(variables)
+
+    def getSubscriptionResults(self) -> Dict[int, Any]:
+        return self.connection.simulation_results
+
+    def getDeltaT(self) -> float:
+        return self.connection.delta_t
+
+    def getTime(self) -> float:
+        return self.connection.time
+
+    def getMinExpectedNumber(self) -> int:
+        return self.connection.population.count
+
+    def getDepartedIDList(self) -> List[str]:
+        return self.connection.simulation_results[tc.VAR_DEPARTED_VEHICLES_IDS]
+
+
+class _VehicleDomain(_Domain):
+    def __init__(self, connection: "FakeTraci"):
+        self.connection = connection
+
+    def subscribe(self, vehicle_id: str, variables: Sequence[int]) -> None:
+        slot = self.connection.slots.get(vehicle_id)
+        if slot is None:
+            raise self.connection.error(f"Vehicle '{vehicle_id}' is not known.")
+        self.connection.subscribed[slot] = True
+        self.connection.dynamics = tc.VAR_ACCELERATION in variables
+        # 실제 traci 처럼 구독 즉시 현재 값이 구독 결과에 포함됨
+        self.connection.vehicle_results[vehicle_id] = self.connection.vehicle_values(slot)
+
+    def getAllSubscriptionResults(self) -> Dict[str, Dict[int, Any]]:
+        return self.connection.vehicle_results
+
+    def getIDList(self) -> List[str]:
+        return list(self.connection.population.ids)
+
+
+class FakeTraci:
+    """합성 차량을 돌려주는 traci 연결 대체 객체 (DirectBackend(FakeTraci(...)) 로 사용)"""
+
+    def __init__(self, vehicles: int, grid_size: int = 30, block_length: float = 200.0,
+                 moving_ratio: float = 0.8, churn: float = 0.002, max_speed: float = 16.0,
+                 delta_t: float = 1.0, seed: int = 42):
+        self.error = traci.exceptions.TraCIException
+        self.settings = dict(
+            vehicles=vehicles, extent=grid_extent(grid_size, block_length), block_length=block_length,
+            moving_ratio=moving_ratio, churn=churn, max_speed=max_speed, seed=seed
+        )
+        self.delta_t = delta_t
+        self.simulation = _SimulationDomain(self)
+        self.vehicle = _VehicleDomain(self)
+        self.edge = _Domain()
+        self.lane = _Domain()
+        self.load([])
+
+    def load(self, args: List[str]) -> None:
+        """처음 상태로 되돌림 (SUMO 풀의 시나리오 재로드에 해당, args 는 무시)"""
+        self.population = SyntheticPopulation(**self.settings)
+        self.slots = {vehicle_id: slot for slot, vehicle_id in enumerate(self.population.ids)}
+        self.subscribed = np.zeros(self.population.count, dtype=bool)
+        self.time = 0.0
+        self.started = False  # 첫 스텝에 모든 차량이 출발
+        self.dynamics = False  # 가속도/경로 ID 를 구독했는지 (마지막 subscribe 기준)
+        self.simulation_results: Dict[int, Any] = self._simulation_results([], 0)
+        self.vehicle_results: Dict[str, Dict[int, Any]] = {}
+
+    def _simulation_results(self, departed: List[str], arrived: int) -> Dict[int, Any]:
+        return {
+            tc.VAR_TIME: self.time,
+            tc.VAR_MIN_EXPECTED_VEHICLES: self.population.count,
+            tc.VAR_DEPARTED_VEHICLES_IDS: departed,
+            tc.VAR_ARRIVED_VEHICLES_NUMBER: arrived,
+            tc.VAR_TELEPORT_STARTING_VEHICLES_NUMBER: 0,
+            tc.VAR_STOP_STARTING_VEHICLES_IDS: [],
+            tc.VAR_STOP_ENDING_VEHICLES_IDS: [],
+        }
+
+    def simulationStep(self, target_time: float = 0.0) -> None:
+        population = self.population
+        departed: List[str] = []
+        arrived = 0
+        if not self.started:
+            self.started = True
+            departed = list(population.ids)
+        while True:
+            self.time = round(self.time + self.delta_t, 6)
+            for slot, previous_id in population.step(self.delta_t):
+                del self.slots[previous_id]
+                self.slots[population.ids[slot]] = slot
+                self.subscribed[slot] = False
+                departed.append(population.ids[slot])
+                arrived += 1
+            if self.time >= target_time - 1e-9:
+                break
+        self.simulation_results = self._simulation_results(departed, arrived)
+
+        # 실제 traci 처럼 스텝 응답을 받을 때 구독 결과를 만들어 둠
+        subscribed = self.subscribed
+        everyone = bool(subscribed.all())
+        ids = population.ids
+        self.vehicle_results = {
+            ids[slot]: {
+                tc.VAR_POSITION: (x, y), tc.VAR_SPEED: speed, tc.VAR_TYPE: vehicle_type,
+                tc.VAR_ANGLE: angle, tc.VAR_WAITING_TIME: waiting
+            }
+            for slot, (x, y, speed, vehicle_type, angle, waiting) in enumerate(zip(
+                population.x.tolist(), population.y.tolist(), population.speed.tolist(),
+                population.types, population.angle.tolist(), population.waiting.tolist()
+            ))
+            if everyone or subscribed[slot]
+        }
+        if self.dynamics:
+            for vehicle_id, accel, route in zip(ids, population.accel.tolist(), population.routes):
+                values = self.vehicle_results.get(vehicle_id)
+                if values is not None:
+                    values[tc.VAR_ACCELERATION] = accel
+                    values[tc.VAR_ROUTE_ID] = route
+
+    def vehicle_values(self, slot: int) -> Dict[int, Any]:
+        population = self.population
+        values = {
+            tc.VAR_POSITION: (float(population.x[slot]), float(population.y[slot])),
+            tc.VAR_SPEED: float(population.speed[slot]),
+            tc.VAR_TYPE: population.types[slot],
+            tc.VAR_ANGLE: float(population.angle[slot]),
+            tc.VAR_WAITING_TIME: float(population.waiting[slot]),
+        }
+        if self.dynamics:
+            values[tc.VAR_ACCELERATION] = float(population.accel[slot])
+            values[tc.VAR_ROUTE_ID] = population.routes[slot]
+        return values
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,14 @@
+# src/backend/tests/conftest.py
+"""
+백엔드 단위 테스트 공통 설정
+
+서버와 같은 방식(`from services.x import Y`)으로 가져오도록 app 디렉토리를 경로에 추가합니다.
+SUMO 실행 없이 결정적으로 동작하는 순수 로직만 테스트합니다.
+
+실행 (src/backend 에서):
+    python -m pytest tests
+"""
+
+import os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
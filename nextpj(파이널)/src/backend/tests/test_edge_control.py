@@ -0,0 +1,199 @@
+# src/backend/tests/test_edge_control.py
+
+import numpy as np
+import pytest
+
+from services.coordinate_converter import CoordinateConverter
+from services.edge_control import EdgeController, EdgeGroups, MOTORWAY_LINKS
+from services.network_index import load_network_index
+
+VEHICLE_CLASSES = ["passenger", "truck", "bus"]
+
+# 서울 부근 UTM 좌표계의 작은 네트워크 (네트워크 인덱스가 읽는 요소만)
+NETWORK = """<?xml version="1.0" encoding="UTF-8"?>
+<net version="1.20">
+    <location netOffset="-322000.00,-4157000.00" convBoundary="0.00,0.00,300.00,100.00"
+              origBoundary="0.00,0.00,300.00,100.00"
+              projParameter="+proj=utm +zone=52 +ellps=WGS84 +datum=WGS84 +units=m +no_defs"/>
+    <edge id=":junction_0" function="internal">
+        <lane id=":junction_0_0" index="0" speed="5.00" length="1.00" shape="100.00,0.00 100.00,1.00"/>
+    </edge>
+    <edge id="main" type="highway.primary">
+        <lane id="main_0" index="0" speed="13.89" length="100.00" shape="0.00,0.00 100.00,0.00"/>
+        <lane id="main_1" index="1" speed="13.89" length="100.00" allow="bus taxi" shape="0.00,3.20 100.00,3.20"/>
+    </edge>
+    <edge id="side" type="highway.primary">
+        <lane id="side_0" index="0" speed="13.89" length="100.00" shape="100.00,0.00 200.00,0.00"/>
+    </edge>
+    <edge id="ramp" type="highway.motorway_link">
+        <lane id="ramp_0" index="0" speed="22.22" length="100.00" disallow="pedestrian" shape="200.00,0.00 300.00,100.00"/>
+    </edge>
+</net>
+"""
+
+
+@pytest.fixture
+def groups(tmp_path) -> EdgeGroups:
+    net_file = tmp_path / "osm.net.xml"
+    net_file.write_text(NETWORK, encoding="utf-8")
+    index = load_network_index(str(net_file))
+    return EdgeGroups(index, CoordinateConverter.from_location(index.location))
+
+
+def edge_ids(groups: EdgeGroups, positions: np.ndarray) -> list:
+    return sorted(groups.index.edge_ids[positions].tolist())
+
+
+def test_default_groups(groups):
+    assert edge_ids(groups, groups.get("type:highway.primary")) == ["main", "side"]
+    assert edge_ids(groups, groups.get(MOTORWAY_LINKS)) == ["ramp"]
+    assert groups.snapshot()[MOTORWAY_LINKS] == 1
+    with pytest.raises(ValueError):
+        groups.get("unknown")
+
+
+def test_selectors(groups):
+    assert edge_ids(groups, groups.select({"types": ["highway.motorway_link"]})) == ["ramp"]
+    assert edge_ids(groups, groups.select({"types": "highway.primary"})) == ["main", "side"]
+    assert edge_ids(groups, groups.select({"edges": ["side", "main"]})) == ["main", "side"]
+
+    # 네트워크 좌표 x 50 ~ 150 구간을 덮는 경위도 영역 (main, side 의 차로와 겹치고 ramp 와는 겹치지 않음)
+    (west, east), (south, north) = groups.converter.to_lnglat(np.array([50.0, 150.0]), np.array([-1.0, 5.0]))
+    assert edge_ids(groups, groups.select({"bbox": [west, south, east, north]})) == ["main", "side"]
+    polygon = [[west, south], [east, south], [east, north], [west, north]]
+    assert edge_ids(groups, groups.select({"polygon": polygon})) == ["main", "side"]
+
+
+@pytest.mark.parametrize("selector", [
+    ["main"],
+    {},
+    {"edges": ["missing"]},
+    {"types": {"highway.primary": True}},
+    {"bbox": [127.0, 37.0, 127.1]},
+])
+def test_invalid_selectors(groups, selector):
+    with pytest.raises(ValueError):
+        groups.select(selector)
+
+
+def test_builtin_group_names_cannot_be_redefined(groups):
+    for name in (MOTORWAY_LINKS, "type:highway.primary"):
+        with pytest.raises(ValueError):
+            groups.define(name, {"edges": ["main"]})
+
+
+def test_invalid_command_changes_nothing(groups):
+    controller = EdgeController(groups, VEHICLE_CLASSES)
+    with pytest.raises(ValueError):
+        controller.submit({
+            "groups": {"bridge": {"edges": ["main"]}},
+            "commands": [{"group": "bridge", "op": "close"}, {"group": "bridge", "op": "speed", "value": 0}]
+        })
+    assert "bridge" not in groups.groups
+    assert controller.take(0.0) == []
+    assert controller.status()["closedEdges"] == 0
+
+
+def test_close_and_open_restore_original_lane_permissions(groups):
+    controller = EdgeController(groups, VEHICLE_CLASSES)
+    controller.submit({"groups": {"bridge": {"edges": ["main"]}}, "commands": [{"group": "bridge", "op": "close"}]})
+    assert controller.take(0.0) == [("edge", "setDisallowed", ("main", VEHICLE_CLASSES))]
+
+    # 이미 차단된 엣지는 다시 호출하지 않음
+    controller.submit({"commands": [{"group": "bridge", "op": "close"}]})
+    assert controller.take(1.0) == []
+
+    controller.submit({"commands": [{"group": "bridge", "op": "open"}]})
+    assert controller.take(2.0) == [
+        ("lane", "setDisallowed", ("main_0", [])),
+        ("lane", "setAllowed", ("main_1", ["bus", "taxi"])),
+    ]
+    assert controller.status()["closedEdges"] == 0
+
+
+def test_lane_restrictions_start_from_original_permissions(groups):
+    controller = EdgeController(groups, VEHICLE_CLASSES)
+    controller.submit({"commands": [
+        {"group": "type:highway.primary", "op": "restrictLanes", "vClasses": ["bus"]},
+        {"group": MOTORWAY_LINKS, "op": "restrictLanes", "lanes": [0, 5], "vClasses": ["truck"]},
+    ]})
+    assert controller.take(0.0) == [
+        ("lane", "setDisallowed", ("main_0", ["bus"])),
+        ("lane", "setAllowed", ("main_1", ["taxi"])),
+        ("lane", "setDisallowed", ("side_0", ["bus"])),
+        ("lane", "setDisallowed", ("ramp_0", ["pedestrian", "truck"])),
+    ]
+
+    controller.submit({"commands": [{"group": MOTORWAY_LINKS, "op": "allowLanes"}]})
+    assert controller.take(1.0) == [("lane", "setDisallowed", ("ramp_0", ["pedestrian"]))]
+    assert controller.status()["restrictedLanes"] == 3
+
+
+def test_speed_and_reset_speed(groups):
+    controller = EdgeController(groups, VEHICLE_CLASSES)
+    controller.submit({"commands": [{"group": MOTORWAY_LINKS, "op": "speed", "value": 36}]})
+    assert controller.take(0.0) == [("edge", "setMaxSpeed", ("ramp", 10.0))]
+    controller.submit({"commands": [{"group": MOTORWAY_LINKS, "op": "resetSpeed"}]})
+    (call,) = controller.take(1.0)
+    assert call[:2] == ("edge", "setMaxSpeed") and call[2][0] == "ramp"
+    assert call[2][1] == pytest.approx(22.22, abs=1e-3)
+
+
+def test_scheduled_commands_apply_in_time_order(groups):
+    controller = EdgeController(groups, VEHICLE_CLASSES)
+    controller.submit({"commands": [
+        {"group": MOTORWAY_LINKS, "op": "speed", "value": 36, "at": 20},
+        {"group": MOTORWAY_LINKS, "op": "close", "at": 10},
+    ]})
+    assert controller.next_time() == 10.0
+    assert controller.take(9.0) == []
+    assert controller.take(10.0) == [("edge", "setDisallowed", ("ramp", VEHICLE_CLASSES))]
+    assert controller.next_time() == 20.0
+    assert controller.take(25.0) == [("edge", "setMaxSpeed", ("ramp", 10.0))]
+    assert controller.next_time() is None
+
+
+def test_immediate_submit_ignores_at(groups):
+    controller = EdgeController(groups, VEHICLE_CLASSES)
+    controller.submit({"commands": [{"group": MOTORWAY_LINKS, "op": "close", "at": 100}]}, immediate=True)
+    assert controller.take(0.0) == [("edge", "setDisallowed", ("ramp", VEHICLE_CLASSES))]
+
+
+def test_calls_are_capped_per_step(groups):
+    controller = EdgeController(groups, VEHICLE_CLASSES)
+    controller.submit({"commands": [{"group": "type:highway.primary", "op": "restrictLanes", "vClasses": ["bus"]}]})
+    assert len(controller.take(0.0, limit=2)) == 2
+    assert controller.status()["pendingCalls"] == 1
+    assert len(controller.take(1.0, limit=2)) == 1
+    assert controller.take(2.0, limit=2) == []
+
+
+def test_state_calls_reproduce_current_state_on_a_copy(groups):
+    controller = EdgeController(groups, VEHICLE_CLASSES)
+    controller.submit({"commands": [
+        {"group": "type:highway.primary", "op": "restrictLanes", "lanes": [0], "vClasses": ["bus"]},
+        {"group": MOTORWAY_LINKS, "op": "close"},
+        {"group": "type:highway.primary", "op": "speed", "value": 18},
+        {"group": MOTORWAY_LINKS, "op": "speed", "value": 36, "at": 500},
+    ]})
+    copy = controller.copy()
+    assert copy.take(0.0) == [] and copy.next_time() is None
+    assert copy.state_calls() == [
+        ("lane", "setDisallowed", ("main_0", ["bus"])),
+        ("lane", "setDisallowed", ("side_0", ["bus"])),
+        ("edge", "setDisallowed", ("ramp", VEHICLE_CLASSES)),
+        ("edge", "setMaxSpeed", ("main", 5.0)),
+        ("edge", "setMaxSpeed", ("side", 5.0)),
+    ]
+
+
+def test_copy_with_copied_groups_keeps_definitions_out_of_the_original(groups):
+    controller = EdgeController(groups, VEHICLE_CLASSES)
+    controller.submit({"commands": [{"group": MOTORWAY_LINKS, "op": "close"}]})
+    copy = controller.copy(groups.copy())
+    copy.submit({"groups": {"bridge": {"edges": ["main"]}}, "commands": [{"group": "bridge", "op": "close"}]},
+                immediate=True)
+    assert "bridge" not in groups.groups
+    assert "bridge" in copy.groups.groups
+    assert controller.status()["closedEdges"] == 1
+    assert copy.status()["closedEdges"] == 2
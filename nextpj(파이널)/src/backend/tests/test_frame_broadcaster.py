@@ -0,0 +1,81 @@
+# src/backend/tests/test_frame_broadcaster.py
+
+import asyncio
+
+from services.frame_broadcaster import FrameBroadcaster, ROLE_CONTROLLER
+
+
+class FakeWebSocket:
+    """보낸 메시지를 기록하고, release 가 설정될 때까지 전송을 붙잡을 수 있는 WebSocket"""
+
+    def __init__(self):
+        self.sent = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def receive_json(self):
+        await asyncio.Event().wait()
+
+    async def send_text(self, message):
+        await self.release.wait()
+        self.sent.append(message)
+
+    async def send_bytes(self, message):
+        await self.release.wait()
+        self.sent.append(message)
+
+
+def run_with_subscriber(test):
+    async def run():
+        broadcaster = FrameBroadcaster(lambda: None, lambda msg: None, lambda: None)
+        websocket = FakeWebSocket()
+        subscriber = broadcaster.add(websocket, ROLE_CONTROLLER)
+        try:
+            await test(broadcaster, subscriber, websocket)
+        finally:
+            await broadcaster.close()
+
+    asyncio.run(run())
+
+
+def test_dropped_delta_requests_a_keyframe_when_the_sender_is_idle():
+    async def test(broadcaster, subscriber, websocket):
+        view = subscriber.view
+        requests = view.keyframe_requests
+        # 전송 태스크가 돌기 전에 같은 틱에서 두 프레임을 넣으면 키프레임과 변경분이 함께 버려짐
+        broadcaster.broadcast([(view, "keyframe", True)])
+        broadcaster.broadcast([(view, "delta", False)])
+        assert not subscriber.synced
+        assert not subscriber.needs_keyframe
+        assert view.keyframe_requests == requests + 1
+
+        broadcaster.broadcast([(view, "next keyframe", True)])
+        await asyncio.wait_for(subscriber.queue.drain(), 1)
+        assert websocket.sent == ["next keyframe"]
+        assert subscriber.synced
+
+    run_with_subscriber(test)
+
+
+def test_dropped_delta_waits_for_the_send_in_flight():
+    async def test(broadcaster, subscriber, websocket):
+        view = subscriber.view
+        websocket.release.clear()
+        broadcaster.broadcast([(view, "keyframe", True)])
+        await asyncio.sleep(0)
+        assert subscriber.sending
+
+        requests = view.keyframe_requests
+        broadcaster.broadcast([(view, "delta1", False)])
+        broadcaster.broadcast([(view, "delta2", False)])
+        # 보내는 중인 프레임이 끝나야 밀린 전송이 끝난 것이므로 아직 요청하지 않음
+        assert subscriber.needs_keyframe
+        assert view.keyframe_requests == requests
+
+        websocket.release.set()
+        await asyncio.wait_for(subscriber.queue.drain(), 1)
+        assert websocket.sent == ["keyframe"]
+        assert not subscriber.needs_keyframe
+        assert view.keyframe_requests == requests + 1
+
+    run_with_subscriber(test)
@@ -0,0 +1,232 @@
+# src/backend/tests/test_frame_encoder.py
+
+from typing import Dict, List
+import json
+import numpy as np
+import pytest
+
+from services.frame_encoder import BinaryFrameEncoder, DeltaFrameEncoder, FRAME_META_KEYS
+
+
+def make_frame(step: int, vehicles: Dict[str, tuple]) -> dict:
+    """{차량 ID: (타입, lat, lng, angle, speed)} 로 러너와 같은 형식의 프레임 생성"""
+    ids = list(vehicles)
+    columns = list(zip(*vehicles.values())) if vehicles else [[]] * 5
+    frame = {
+        "step": step,
+        "ids": ids,
+        "types": list(columns[0]),
+        "lat": np.array(columns[1], dtype=np.float64),
+        "lng": np.array(columns[2], dtype=np.float64),
+        "angle": np.array(columns[3], dtype=np.float64),
+        "speed": np.array(columns[4], dtype=np.float64),
+    }
+    frame.update({key: None for key in FRAME_META_KEYS})
+    return frame
+
+
+class DeltaClient:
+    """프로토콜 설명대로 vehicle_keyframe / vehicle_delta 를 적용하는 클라이언트"""
+
+    def __init__(self):
+        self.vehicles: Dict[int, list] = {}  # 핸들 -> [id, type, lat, lng, angle, speed]
+
+    def apply(self, message: dict) -> None:
+        if message["type"] == "vehicle_keyframe":
+            self.vehicles = {record[0]: list(record[1:]) for record in message["vehicles"]}
+            return
+        assert message["type"] == "vehicle_delta"
+        for handle in message["removed"]:
+            del self.vehicles[handle]
+        for record in message["added"]:
+            assert record[0] not in self.vehicles
+            self.vehicles[record[0]] = list(record[1:])
+        for handle, lat, lng, angle, speed in message["changed"]:
+            self.vehicles[handle][2:] = [lat, lng, angle, speed]
+
+    def state(self) -> Dict[str, List]:
+        return {record[0]: record[1:] for record in self.vehicles.values()}
+
+
+def random_walk(steps: int, seed: int = 7):
+    """차량이 들어오고 나가며 움직이는 결정적인 프레임 열"""
+    rng = np.random.default_rng(seed)
+    vehicles = {}
+    next_id = 0
+    for step in range(steps):
+        for vehicle_id in list(vehicles):
+            if rng.random() < 0.1:
+                del vehicles[vehicle_id]
+        for _ in range(rng.integers(0, 4)):
+            vehicles[f"veh{next_id}"] = ("passenger", 37.3 + rng.random() * 0.01, 127.1 + rng.random() * 0.01,
+                                         rng.random() * 360, rng.random() * 60)
+            next_id += 1
+        for vehicle_id, (vehicle_type, lat, lng, angle, speed) in vehicles.items():
+            if rng.random() < 0.5:
+                vehicles[vehicle_id] = (vehicle_type, lat + rng.normal(0, 1e-4), lng + rng.normal(0, 1e-4),
+                                        (angle + rng.normal(0, 5)) % 360, max(0.0, speed + rng.normal(0, 2)))
+        yield make_frame(step, dict(vehicles))
+
+
+def expected_state(frame: dict) -> Dict[str, List]:
+    return {
+        vehicle_id: [vehicle_type, round(lat, 6), round(lng, 6), round(angle, 1), round(speed, 1)]
+        for vehicle_id, vehicle_type, lat, lng, angle, speed in zip(
+            frame["ids"], frame["types"], frame["lat"].tolist(), frame["lng"].tolist(),
+            frame["angle"].tolist(), frame["speed"].tolist()
+        )
+    }
+
+
+def test_delta_round_trip_is_exact_without_epsilons():
+    encoder = DeltaFrameEncoder(keyframe_interval=10, position_epsilon=0, angle_epsilon=0, speed_epsilon=0)
+    client = DeltaClient()
+    for frame in random_walk(60):
+        client.apply(encoder.encode(frame))
+        assert client.state() == expected_state(frame)
+
+
+def test_delta_round_trip_stays_within_epsilons():
+    encoder = DeltaFrameEncoder(keyframe_interval=30)
+    client = DeltaClient()
+    for frame in random_walk(60):
+        client.apply(encoder.encode(frame))
+        expected = expected_state(frame)
+        state = client.state()
+        assert state.keys() == expected.keys()
+        for vehicle_id, (vehicle_type, lat, lng, angle, speed) in expected.items():
+            assert state[vehicle_id][0] == vehicle_type
+            assert abs(state[vehicle_id][1] - lat) <= encoder.position_epsilon + 1e-9
+            assert abs(state[vehicle_id][2] - lng) <= encoder.position_epsilon + 1e-9
+            assert abs(state[vehicle_id][3] - angle) <= encoder.angle_epsilon + 1e-9
+            assert abs(state[vehicle_id][4] - speed) <= encoder.speed_epsilon + 1e-9
+
+
+def test_delta_keyframe_interval_and_forced_keyframe():
+    encoder = DeltaFrameEncoder(keyframe_interval=3)
+    frames = list(random_walk(7))
+    types = [encoder.encode(frame)["type"] for frame in frames[:6]]
+    assert types == ["vehicle_keyframe", "vehicle_delta", "vehicle_delta"] * 2
+    assert encoder.encode(frames[6], keyframe=True)["type"] == "vehicle_keyframe"
+    assert encoder.last_keyframe
+
+
+def test_delta_reuses_removed_handles_only_in_later_messages():
+    encoder = DeltaFrameEncoder(position_epsilon=0, angle_epsilon=0, speed_epsilon=0)
+    first = encoder.encode(make_frame(0, {"a": ("p", 1, 1, 0, 0), "b": ("p", 2, 2, 0, 0)}))
+    handles = {record[1]: record[0] for record in first["vehicles"]}
+
+    second = encoder.encode(make_frame(1, {"b": ("p", 2, 2, 0, 0), "c": ("p", 3, 3, 0, 0)}))
+    assert second["removed"] == [handles["a"]]
+    assert [record[0] for record in second["added"]] != [handles["a"]]
+
+    third = encoder.encode(make_frame(2, {"b": ("p", 2, 2, 0, 0), "c": ("p", 3, 3, 0, 0), "d": ("p", 4, 4, 0, 0)}))
+    assert [record[0] for record in third["added"]] == [handles["a"]]
+
+
+def test_delta_rejects_invalid_keyframe_interval():
+    with pytest.raises(ValueError):
+        DeltaFrameEncoder(keyframe_interval=0)
+
+
+class BinaryClient:
+    """모듈 설명의 바이너리 레이아웃대로 프레임을 해석하는 클라이언트"""
+
+    def __init__(self):
+        self.ids: Dict[int, str] = {}
+        self.types: List[str] = []
+
+    def decode(self, data: bytes) -> Dict[str, List]:
+        version, _, _, count, meta_length = BinaryFrameEncoder.HEADER.unpack_from(data, 0)
+        assert version == BinaryFrameEncoder.VERSION
+        meta = json.loads(data[12:12 + meta_length].decode("utf-8"))
+        for handle, vehicle_id in meta["newIds"]:
+            self.ids[handle] = vehicle_id
+        if "types" in meta:
+            self.types = meta["types"]
+
+        offset = 12 + meta_length + (-meta_length % 4)
+        arrays = {}
+        for name, dtype in (("handle", "<u4"), ("lat", "<i4"), ("lng", "<i4"),
+                            ("speed", "<u2"), ("angle", "<u2"), ("type", "u1")):
+            arrays[name] = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+            offset += arrays[name].nbytes
+        assert offset == len(data)
+        return {
+            self.ids[handle]: [self.types[type_index], lat / 1e6, lng / 1e6, angle / 100, speed / 100]
+            for handle, lat, lng, speed, angle, type_index in zip(
+                *(arrays[name].tolist() for name in ("handle", "lat", "lng", "speed", "angle", "type"))
+            )
+        }
+
+
+def assert_quantized(state: Dict[str, List], frame: dict) -> None:
+    assert list(state) == frame["ids"]
+    for vehicle_id, vehicle_type, lat, lng, angle, speed in zip(
+        frame["ids"], frame["types"], frame["lat"], frame["lng"], frame["angle"], frame["speed"]
+    ):
+        decoded = state[vehicle_id]
+        assert decoded[0] == vehicle_type
+        assert decoded[1] == pytest.approx(lat, abs=0.5e-6)
+        assert decoded[2] == pytest.approx(lng, abs=0.5e-6)
+        angle_error = abs(decoded[3] - angle % 360)
+        assert min(angle_error, 360 - angle_error) <= 0.005 + 1e-9  # 360도는 0도로 전송
+        assert decoded[4] == pytest.approx(speed, abs=0.005)
+
+
+def test_binary_round_trip_within_quantization():
+    encoder = BinaryFrameEncoder()
+    client = BinaryClient()
+    for frame in random_walk(40):
+        frame["types"] = [f"type{len(vehicle_id) % 3}" for vehicle_id in frame["ids"]]
+        assert_quantized(client.decode(encoder.encode(frame)), frame)
+
+
+def test_binary_keyframe_lets_a_new_client_decode():
+    encoder = BinaryFrameEncoder()
+    frames = list(random_walk(10))
+    for frame in frames[:-1]:
+        encoder.encode(frame)
+    assert not encoder.last_keyframe
+
+    late_client = BinaryClient()
+    assert_quantized(late_client.decode(encoder.encode(frames[-1], keyframe=True)), frames[-1])
+    assert encoder.last_keyframe
+
+
+def test_binary_sends_new_ids_and_types_only_once():
+    encoder = BinaryFrameEncoder()
+    vehicles = {"a": ("p", 1, 1, 0, 0), "b": ("p", 2, 2, 0, 0)}
+    first = encoder.encode(make_frame(0, vehicles))
+    second = encoder.encode(make_frame(1, vehicles))
+
+    def meta(data: bytes) -> dict:
+        length = BinaryFrameEncoder.HEADER.unpack_from(data, 0)[4]
+        return json.loads(data[12:12 + length])
+
+    assert [vehicle_id for _, vehicle_id in meta(first)["newIds"]] == ["a", "b"]
+    assert meta(first)["types"] == ["p"]
+    assert meta(second)["newIds"] == []
+    assert "types" not in meta(second)
+
+
+def test_binary_reuses_handles_of_departed_vehicles():
+    encoder = BinaryFrameEncoder()
+    client = BinaryClient()
+    for step in range(50):
+        # 매 스텝 차량 한 대가 떠나고 한 대가 새로 들어옴 (핸들은 다음 스텝부터 재사용)
+        vehicles = {f"veh{step + i}": ("p", step, i, 0, 0) for i in range(5)}
+        frame = make_frame(step, vehicles)
+        assert client.decode(encoder.encode(frame)) == {
+            vehicle_id: ["p", lat, lng, angle, speed]
+            for vehicle_id, (_, lat, lng, angle, speed) in vehicles.items()
+        }
+    assert len(encoder.vehicle_ids) <= 6
+    assert len(encoder.handles) == 5
+
+
+def test_binary_rejects_more_than_255_types():
+    encoder = BinaryFrameEncoder()
+    vehicles = {f"veh{i}": (f"type{i}", 1, 1, 0, 0) for i in range(256)}
+    with pytest.raises(ValueError):
+        encoder.encode(make_frame(0, vehicles))
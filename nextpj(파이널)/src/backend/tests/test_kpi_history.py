@@ -0,0 +1,103 @@
+# src/backend/tests/test_kpi_history.py
+
+import numpy as np
+import pytest
+
+from services.kpi_history import KPI_FIELDS, KpiHistory, KpiRingBuffer, QuantileSketch
+
+
+def kpis(running: float, arrived: float = 0) -> dict:
+    values = {field: 0.0 for field in KPI_FIELDS}
+    values.update({"running": running, "meanSpeed": running * 2, "arrived": arrived})
+    return values
+
+
+def test_ring_buffer_overwrites_oldest_and_keeps_time_order():
+    buffer = KpiRingBuffer(capacity=3, width=1)
+    for time in range(5):
+        buffer.append(float(time), np.array([time * 10.0]))
+    times, values = buffer.window(-np.inf, np.inf)
+    assert times.tolist() == [2.0, 3.0, 4.0]
+    assert values[:, 0].tolist() == [20.0, 30.0, 40.0]
+    assert buffer.window(2.5, 4.0)[0].tolist() == [3.0, 4.0]
+
+
+def test_tiers_average_values_and_sum_counters():
+    history = KpiHistory(tiers=((1.0, 100), (10.0, 100)))
+    for step in range(40):  # 0.5초 스텝, 0 ~ 19.5초
+        history.record(step * 0.5, kpis(running=step, arrived=1), np.zeros(0), np.zeros(0))
+    history.finish()
+
+    fine = history.query(resolution=1)
+    assert fine["times"][:2] == [0.0, 1.0]
+    assert fine["series"]["running"][:2] == [0.5, 2.5]  # (0+1)/2, (2+3)/2
+    assert fine["series"]["arrived"][:2] == [2.0, 2.0]
+
+    coarse = history.query(resolution=10)
+    assert coarse["times"] == [0.0, 10.0]
+    assert coarse["series"]["running"] == [9.5, 29.5]
+    assert coarse["series"]["arrived"] == [20.0, 20.0]
+    # 처리량은 구간 도착 수를 시간당으로 환산
+    assert coarse["series"]["throughput"] == [7200.0, 7200.0]
+    assert not coarse["partial"]
+
+
+def test_tier_rollover_drops_oldest_rows_only_in_that_tier():
+    history = KpiHistory(tiers=((1.0, 5), (10.0, 100)))
+    for time in range(30):
+        history.record(float(time), kpis(running=time), np.zeros(0), np.zeros(0))
+    history.finish()
+    assert history.query(resolution=1)["times"] == [25.0, 26.0, 27.0, 28.0, 29.0]
+    assert history.query(resolution=10)["times"] == [0.0, 10.0, 20.0]
+
+
+def test_current_bucket_is_returned_as_partial():
+    history = KpiHistory(tiers=((10.0, 100),))
+    for time in range(15):
+        history.record(float(time), kpis(running=time), np.zeros(0), np.zeros(0))
+
+    result = history.query()
+    assert result["times"] == [0.0, 10.0]
+    assert result["series"]["running"] == [4.5, 12.0]
+    assert result["partial"]
+    # 진행 중인 구간이 요청 범위 밖이면 포함하지 않음
+    assert not history.query(start=0, end=5)["partial"]
+
+
+def test_automatic_resolution_fits_max_points():
+    history = KpiHistory(tiers=((1.0, 1000), (10.0, 100)))
+    for time in range(100):
+        history.record(float(time), kpis(running=1), np.zeros(0), np.zeros(0))
+    assert history.query(max_points=200)["resolution"] == 1.0
+    result = history.query(max_points=20)
+    assert result["resolution"] == 10.0
+    assert len(result["times"]) <= 20
+
+
+def test_unsupported_resolution_is_rejected():
+    with pytest.raises(ValueError):
+        KpiHistory().query(resolution=5)
+
+
+@pytest.mark.parametrize("distribution", ["uniform", "lognormal"])
+def test_quantile_sketch_relative_error(distribution):
+    rng = np.random.default_rng(3)
+    values = rng.uniform(1, 120, 50000) if distribution == "uniform" else rng.lognormal(2, 1, 50000)
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for chunk in np.array_split(values, 100):
+        sketch.add(chunk)
+
+    assert sketch.total == len(values)
+    ordered = np.sort(values)
+    for q in (0.5, 0.9, 0.95, 0.99):
+        exact = ordered[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+
+
+def test_quantile_sketch_counts_small_values_as_zero():
+    sketch = QuantileSketch(min_value=0.01)
+    assert sketch.quantile(0.5) is None
+    sketch.add(np.array([0.0, 0.0, 0.0, 5.0]))
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(5.0, rel=0.01)
+    assert sketch.snapshot()["p50"] == 0.0
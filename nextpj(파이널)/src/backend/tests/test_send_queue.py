@@ -0,0 +1,117 @@
+# src/backend/tests/test_send_queue.py
+
+import asyncio
+import pytest
+
+from services.send_queue import SendQueue, SendQueueOverflow
+
+
+def drain_now(queue: SendQueue) -> list:
+    """기다리지 않고 꺼낼 수 있는 메시지를 순서대로 꺼냄"""
+    async def run():
+        messages = []
+        while not queue.empty():
+            message, queued_at = await queue.get()
+            queue.sent(queued_at)
+            messages.append(message)
+        return messages
+    return asyncio.run(run())
+
+
+def test_latest_keyframe_replaces_unsent_frame():
+    queue = SendQueue()
+    assert queue.put_frame("frame1", keyframe=True)
+    assert queue.put_frame("frame2", keyframe=True)
+    assert drain_now(queue) == ["frame2"]
+    assert queue.frames_dropped == 1
+    assert queue.frames_sent == 1
+
+
+def test_delta_replacing_unsent_frame_breaks_the_chain():
+    queue = SendQueue()
+    assert queue.put_frame("keyframe", keyframe=True)
+    # 변경분은 버려진 프레임 없이 복원할 수 없으므로 둘 다 버리고 False
+    assert not queue.put_frame("delta", keyframe=False)
+    assert queue.empty()
+    assert queue.frames_dropped == 2
+    # 보낼 프레임이 없을 때의 변경분은 그대로 보관
+    assert queue.put_frame("delta2", keyframe=False)
+    assert drain_now(queue) == ["delta2"]
+
+
+def test_events_are_never_dropped_and_keep_order_with_frames():
+    queue = SendQueue()
+    queue.put_event("notice1")
+    queue.put_frame("frame1", keyframe=True)
+    queue.put_event("notice2")
+    queue.put_frame("frame2", keyframe=True)  # frame1 을 대체하지만 순번은 notice2 뒤
+    queue.put_event("complete")
+    assert drain_now(queue) == ["notice1", "notice2", "frame2", "complete"]
+    assert queue.events_sent == 3
+
+
+def test_event_overflow():
+    queue = SendQueue(max_events=2)
+    queue.put_event("a")
+    queue.put_event("b")
+    with pytest.raises(SendQueueOverflow):
+        queue.put_event("c")
+    # 프레임은 한도와 관계없이 한 칸만 사용
+    assert queue.put_frame("frame", keyframe=True)
+    assert queue.snapshot()["pendingEvents"] == 2
+
+
+def test_discard_frame_keeps_events():
+    queue = SendQueue()
+    queue.put_event("notice")
+    queue.put_frame("old view frame", keyframe=True)
+    queue.discard_frame()
+    assert drain_now(queue) == ["notice"]
+    assert queue.frames_dropped == 1
+
+
+def test_get_waits_for_a_message_and_drain_waits_until_idle():
+    async def run():
+        queue = SendQueue()
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+        queue.put_frame("frame", keyframe=True)
+        message, queued_at = await asyncio.wait_for(getter, 1)
+        assert message == "frame" and queued_at is not None
+
+        queue.put_event("last")
+        drained = asyncio.create_task(queue.drain())
+        await asyncio.sleep(0)
+        assert not drained.done()
+        assert (await queue.get())[0] == "last"
+        # 큐가 빈 상태로 다음 get() 을 기다리기 시작하면 drain() 이 끝남
+        waiting = asyncio.create_task(queue.get())
+        await asyncio.wait_for(drained, 1)
+        waiting.cancel()
+
+    asyncio.run(run())
+
+
+def test_close_releases_drain_and_clears_messages():
+    async def run():
+        queue = SendQueue()
+        queue.put_event("never sent")
+        queue.put_frame("frame", keyframe=True)
+        drained = asyncio.create_task(queue.drain())
+        await asyncio.sleep(0)
+        queue.close()
+        await asyncio.wait_for(drained, 1)
+        assert queue.empty()
+
+    asyncio.run(run())
+
+
+def test_lag_statistics():
+    queue = SendQueue()
+    queue.put_frame("frame", keyframe=True)
+    drain_now(queue)
+    snapshot = queue.snapshot()
+    assert snapshot["framesSent"] == 1
+    assert 0 <= snapshot["lastLagMs"] <= snapshot["maxLagMs"]
+    assert snapshot["meanLagMs"] == snapshot["lastLagMs"]
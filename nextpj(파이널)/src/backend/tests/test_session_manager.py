@@ -0,0 +1,43 @@
+# src/backend/tests/test_session_manager.py
+
+import asyncio
+
+import services.session_manager as session_manager_module
+from services.kpi_history import KpiHistory
+from services.session_manager import SimulationSessionManager
+
+
+class FinishedRunner:
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.kpi_history = KpiHistory()
+
+    async def cleanup(self) -> None:
+        pass
+
+
+def test_kpi_history_outlives_the_session_for_the_grace_period(monkeypatch):
+    manager = SimulationSessionManager(max_sessions=2)
+    runner = FinishedRunner("s1")
+    manager.sessions["s1"] = runner
+    manager.started_at["s1"] = 0.0
+    assert manager.get_kpi_history("s1") is runner.kpi_history
+
+    asyncio.run(manager.close_session("s1"))
+    assert manager.get_session("s1") is None
+    assert manager.get_kpi_history("s1") is runner.kpi_history
+
+    monkeypatch.setattr(session_manager_module, "KPI_HISTORY_GRACE_SECONDS", -1)
+    assert manager.get_kpi_history("s1") is None
+
+
+def test_finished_kpi_histories_are_capped(monkeypatch):
+    monkeypatch.setattr(session_manager_module, "KPI_HISTORY_MAX_FINISHED", 2)
+    manager = SimulationSessionManager(max_sessions=4)
+    for session_id in ("a", "b", "c"):
+        manager.sessions[session_id] = FinishedRunner(session_id)
+        manager.started_at[session_id] = 0.0
+        asyncio.run(manager.close_session(session_id))
+    assert manager.get_kpi_history("a") is None
+    assert manager.get_kpi_history("b") is not None
+    assert manager.get_kpi_history("c") is not None
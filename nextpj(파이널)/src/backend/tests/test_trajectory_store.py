@@ -0,0 +1,135 @@
+# src/backend/tests/test_trajectory_store.py
+
+import os
+import xml.etree.ElementTree as ET
+import numpy as np
+import pytest
+
+from services.trajectory_store import (
+    MANIFEST_FILE, TrajectoryStore, TrajectoryWriter, convert_fcd, list_trajectories, open_trajectory,
+    prune_trajectories, trajectory_root
+)
+
+FCD = """<fcd-export>
+    <timestep time="0.00">
+        <vehicle id="veh0" x="10.00" y="20.00" angle="90.00" type="bus" speed="10.00"/>
+    </timestep>
+    <timestep time="1.00">
+        <vehicle id="veh0" x="20.00" y="20.00" angle="90.00" type="bus" speed="10.00"/>
+        <vehicle id="veh1" x="0.00" y="0.00" angle="0.00" type="passenger" speed="0.00"/>
+    </timestep>
+</fcd-export>
+"""
+
+
+class IdentityConverter:
+    def to_lnglat(self, x, y):
+        return x, y
+
+
+
+def write_run(data_dir: str, run_id: str, steps: int = 25, block_seconds: float = 10.0) -> list:
+    """0.5초 간격 스텝을 기록하고 스텝별 (시각, ids, types, lat, lng, angle, speed) 반환"""
+    rng = np.random.default_rng(len(run_id))
+    writer = TrajectoryWriter(os.path.join(trajectory_root(data_dir), run_id), block_seconds)
+    written = []
+    for step in range(steps):
+        count = step % 4  # 차량이 없는 스텝 포함
+        ids = [f"veh{(step + i) % 6}" for i in range(count)]
+        types = ["bus" if i % 2 else "passenger" for i in range(count)]
+        columns = (
+            37.3 + rng.random(count) * 0.01, 127.1 + rng.random(count) * 0.01,
+            rng.random(count) * 360, rng.random(count) * 100
+        )
+        writer.append(step * 0.5, ids, types, *columns)
+        written.append((step * 0.5, ids, types) + columns)
+    assert writer.close() is not None
+    return written
+
+
+def test_round_trip_across_blocks(tmp_path):
+    written = write_run(str(tmp_path), "run")
+    store = open_trajectory(str(tmp_path), "run")
+
+    assert store.start == 0.0 and store.end == 12.0
+    assert store.delta_t == 0.5
+    assert len(store.blocks) == 2  # 10초 블록: [0, 10), [10, 20)
+
+    for sim_time, ids, types, lat, lng, angle, speed in written:
+        block_index = store.locate(sim_time)
+        position = store.blocks[block_index]["times"].index(sim_time)
+        frame = store.frame(block_index, position, store.load_block(block_index))
+        assert frame["ids"] == ids
+        assert frame["types"] == types
+        assert frame["vehicleCount"] == len(ids)
+        np.testing.assert_allclose(frame["lat"], lat, atol=0.5e-6)
+        np.testing.assert_allclose(frame["lng"], lng, atol=0.5e-6)
+        np.testing.assert_allclose(frame["speed"], speed, atol=0.005)
+        angle_error = np.abs(frame["angle"] - angle % 360)
+        assert (np.minimum(angle_error, 360 - angle_error) <= 0.005 + 1e-9).all()
+
+
+def test_unloaded_block_gives_an_empty_frame(tmp_path):
+    write_run(str(tmp_path), "run")
+    store = TrajectoryStore(os.path.join(trajectory_root(str(tmp_path)), "run"))
+    frame = store.frame(0, 3, None)
+    assert frame["ids"] == [] and len(frame["lat"]) == 0
+    # 메타 정보는 블록을 읽지 않아도 manifest 에서 제공
+    assert frame["vehicleCount"] == 3
+
+
+def test_discarded_or_empty_runs_are_not_listed(tmp_path):
+    write_run(str(tmp_path), "done")
+    root = trajectory_root(str(tmp_path))
+
+    discarded = TrajectoryWriter(os.path.join(root, "discarded"), 10.0)
+    discarded.append(0.0, ["a"], ["p"], np.ones(1), np.ones(1), np.zeros(1), np.ones(1))
+    discarded.discard()
+    assert TrajectoryWriter(os.path.join(root, "empty"), 10.0).close() is None
+
+    assert [run["runId"] for run in list_trajectories(str(tmp_path))] == ["done"]
+    with pytest.raises(FileNotFoundError):
+        open_trajectory(str(tmp_path), "discarded")
+
+
+def test_prune_keeps_newest_finished_runs(tmp_path):
+    root = trajectory_root(str(tmp_path))
+    for i, run_id in enumerate(("old", "middle", "new")):
+        write_run(str(tmp_path), run_id, steps=3)
+        os.utime(os.path.join(root, run_id, MANIFEST_FILE), (1000 + i, 1000 + i))
+    os.makedirs(os.path.join(root, "recording"))
+
+    assert prune_trajectories(root, max_runs=2) == ["old"]
+    assert sorted(os.listdir(root)) == ["middle", "new", "recording"]
+    assert prune_trajectories(root, max_runs=0) == []
+
+
+def test_convert_fcd(tmp_path):
+    fcd_path = tmp_path / "fcd_output.xml"
+    fcd_path.write_text(FCD, encoding="utf-8")
+    directory = os.path.join(trajectory_root(str(tmp_path)), "fcd")
+    assert convert_fcd(str(fcd_path), directory, IdentityConverter()) == directory
+
+    store = open_trajectory(str(tmp_path), "fcd")
+    assert store.start == 0.0 and store.end == 1.0
+    frame = store.frame(0, 1, store.load_block(0))
+    assert frame["ids"] == ["veh0", "veh1"]
+    np.testing.assert_allclose(frame["lng"], [20.0, 0.0], atol=1e-6)
+    np.testing.assert_allclose(frame["speed"], [36.0, 0.0], atol=0.005)
+
+
+def test_truncated_fcd_raises_and_leaves_no_directory(tmp_path):
+    fcd_path = tmp_path / "fcd_output.xml"
+    fcd_path.write_text(FCD[:FCD.index("<vehicle id=\"veh1\"")], encoding="utf-8")
+    directory = os.path.join(trajectory_root(str(tmp_path)), "fcd")
+    with pytest.raises(ET.ParseError):
+        convert_fcd(str(fcd_path), directory, IdentityConverter())
+    assert not os.path.exists(directory)
+
+
+def test_empty_fcd_leaves_no_directory(tmp_path):
+    fcd_path = tmp_path / "fcd_output.xml"
+    fcd_path.write_text("<fcd-export/>", encoding="utf-8")
+    directory = os.path.join(trajectory_root(str(tmp_path)), "fcd")
+    assert convert_fcd(str(fcd_path), directory, IdentityConverter()) is None
+    assert not os.path.exists(directory)